@@ -1,9 +1,23 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import ProductCache, product_cache, user_cache
+from app.core.events import event_bus
+from app.core.rate_limit import RateLimiter, build_rate_limit_backend
+from app.core.settings import settings
+from app.core.templates import email_templates
 from app.core.types import UserType
-from app.database.connection import get_db
+from app.database.connection import (
+    AsyncSessionLocal,
+    get_uow,
+    get_read_db,
+    replica_router,
+)
+from app.database.unit_of_work import UnitOfWork
 
 from app.core.security import decode_access_token, decode_refresh_token
 from app.repositories import (
@@ -16,6 +30,8 @@ from app.repositories import (
     TagRepository,
     OrderItemRepository,
     PromoRepository,
+    EmailOutboxRepository,
+    InventoryRepository,
 )
 from app.repositories.order import OrderRepository
 from app.schemas import TokenData, UserOut
@@ -26,55 +42,216 @@ from app.services import (
     OrderService,
     RecommendationService,
     NotificationService,
+    CatalogExportService,
+    ProductImportService,
+    TagResolver,
+    PasswordRehashService,
+    RefreshTokenStore,
+    InMemoryRefreshTokenStore,
+    DatabaseRefreshTokenStore,
+    EventPublisher,
+    InventoryService,
 )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+password_rehash_service = PasswordRehashService(
+    session_factory=AsyncSessionLocal
+)
+
+_refresh_token_ttl = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+if settings.REFRESH_TOKEN_STORE == "memory":
+    refresh_token_store: RefreshTokenStore = InMemoryRefreshTokenStore(
+        ttl=_refresh_token_ttl
+    )
+else:
+    refresh_token_store = DatabaseRefreshTokenStore(
+        ttl=_refresh_token_ttl, session_factory=AsyncSessionLocal
+    )
+
+
+def get_refresh_token_store() -> RefreshTokenStore:
+    return refresh_token_store
+
+
+rate_limit_backend = build_rate_limit_backend(
+    settings.RATE_LIMIT_BACKEND,
+    redis_url=settings.RATE_LIMIT_REDIS_URL,
+    shards=settings.RATE_LIMIT_SHARDS,
+    max_keys=settings.RATE_LIMIT_MAX_KEYS,
+)
+login_ip_limiter = RateLimiter(
+    "login_ip",
+    rate_limit_backend,
+    settings.RATE_LIMIT_LOGIN_PER_IP,
+    settings.RATE_LIMIT_PERIOD_SECONDS,
+)
+login_email_limiter = RateLimiter(
+    "login_email",
+    rate_limit_backend,
+    settings.RATE_LIMIT_LOGIN_PER_EMAIL,
+    settings.RATE_LIMIT_PERIOD_SECONDS,
+)
+register_ip_limiter = RateLimiter(
+    "register_ip",
+    rate_limit_backend,
+    settings.RATE_LIMIT_REGISTER_PER_IP,
+    settings.RATE_LIMIT_PERIOD_SECONDS,
+)
+promo_user_limiter = RateLimiter(
+    "promo_user",
+    rate_limit_backend,
+    settings.RATE_LIMIT_PROMO_PER_USER,
+    settings.RATE_LIMIT_PERIOD_SECONDS,
+)
+
+
+# За обратным прокси адрес клиента берётся из X-Forwarded-For
+# (uvicorn --proxy-headers --forwarded-allow-ips).
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+async def limit_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+) -> None:
+    await login_ip_limiter.check(_client_ip(request))
+    await login_email_limiter.check(form_data.username.strip().lower())
+
+
+async def limit_registration(request: Request) -> None:
+    await register_ip_limiter.check(_client_ip(request))
+
+
+def get_product_cache() -> ProductCache:
+    return product_cache
+
+
+async def get_user_service(
+    uow: UnitOfWork = Depends(get_uow),
+) -> UserService:
+
+    return UserService(
+        repository=UserRepository(uow.session),
+        rehash_service=password_rehash_service,
+        cache=user_cache,
+    )
 
-async def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
 
-    return UserService(repository=UserRepository(db))
+async def get_notification_service(
+    uow: UnitOfWork = Depends(get_uow),
+) -> NotificationService:
 
+    return NotificationService(
+        outbox_repository=EmailOutboxRepository(uow.session),
+        templates=email_templates,
+    )
 
-async def get_notification_service() -> NotificationService:
 
-    return NotificationService()
+def _event_publisher(uow: UnitOfWork) -> EventPublisher:
+    return EventPublisher(event_bus, uow, durable=settings.EVENT_OUTBOX_ENABLED)
 
 
 async def get_order_service(
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
+) -> OrderService:
+    return _build_order_service(uow.session, events=_event_publisher(uow))
+
+
+async def get_order_read_service(
+    db: AsyncSession = Depends(get_read_db),
+) -> OrderService:
+    return _build_order_service(db)
+
+
+def _build_order_service(
+    db: AsyncSession, events: Optional[EventPublisher] = None
 ) -> OrderService:
+    product_repository = ProductRepository(db)
     return OrderService(
         order_repository=OrderRepository(db),
         order_item_repository=OrderItemRepository(db),
-        product_repository=ProductRepository(db),
+        product_repository=product_repository,
         promo_repository=PromoRepository(db),
+        events=events,
+        inventory=InventoryService(
+            inventory_repository=InventoryRepository(db),
+            product_repository=product_repository,
+        ),
+    )
+
+
+def get_inventory_service(
+    uow: UnitOfWork = Depends(get_uow),
+) -> InventoryService:
+    return InventoryService(
+        inventory_repository=InventoryRepository(uow.session),
+        product_repository=ProductRepository(uow.session),
     )
 
 
 async def get_user_form_service(
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
 ) -> UserFormService:
 
     return UserFormService(
-        form_repository=UserFormRepository(db),
-        goal_repository=GoalRepository(db),
-        allergy_repository=AllergyRepository(db),
+        form_repository=UserFormRepository(uow.session),
+        goal_repository=GoalRepository(uow.session),
+        allergy_repository=AllergyRepository(uow.session),
+        events=_event_publisher(uow),
     )
 
 
 def get_product_service(
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
+) -> ProductService:
+    return _build_product_service(uow)
+
+
+def get_product_read_service(
+    db: AsyncSession = Depends(get_read_db),
 ) -> ProductService:
+    return _build_product_service(UnitOfWork(db))
+
+
+def _build_product_service(uow: UnitOfWork) -> ProductService:
+    db = uow.session
+    tag_repository = TagRepository(db)
     return ProductService(
         product_repository=ProductRepository(db),
         category_repository=CategoryRepository(db),
-        tag_repository=TagRepository(db),
+        tag_repository=tag_repository,
+        tag_resolver=TagResolver(tag_repository=tag_repository),
+        cache=product_cache,
+        uow=uow,
+        events=_event_publisher(uow),
+    )
+
+
+def get_product_import_service(
+    uow: UnitOfWork = Depends(get_uow),
+) -> ProductImportService:
+    db = uow.session
+    tag_repository = TagRepository(db)
+    return ProductImportService(
+        product_repository=ProductRepository(db),
+        category_repository=CategoryRepository(db),
+        tag_repository=tag_repository,
+        tag_resolver=TagResolver(tag_repository=tag_repository),
+        cache=product_cache,
+        uow=uow,
+    )
+
+
+async def get_catalog_export_service() -> CatalogExportService:
+    return CatalogExportService(
+        session_factory=await replica_router.session_factory()
     )
 
 
 def get_recommendation_service(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> RecommendationService:
     return RecommendationService(
         product_repository=ProductRepository(db),
@@ -116,3 +293,9 @@ async def get_current_admin(
         )
 
     return current_user
+
+
+async def limit_promo(
+    current_user: UserOut = Depends(get_current_user),
+) -> None:
+    await promo_user_limiter.check(str(current_user.id))
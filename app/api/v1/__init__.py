@@ -5,6 +5,7 @@ from .order import router as order_router
 from .admin.user import router as admin_user_router
 from .admin.product import router as admin_product_router
 from .admin.promo import router as admin_promo_router
+from .admin.system import router as admin_system_router
 
 __all__ = [
     "auth_router",
@@ -14,4 +15,5 @@ __all__ = [
     "admin_user_router",
     "admin_product_router",
     "admin_promo_router",
+    "admin_system_router",
 ]
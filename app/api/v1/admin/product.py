@@ -1,6 +1,24 @@
-from fastapi import Depends, HTTPException, status, APIRouter
+from typing import Optional
 
-from app.api.dependencies import get_product_service, get_current_admin
+from fastapi import (
+    Depends,
+    HTTPException,
+    status,
+    APIRouter,
+    Query,
+    UploadFile,
+    File,
+)
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import (
+    get_product_service,
+    get_current_admin,
+    get_catalog_export_service,
+    get_product_import_service,
+    get_inventory_service,
+)
+from app.core.types import CatalogFormat
 from app.exceptions.service_errors import (
     EntityAlreadyExistsError,
     EntityNotFound,
@@ -15,11 +33,24 @@ from app.schemas import (
     CategoryCreate,
     ProductUpdate,
     UserOut,
+    ProductImportReport,
+    StockOut,
+    StockUpdate,
+)
+from app.services import (
+    ProductService,
+    CatalogExportService,
+    ProductImportService,
+    InventoryService,
 )
-from app.services import ProductService
 
 router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {
+    CatalogFormat.NDJSON: "application/x-ndjson",
+    CatalogFormat.CSV: "text/csv; charset=utf-8",
+}
+
 
 @router.post(
     "/",
@@ -232,7 +263,109 @@ async def update_product(
     product_service: ProductService = Depends(get_product_service),
 ) -> ProductOut:
     try:
-        await product_service.update_product_by_id(product_id, product_data)
+        return await product_service.update_product_by_id(
+            product_id, product_data
+        )
+    except EntityNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+
+
+@router.get(
+    "/export",
+    summary="Выгрузить весь каталог товаров",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Каталог в формате NDJSON или CSV"},
+    },
+)
+async def export_catalog(
+    export_format: CatalogFormat = Query(
+        CatalogFormat.NDJSON, alias="format", description="Формат выгрузки"
+    ),
+    admin: UserOut = Depends(get_current_admin),
+    export_service: CatalogExportService = Depends(get_catalog_export_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_service.export(export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=catalog.{export_format.value}"
+            )
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ProductImportReport,
+    summary="Массовая загрузка товаров из CSV или NDJSON",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Отчет о загрузке с ошибками по строкам"},
+    },
+)
+async def import_products(
+    file: UploadFile = File(..., description="Файл CSV или NDJSON"),
+    import_format: Optional[CatalogFormat] = Query(
+        None,
+        alias="format",
+        description="Формат файла, по умолчанию определяется по расширению",
+    ),
+    admin: UserOut = Depends(get_current_admin),
+    import_service: ProductImportService = Depends(get_product_import_service),
+) -> ProductImportReport:
+    if import_format is None:
+        filename = (file.filename or "").lower()
+        import_format = (
+            CatalogFormat.CSV
+            if filename.endswith(".csv")
+            else CatalogFormat.NDJSON
+        )
+
+    return await import_service.import_products(file.file, import_format)
+
+
+@router.get(
+    "/{product_id}/stock",
+    response_model=StockOut,
+    summary="Получить остаток товара",
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Товар не найден"}},
+)
+async def get_product_stock(
+    product_id: int,
+    admin: UserOut = Depends(get_current_admin),
+    inventory_service: InventoryService = Depends(get_inventory_service),
+) -> StockOut:
+    try:
+        return await inventory_service.get_stock(product_id)
+    except EntityNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+
+
+@router.put(
+    "/{product_id}/stock",
+    response_model=StockOut,
+    summary="Установить остаток товара",
+    description="shards > 1 распределяет остаток по нескольким строкам, "
+    "чтобы параллельные заказы популярного товара не ждали одной "
+    "блокировки.",
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Товар не найден"}},
+)
+async def set_product_stock(
+    product_id: int,
+    stock_data: StockUpdate,
+    admin: UserOut = Depends(get_current_admin),
+    inventory_service: InventoryService = Depends(get_inventory_service),
+) -> StockOut:
+    try:
+        return await inventory_service.set_stock(product_id, stock_data)
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
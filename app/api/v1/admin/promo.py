@@ -2,6 +2,7 @@ from typing import List
 
 from fastapi import Depends, HTTPException, status, APIRouter
 from app.api.dependencies import get_order_service, get_current_admin
+from app.core.responses import model_response
 from app.exceptions.service_errors import (
     EntityAlreadyExistsError,
     EntityNotFound,
@@ -86,7 +87,7 @@ async def get_all_promos(
 ) -> List[PromoOut]:
 
     try:
-        return await service.get_all_promos()
+        return model_response(await service.get_all_promos(), List[PromoOut])
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
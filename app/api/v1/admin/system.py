@@ -0,0 +1,68 @@
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from app.api.dependencies import get_current_admin
+from app.core.profiling import profile_store
+from app.database.connection import engine
+from app.database.pool import pool_stats
+from app.schemas import PoolStatsOut, RequestProfileOut, UserOut
+
+router = APIRouter()
+
+
+@router.get(
+    "/pool",
+    response_model=PoolStatsOut,
+    summary="Состояние пула соединений с БД",
+    status_code=status.HTTP_200_OK,
+)
+async def get_pool_stats(
+    admin: UserOut = Depends(get_current_admin),
+):
+    return pool_stats(engine)
+
+
+@router.get(
+    "/profiles",
+    response_model=List[RequestProfileOut],
+    summary="Профили медленных запросов",
+    status_code=status.HTTP_200_OK,
+)
+async def get_profiles(
+    admin: UserOut = Depends(get_current_admin),
+):
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Скачать профиль медленного запроса",
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+)
+async def download_profile(
+    profile_id: int,
+    format: Literal["prof", "text"] = Query(
+        "prof", description="prof — для pstats/snakeviz, text — отчёт"
+    ),
+    admin: UserOut = Depends(get_current_admin),
+):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Профиль с id {profile_id} не найден",
+        )
+
+    if format == "text":
+        return Response(content=profile.render(), media_type="text/plain")
+    return Response(
+        content=profile.dump(),
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="profile-{profile_id}.prof"'
+            )
+        },
+    )
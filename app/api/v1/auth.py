@@ -1,17 +1,21 @@
+from typing import Optional
+
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, status
 
 from app.exceptions.service_errors import (
     EntityAlreadyExistsError,
     ServiceError,
     UserNotFoundError,
     InvalidCredentialsError,
+    InvalidRefreshTokenError,
+    TooManyRequestsError,
 )
 from app.core.security import create_jwt
 from app.core.settings import settings
 from app.core.types import TokenType
 
-from app.services import UserService, NotificationService
+from app.services import UserService, NotificationService, RefreshTokenStore
 from app.schemas import (
     UserOut,
     UserAuth,
@@ -24,6 +28,9 @@ from app.api.dependencies import (
     get_current_refresh_token,
     get_current_user,
     get_notification_service,
+    get_refresh_token_store,
+    limit_login,
+    limit_registration,
 )
 
 router = APIRouter()
@@ -34,9 +41,9 @@ router = APIRouter()
     response_model=UserOut,
     summary="Регистрация нового пользователя",
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_registration)],
 )
 async def register_user(
-    background_tasks: BackgroundTasks,
     user_in: UserCreate,
     service: UserService = Depends(get_user_service),
     notification_service: NotificationService = Depends(
@@ -45,13 +52,13 @@ async def register_user(
 ):
     try:
         user = await service.register(user_in)
-        background_tasks.add_task(
-            notification_service.send_reg_email, user.email, user
-        )
+        await notification_service.send_reg_email(user.email, user)
 
         return user
     except EntityAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except TooManyRequestsError:
+        raise
     except ServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
@@ -63,10 +70,12 @@ async def register_user(
     response_model=Token,
     summary="Авторизация и получение JWT токенов",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(limit_login)],
 )
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: UserService = Depends(get_user_service),
+    refresh_token_store: RefreshTokenStore = Depends(get_refresh_token_store),
 ):
     try:
         auth_user = await service.authenticate(
@@ -79,19 +88,7 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = await create_jwt(
-        token_type=TokenType.ACCESS,
-        subject=str(auth_user.id),
-    )
-    refresh_token = await create_jwt(
-        token_type=TokenType.REFRESH,
-        subject=str(auth_user.id),
-        expires_delta=settings.REFRESH_TOKEN_EXPIRE_MINUTES,
-    )
-    return Token(
-        access_token=access_token,
-        refresh_token=refresh_token,
-    )
+    return await _issue_tokens(auth_user.id, refresh_token_store)
 
 
 @router.get(
@@ -120,19 +117,50 @@ async def read_profile(
 )
 async def refresh_access_token(
     token_data: TokenData = Depends(get_current_refresh_token),
+    refresh_token_store: RefreshTokenStore = Depends(get_refresh_token_store),
 ):
+    try:
+        user_id = await refresh_token_store.rotate(
+            token_data.jti or "", token_data.fam or ""
+        )
+    except InvalidRefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await _issue_tokens(user_id, refresh_token_store, token_data.fam)
+
+
+@router.post(
+    "/logout",
+    summary="Отозвать refresh-токены текущего входа",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def logout(
+    token_data: TokenData = Depends(get_current_refresh_token),
+    refresh_token_store: RefreshTokenStore = Depends(get_refresh_token_store),
+):
+    if token_data.fam:
+        await refresh_token_store.revoke_family(token_data.fam)
 
-    new_access_token = await create_jwt(
+
+async def _issue_tokens(
+    user_id: int, store: RefreshTokenStore, family: Optional[str] = None
+) -> Token:
+    jti, family = await store.issue(user_id, family)
+    access_token = await create_jwt(
         token_type=TokenType.ACCESS,
-        subject=token_data.sub,
+        subject=str(user_id),
     )
-    new_refresh_token = await create_jwt(
+    refresh_token = await create_jwt(
         token_type=TokenType.REFRESH,
-        subject=token_data.sub,
+        subject=str(user_id),
         expires_delta=settings.REFRESH_TOKEN_EXPIRE_MINUTES,
+        claims={"jti": jti, "fam": family},
     )
-
     return Token(
-        access_token=new_access_token,
-        refresh_token=new_refresh_token,
+        access_token=access_token,
+        refresh_token=refresh_token,
     )
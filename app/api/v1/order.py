@@ -6,16 +6,24 @@ from fastapi import (
     HTTPException,
     status,
     Query,
-    BackgroundTasks,
+    Response,
 )
 from app.schemas import OrderOut, OrderItemCreate, UserOut
 from app.services import OrderService, NotificationService
 from app.api.dependencies import (
     get_order_service,
+    get_order_read_service,
     get_current_user,
     get_notification_service,
+    get_product_cache,
+    limit_promo,
+)
+from app.core.cache import ProductCache
+from app.exceptions.service_errors import (
+    EntityNotFound,
+    OutOfStockError,
+    ServiceError,
 )
-from app.exceptions.service_errors import EntityNotFound, ServiceError
 
 router = APIRouter()
 
@@ -29,9 +37,13 @@ router = APIRouter()
 async def get_cart(
     current_user: UserOut = Depends(get_current_user),
     service: OrderService = Depends(get_order_service),
+    cache: ProductCache = Depends(get_product_cache),
 ):
     try:
-        return await service.get_active_cart(current_user.id)
+        order = await service.get_active_cart(current_user.id)
+        return Response(
+            content=cache.encode_order(order), media_type="application/json"
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -49,10 +61,14 @@ async def get_cart(
 )
 async def get_all_orders(
     current_user: UserOut = Depends(get_current_user),
-    service: OrderService = Depends(get_order_service),
+    service: OrderService = Depends(get_order_read_service),
+    cache: ProductCache = Depends(get_product_cache),
 ) -> List[OrderOut]:
     try:
-        return await service.get_confirmed_cart(current_user.id)
+        orders = await service.get_confirmed_cart(current_user.id)
+        return Response(
+            content=cache.encode_orders(orders), media_type="application/json"
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -69,9 +85,17 @@ async def add_to_cart(
     item: OrderItemCreate,
     current_user: UserOut = Depends(get_current_user),
     service: OrderService = Depends(get_order_service),
+    cache: ProductCache = Depends(get_product_cache),
 ):
     try:
-        return await service.add_item_to_cart(current_user.id, item)
+        order = await service.add_item_to_cart(current_user.id, item)
+        return Response(
+            content=cache.encode_order(order),
+            media_type="application/json",
+            status_code=status.HTTP_201_CREATED,
+        )
+    except OutOfStockError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
@@ -88,9 +112,13 @@ async def remove_from_cart(
     product_id: int,
     current_user: UserOut = Depends(get_current_user),
     service: OrderService = Depends(get_order_service),
+    cache: ProductCache = Depends(get_product_cache),
 ):
     try:
-        return await service.remove_item_from_cart(current_user.id, product_id)
+        order = await service.remove_item_from_cart(current_user.id, product_id)
+        return Response(
+            content=cache.encode_order(order), media_type="application/json"
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -102,14 +130,19 @@ async def remove_from_cart(
     response_model=OrderOut,
     summary="Применить промокод к корзине",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(limit_promo)],
 )
 async def apply_promo_to_cart(
     promo: str = Query(..., description="Промокод"),
     current_user: UserOut = Depends(get_current_user),
     service: OrderService = Depends(get_order_service),
+    cache: ProductCache = Depends(get_product_cache),
 ):
     try:
-        return await service.apply_promo_to_order(current_user.id, promo)
+        order = await service.apply_promo_to_order(current_user.id, promo)
+        return Response(
+            content=cache.encode_order(order), media_type="application/json"
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -127,9 +160,9 @@ async def apply_promo_to_cart(
     status_code=status.HTTP_200_OK,
 )
 async def confirm_order(
-    background_tasks: BackgroundTasks,
     current_user: UserOut = Depends(get_current_user),
     service: OrderService = Depends(get_order_service),
+    cache: ProductCache = Depends(get_product_cache),
     notification_service: NotificationService = Depends(
         get_notification_service
     ),
@@ -137,15 +170,17 @@ async def confirm_order(
     try:
         order = await service.confirm_order(current_user.id)
 
-        background_tasks.add_task(
-            notification_service.send_order_email, current_user.email, order
-        )
+        await notification_service.send_order_email(current_user.email, order)
 
-        return order
+        return Response(
+            content=cache.encode_order(order), media_type="application/json"
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
         )
+    except OutOfStockError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
@@ -164,9 +199,13 @@ async def confirm_order(
 async def clear_cart(
     current_user: UserOut = Depends(get_current_user),
     service: OrderService = Depends(get_order_service),
+    cache: ProductCache = Depends(get_product_cache),
 ):
     try:
-        return await service.clear_cart(current_user.id)
+        order = await service.clear_cart(current_user.id)
+        return Response(
+            content=cache.encode_order(order), media_type="application/json"
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
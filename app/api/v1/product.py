@@ -1,7 +1,8 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
 
+from app.core.responses import model_response
 from app.core.types import Gender
 from app.exceptions.service_errors import (
     EntityNotFound,
@@ -12,7 +13,7 @@ from app.schemas import (
     TagOut,
 )
 
-from app.api.dependencies import get_product_service
+from app.api.dependencies import get_product_read_service
 from app.services.product import ProductService
 
 router = APIRouter()
@@ -46,7 +47,7 @@ async def get_all_products(
     ),
     skip: int = 0,
     limit: int = 100,
-    product_service: ProductService = Depends(get_product_service),
+    product_service: ProductService = Depends(get_product_read_service),
 ) -> List[ProductOut]:
     try:
         filters = {
@@ -57,9 +58,10 @@ async def get_all_products(
             "gender": gender,
             "is_active": is_active,
         }
-        return await product_service.get_all_product(
+        payload = await product_service.get_all_product_json(
             skip=skip, limit=limit, filters=filters
         )
+        return Response(content=payload, media_type="application/json")
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -76,10 +78,10 @@ async def get_all_products(
     },
 )
 async def get_all_categories(
-    service: ProductService = Depends(get_product_service),
+    service: ProductService = Depends(get_product_read_service),
 ) -> List[CategoryOut]:
     try:
-        return await service.get_categories()
+        return model_response(await service.get_categories(), List[CategoryOut])
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -96,10 +98,10 @@ async def get_all_categories(
     },
 )
 async def get_all_tags(
-    service: ProductService = Depends(get_product_service),
+    service: ProductService = Depends(get_product_read_service),
 ) -> List[TagOut]:
     try:
-        return await service.get_tags()
+        return model_response(await service.get_tags(), List[TagOut])
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -117,10 +119,11 @@ async def get_all_tags(
 )
 async def get_product_by_id(
     product_id: int,
-    service: ProductService = Depends(get_product_service),
+    service: ProductService = Depends(get_product_read_service),
 ) -> ProductOut:
     try:
-        return await service.get_product_by_id(product_id)
+        payload = await service.get_product_json(product_id)
+        return Response(content=payload, media_type="application/json")
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
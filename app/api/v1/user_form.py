@@ -1,7 +1,9 @@
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, status, Response
 
+from app.core.cache import ProductCache
+from app.core.responses import model_response
 from app.exceptions.service_errors import (
     EntityAlreadyExistsError,
     ServiceError,
@@ -23,6 +25,7 @@ from app.api.dependencies import (
     get_user_form_service,
     get_current_user,
     get_recommendation_service,
+    get_product_cache,
 )
 from app.services.recommendation import RecommendationService
 
@@ -82,7 +85,7 @@ async def get_all_goals(
     service: UserFormService = Depends(get_user_form_service),
 ) -> List[GoalOut]:
     try:
-        return await service.get_goals()
+        return model_response(await service.get_goals(), List[GoalOut])
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -102,7 +105,7 @@ async def get_all_allergies(
     service: UserFormService = Depends(get_user_form_service),
 ) -> List[AllergyOut]:
     try:
-        return await service.get_allergies()
+        return model_response(await service.get_allergies(), List[AllergyOut])
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -188,9 +191,14 @@ async def update_user_form(
 async def get_product_recommendations(
     current_user: UserOut = Depends(get_current_user),
     service: RecommendationService = Depends(get_recommendation_service),
+    cache: ProductCache = Depends(get_product_cache),
 ):
     try:
-        return await service.get_recommendations(current_user.id)
+        products = await service.get_recommendations(current_user.id)
+        return Response(
+            content=cache.encode_products(products),
+            media_type="application/json",
+        )
     except EntityNotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
@@ -0,0 +1,263 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.metrics import registry
+from app.core.settings import settings
+from app.models import User
+from app.schemas import ProductOut, OrderOut, UserOut
+
+_product_adapter = TypeAdapter(ProductOut)
+
+
+class ProductCache:
+    def __init__(
+        self, max_size: int = 10_000, ttl: float = 60.0, settle: float = 0.0
+    ):
+        self._max_size = max_size
+        self._ttl = ttl
+        # Каталог читается с реплик: сразу после invalidate() отстающая
+        # реплика ещё отдаёт старые данные, и они легли бы в кэш под новой
+        # версией на весь TTL. В течение settle секунд ответы не кэшируются.
+        self._settle = settle
+        self._settle_until = float("-inf")
+        self._entries: OrderedDict[int, Tuple[int, float, bytes]] = (
+            OrderedDict()
+        )
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, product_id: int) -> Optional[bytes]:
+        entry = self._entries.get(product_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        version, expires_at, payload = entry
+        if version != self.version or expires_at < time.monotonic():
+            del self._entries[product_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(product_id)
+        self.hits += 1
+        return payload
+
+    def put(self, product_id: int, payload: bytes, version: int) -> None:
+        if version != self.version or time.monotonic() < self._settle_until:
+            return
+
+        self._entries[product_id] = (
+            version,
+            time.monotonic() + self._ttl,
+            payload,
+        )
+        self._entries.move_to_end(product_id)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._settle_until = time.monotonic() + self._settle
+        self._entries.clear()
+
+    def store(self, product, version: int) -> bytes:
+        payload = _product_adapter.dump_json(ProductOut.model_validate(product))
+        self.put(product.id, payload, version)
+        return payload
+
+    def encode_product(self, product, version: Optional[int] = None) -> bytes:
+        payload = self.get(product.id)
+        if payload is None:
+            payload = self.store(
+                product, self.version if version is None else version
+            )
+        return payload
+
+    def encode_products(
+        self, products: Iterable, version: Optional[int] = None
+    ) -> bytes:
+        return (
+            b"["
+            + b",".join(self.encode_product(p, version) for p in products)
+            + b"]"
+        )
+
+    def encode_order(self, order: OrderOut) -> bytes:
+        items = []
+        for item in order.items:
+            head = item.model_dump_json(exclude={"product"}).encode()
+            items.append(
+                head[:-1]
+                + b',"product":'
+                + self.encode_product(item.product)
+                + b"}"
+            )
+
+        head = order.model_dump_json(exclude={"items"}).encode()
+        return head[:-1] + b',"items":[' + b",".join(items) + b"]}"
+
+    def encode_orders(self, orders: Iterable[OrderOut]) -> bytes:
+        return b"[" + b",".join(map(self.encode_order, orders)) + b"]"
+
+
+class UserCache:
+    def __init__(self, max_size: int = 10_000, ttl: float = 30.0):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[int, Tuple[float, UserOut]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[UserOut]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user: UserOut) -> None:
+        self._entries[user.id] = (time.monotonic() + self._ttl, user)
+        self._entries.move_to_end(user.id)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TokenCache:
+    def __init__(self, max_size: int = 10_000):
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, Tuple[float, Dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        # Храним дайджест, а не сам токен.
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        expires_at = payload.get("exp")
+        if self._max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Реплика, признанная годной, отстаёт не больше чем на
+# DB_REPLICA_MAX_LAG_SECONDS плюс интервал между проверками. Без
+# DB_REPLICA_MAX_LAG_SECONDS отставание не ограничено, и окно покрывает
+# только интервал проверки.
+product_cache = ProductCache(
+    max_size=settings.PRODUCT_CACHE_SIZE,
+    ttl=settings.PRODUCT_CACHE_TTL_SECONDS,
+    settle=(
+        (settings.DB_REPLICA_MAX_LAG_SECONDS or 0.0)
+        + settings.DB_REPLICA_LAG_CHECK_INTERVAL
+        if settings.DATABASE_REPLICA_URLS
+        else 0.0
+    ),
+)
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+token_cache = TokenCache(max_size=settings.JWT_CACHE_SIZE)
+
+
+PENDING_USER_INVALIDATIONS = "pending_user_invalidations"
+
+
+# Массовые UPDATE/DELETE через session.execute эти события не вызывают,
+# такие места должны сами вызывать user_cache.invalidate.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_user_change(mapper, connection, target: User) -> None:
+    # Флаш идёт до коммита: сброс здесь позволил бы параллельному
+    # запросу вернуть в кэш старую строку. Сбрасываем после коммита.
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PENDING_USER_INVALIDATIONS, set()).add(
+            target.id
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users(session: Session) -> None:
+    for user_id in session.info.pop(PENDING_USER_INVALIDATIONS, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session: Session) -> None:
+    session.info.pop(PENDING_USER_INVALIDATIONS, None)
+
+
+CACHE_HITS = registry.counter("cache_hits_total", "Попадания в кэш", ("cache",))
+CACHE_MISSES = registry.counter(
+    "cache_misses_total", "Промахи кэша", ("cache",)
+)
+CACHE_ENTRIES = registry.gauge("cache_entries", "Записей в кэше", ("cache",))
+
+
+def _collect_cache_metrics() -> None:
+    for name, cache in (
+        ("product", product_cache),
+        ("user", user_cache),
+        ("token", token_cache),
+    ):
+        CACHE_HITS.labels(name).set(cache.hits)
+        CACHE_MISSES.labels(name).set(cache.misses)
+        CACHE_ENTRIES.labels(name).set(cache.size())
+
+
+registry.add_collector(_collect_cache_metrics)
@@ -0,0 +1,152 @@
+import asyncio
+import dataclasses
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PUBLISHED = registry.counter(
+    "events_published_total", "Опубликованные доменные события", ("event",)
+)
+EVENT_HANDLER_ERRORS = registry.counter(
+    "event_handler_errors_total",
+    "Ошибки подписчиков доменных событий",
+    ("event",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    # Имя события -> класс, для восстановления событий из outbox.
+    types: ClassVar[Dict[str, Type["Event"]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        Event.types[cls.__name__] = cls
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def to_payload(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Event":
+        return cls(**payload)
+
+
+@dataclass(frozen=True, slots=True)
+class OrderConfirmed(Event):
+    order_id: int
+    user_id: int
+    total_amount: float
+    # Пары (product_id, quantity).
+    items: Tuple[Tuple[int, int], ...]
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "OrderConfirmed":
+        items = tuple(tuple(item) for item in payload.pop("items"))
+        return cls(items=items, **payload)
+
+
+@dataclass(frozen=True, slots=True)
+class CartUpdated(Event):
+    order_id: int
+    user_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class UserFormChanged(Event):
+    user_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class ProductChanged(Event):
+    product_id: int
+
+
+E = TypeVar("E", bound=Event)
+Handler = Callable[[Any], Awaitable[None]]
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers: Dict[Type[Event], List[Handler]] = defaultdict(list)
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+
+    def subscribe(self, event_type: Type[E], handler: Handler = None):
+        # Можно использовать как декоратор: @event_bus.subscribe(Event).
+        if handler is None:
+            return lambda fn: self.subscribe(event_type, fn)
+        self._handlers[event_type].append(handler)
+        return handler
+
+    def unsubscribe(self, event_type: Type[E], handler: Handler) -> None:
+        self._handlers[event_type].remove(handler)
+
+    def publish(self, event: Event) -> None:
+        # Подписчики работают в фоне и не задерживают ответ на запрос.
+        EVENTS_PUBLISHED.labels(event.name).inc()
+        if not self._handlers.get(type(event)):
+            return
+        task = asyncio.create_task(self._dispatch_logged(event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def dispatch(self, event: Event) -> None:
+        # Выполняет всех подписчиков и пробрасывает первую ошибку,
+        # чтобы outbox мог повторить доставку.
+        handlers = self._handlers.get(type(event), ())
+        results = await asyncio.gather(
+            *(handler(event) for handler in handlers), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for error in errors:
+            EVENT_HANDLER_ERRORS.labels(event.name).inc()
+            logger.error(
+                "Ошибка подписчика события %s",
+                event.name,
+                exc_info=(type(error), error, error.__traceback__),
+            )
+        if errors:
+            raise errors[0]
+
+    async def _dispatch_logged(self, event: Event) -> None:
+        try:
+            await self.dispatch(event)
+        except Exception:
+            # Ошибки уже залогированы в dispatch.
+            pass
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def wait_for_wakeup(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def drain(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+event_bus = EventBus()
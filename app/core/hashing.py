@@ -0,0 +1,73 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.core.metrics import registry
+from app.exceptions.service_errors import TooManyRequestsError
+
+T = TypeVar("T")
+
+PASSWORD_HASH_SECONDS = registry.histogram(
+    "password_hash_duration_seconds",
+    "Время хеширования и проверки пароля",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+PASSWORD_HASH_WAIT_SECONDS = registry.histogram(
+    "password_hash_wait_seconds",
+    "Ожидание свободного потока для хеширования пароля",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+).labels()
+PASSWORD_HASH_PENDING = registry.gauge(
+    "password_hash_pending",
+    "Операции с паролями в работе и в очереди",
+).labels()
+PASSWORD_HASH_REJECTED = registry.counter(
+    "password_hash_rejected_total",
+    "Операции с паролями, отклонённые из-за переполнения очереди",
+).labels()
+
+
+class PasswordHasher:
+    def __init__(
+        self, max_workers: int = 2, max_pending: int = 32, retry_after: int = 1
+    ):
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        # bcrypt отпускает GIL, поэтому потоки дают настоящий параллелизм,
+        # а event loop не блокируется на время хеширования.
+        if self._pending >= self.max_pending:
+            PASSWORD_HASH_REJECTED.inc()
+            raise TooManyRequestsError(retry_after=self.retry_after)
+
+        self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+        submitted = time.perf_counter()
+        timer = PASSWORD_HASH_SECONDS.labels(operation)
+
+        def call() -> T:
+            started = time.perf_counter()
+            PASSWORD_HASH_WAIT_SECONDS.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                timer.observe(time.perf_counter() - started)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, call
+            )
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.dec()
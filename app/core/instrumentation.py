@@ -0,0 +1,218 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import registry
+from app.core.settings import settings
+
+logger = logging.getLogger("app.db")
+
+UNMATCHED_ROUTE = "unmatched"
+
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "Длительность SQL-запроса"
+)
+REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "Количество SQL-запросов на HTTP-запрос",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds",
+    "Суммарное время SQL-запросов на HTTP-запрос",
+    ("method", "route"),
+)
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Длительность HTTP-запроса",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Количество обрабатываемых HTTP-запросов"
+).labels()
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries", '
+            f"app;dur={total * 1000:.2f}"
+        )
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    elapsed = time.perf_counter() - context._query_started
+    DB_QUERY_SECONDS.observe(elapsed)
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if event.contains(
+        sync_engine, "after_cursor_execute", _after_cursor_execute
+    ):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+_route_templates: Dict[Callable[..., Any], str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+
+    template = _route_templates.get(endpoint)
+    if template is None:
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                template = route.path
+                break
+        else:
+            template = UNMATCHED_ROUTE
+        _route_templates[endpoint] = template
+    return template
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    stats.server_timing(time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _query_stats.reset(token)
+            self._report(
+                scope, stats, status_code, time.perf_counter() - started
+            )
+
+    @staticmethod
+    def _report(
+        scope: Scope, stats: QueryStats, status_code: int, elapsed: float
+    ) -> None:
+        method = scope["method"]
+        route = route_template(scope)
+        REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+        REQUEST_DB_SECONDS.labels(method, route).observe(stats.total_time)
+
+        slow = (
+            stats.count > settings.QUERY_COUNT_WARN_THRESHOLD
+            or stats.slowest_time * 1000 > settings.SLOW_QUERY_WARN_MS
+        )
+        level = logging.WARNING if slow else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(
+            level,
+            "db_stats method=%s route=%s status=%s queries=%d db_ms=%.2f "
+            "total_ms=%.2f slowest_ms=%.2f",
+            method,
+            route,
+            status_code,
+            stats.count,
+            stats.total_time * 1000,
+            elapsed * 1000,
+            stats.slowest_time * 1000,
+            extra={
+                "method": method,
+                "route": route,
+                "status": status_code,
+                "queries": stats.count,
+                "db_ms": round(stats.total_time * 1000, 2),
+                "total_ms": round(elapsed * 1000, 2),
+                "slowest_ms": round(stats.slowest_time * 1000, 2),
+                "slowest_statement": stats.slowest_statement,
+            },
+        )
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_SECONDS.labels(
+                scope["method"], route_template(scope), status_code
+            ).observe(time.perf_counter() - started)
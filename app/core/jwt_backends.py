@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Protocol
+
+
+class TokenError(Exception):
+    pass
+
+
+class JWTBackend(Protocol):
+    def encode(
+        self, claims: Dict[str, Any], key: str, algorithm: str
+    ) -> str: ...
+
+    def decode(
+        self, token: str, key: str, algorithms: List[str]
+    ) -> Dict[str, Any]: ...
+
+
+class JoseBackend:
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(
+        self, token: str, key: str, algorithms: List[str]
+    ) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._error as e:
+            raise TokenError(str(e)) from e
+
+
+class PyJWTBackend:
+    def __init__(self):
+        try:
+            import jwt
+        except ImportError as e:
+            raise RuntimeError("Для JWT_BACKEND=pyjwt нужен пакет PyJWT") from e
+
+        self._jwt = jwt
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(
+        self, token: str, key: str, algorithms: List[str]
+    ) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+
+BACKENDS = {
+    "jose": JoseBackend,
+    "pyjwt": PyJWTBackend,
+}
+
+
+def get_jwt_backend(name: str) -> JWTBackend:
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный JWT_BACKEND {name!r}, доступны: {', '.join(BACKENDS)}"
+        )
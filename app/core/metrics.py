@@ -0,0 +1,257 @@
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        # Последняя ячейка counts — переполнение (+Inf).
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"Метрика {self.name} ожидает метки {self.labelnames}"
+                )
+            key = tuple(str(v) for v in values)
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+                # Кэшируем и по исходным значениям, чтобы повторные вызовы
+                # не приводили метки к строкам.
+                self._children[values] = child
+        return child
+
+    def _child(self, labels: Dict[str, str]):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Метрика {self.name} ожидает метки {self.labelnames}"
+            )
+        return self.labels(*(str(labels[name]) for name in self.labelnames))
+
+    def _items(self) -> List[Tuple[LabelValues, object]]:
+        with self._lock:
+            children = list(self._children.items())
+        seen = set()
+        items = []
+        for key, child in children:
+            if id(child) not in seen:
+                seen.add(id(child))
+                items.append((tuple(str(v) for v in key), child))
+        return items
+
+    @abstractmethod
+    def _new_child(self): ...
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value(self._lock)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._child(labels).inc(amount)
+
+    def set(self, value: float, **labels: str) -> None:
+        # Для коллекторов, зеркалирующих уже накопленные внешние счётчики.
+        self._child(labels).set(value)
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        return [(self.name, key, child.value) for key, child in self._items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self._child(labels).dec(amount)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets, self._lock)
+
+    def observe(self, value: float, **labels: str) -> None:
+        self._child(labels).observe(value)
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        return {
+            key: (list(child.counts), child.sum) for key, child in self._items()
+        }
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        result = []
+        for key, (counts, total) in self.snapshot().items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                result.append(
+                    (f"{self.name}_bucket", key + (bound,), cumulative)
+                )
+            result.append((f"{self.name}_sum", key, total))
+            result.append((f"{self.name}_count", key, cumulative))
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram, name, help, labelnames, buckets=buckets
+        )
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> List[Metric]:
+        for collector in self._collectors:
+            collector()
+        with self._lock:
+            return list(self._metrics.values())
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def _register(self, cls, name, help, labelnames, **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls:
+                raise ValueError(f"Метрика {name} уже зарегистрирована")
+            return metric
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return f"{value:.1f}"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_text(registry: MetricsRegistry) -> str:
+    lines = []
+    for metric in registry.collect():
+        labelnames = metric.labelnames
+        if isinstance(metric, Histogram):
+            labelnames += ("le",)
+        lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, key, value in metric.samples():
+            names = (
+                labelnames if len(key) == len(labelnames) else labelnames[:-1]
+            )
+            if key:
+                labels = ",".join(
+                    f'{label}="{_escape(v)}"' for label, v in zip(names, key)
+                )
+                name = f"{name}{{{labels}}}"
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,135 @@
+import cProfile
+import io
+import itertools
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Deque, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.instrumentation import route_template
+from app.core.settings import settings
+
+
+@dataclass(slots=True)
+class RequestProfile:
+    id: int
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    created_at: datetime
+    stats: dict = field(repr=False)
+
+    def dump(self) -> bytes:
+        # Формат pstats/cProfile.dump_stats: открывается snakeviz и pstats.
+        return marshal.dumps(self.stats)
+
+    def render(self, limit: int = 50, sort: str = "cumulative") -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.stats = dict(self.stats)
+        stats.get_top_level_stats()
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+class ProfileStore:
+    def __init__(self, max_size: int = 20):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=max_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        profiler: cProfile.Profile,
+        scope: Scope,
+        status: int,
+        duration: float,
+    ) -> RequestProfile:
+        profiler.create_stats()
+        with self._lock:
+            profile = RequestProfile(
+                id=next(self._ids),
+                method=scope["method"],
+                path=scope["path"],
+                route=route_template(scope),
+                status=status,
+                duration_ms=round(duration * 1000, 2),
+                created_at=datetime.now(timezone.utc),
+                stats=profiler.stats,
+            )
+            self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+# cProfile видит весь поток, поэтому одновременно профилируется не больше
+# одного запроса, а в профиль попадают и конкурентные корутины.
+class SlowRequestProfilerMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        sample_rate: float = 0.1,
+        threshold_ms: float = 500.0,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.threshold = threshold_ms / 1000
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or self._active
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.threshold:
+                self.store.add(profiler, scope, status_code, elapsed)
+
+
+profile_store = ProfileStore(max_size=settings.PROFILER_MAX_PROFILES)
@@ -0,0 +1,162 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Protocol, Tuple
+
+from app.core.metrics import registry
+from app.exceptions.service_errors import TooManyRequestsError
+
+RATE_LIMIT_REJECTED = registry.counter(
+    "rate_limit_rejected_total",
+    "Запросы, отклонённые ограничителем частоты",
+    ("limiter",),
+)
+
+
+class RateLimitBackend(Protocol):
+    # Списывает cost жетонов из корзины key. Возвращает 0, если запрос
+    # разрешён, иначе число секунд до появления нужного числа жетонов.
+    async def acquire(
+        self, key: str, capacity: int, refill_rate: float, cost: float = 1.0
+    ) -> float: ...
+
+
+class _Shard:
+    __slots__ = ("buckets", "lock")
+
+    def __init__(self):
+        self.buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class InMemoryRateLimitBackend:
+    def __init__(
+        self,
+        shards: int = 16,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self._max_keys_per_shard = max(1, max_keys // shards)
+        self._clock = clock
+
+    async def acquire(
+        self, key: str, capacity: int, refill_rate: float, cost: float = 1.0
+    ) -> float:
+        return self.take(key, capacity, refill_rate, cost)
+
+    def take(
+        self, key: str, capacity: int, refill_rate: float, cost: float = 1.0
+    ) -> float:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = self._clock()
+        with shard.lock:
+            tokens, updated = shard.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / refill_rate
+            shard.buckets[key] = (tokens, now)
+            # Вытесняются давно не встречавшиеся ключи: их корзины к этому
+            # времени почти наверняка снова полны.
+            if len(shard.buckets) > self._max_keys_per_shard:
+                shard.buckets.popitem(last=False)
+        return retry_after
+
+    def size(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+
+# Состояние корзины хранится в хеше и обновляется одним скриптом, поэтому
+# лимит общий для всех воркеров и инстансов.
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 't', 'u')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend:
+    def __init__(self, url: str, prefix: str = "rate_limit:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "Для RATE_LIMIT_BACKEND=redis нужен пакет redis"
+            ) from e
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._prefix = prefix
+
+    async def acquire(
+        self, key: str, capacity: int, refill_rate: float, cost: float = 1.0
+    ) -> float:
+        retry_after = await self._script(
+            keys=[self._prefix + key],
+            args=[capacity, refill_rate, time.time(), cost],
+        )
+        return float(retry_after)
+
+
+def build_rate_limit_backend(
+    name: str,
+    redis_url: Optional[str] = None,
+    shards: int = 16,
+    max_keys: int = 100_000,
+) -> RateLimitBackend:
+    if name == "memory":
+        return InMemoryRateLimitBackend(shards=shards, max_keys=max_keys)
+    if name == "redis":
+        if not redis_url:
+            raise ValueError(
+                "Для RATE_LIMIT_BACKEND=redis нужен RATE_LIMIT_REDIS_URL"
+            )
+        return RedisRateLimitBackend(redis_url)
+    raise ValueError(
+        f"Неизвестный RATE_LIMIT_BACKEND {name!r}, доступны: memory, redis"
+    )
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        backend: RateLimitBackend,
+        limit: int,
+        period: float,
+    ):
+        self.name = name
+        self.backend = backend
+        self.limit = limit
+        self.period = period
+        self._rejected = RATE_LIMIT_REJECTED.labels(name)
+
+    async def check(self, key: str, cost: float = 1.0) -> None:
+        # limit <= 0 отключает ограничение.
+        if self.limit <= 0:
+            return
+
+        retry_after = await self.backend.acquire(
+            f"{self.name}:{key}", self.limit, self.limit / self.period, cost
+        )
+        if retry_after > 0:
+            self._rejected.inc()
+            raise TooManyRequestsError(retry_after=math.ceil(retry_after))
@@ -0,0 +1,46 @@
+import json
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def get_adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None and settings.USE_ORJSON:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def model_response(
+    content: Any, tp: Any, status_code: int = status.HTTP_200_OK
+) -> Response:
+    return Response(
+        content=get_adapter(tp).dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -1,30 +1,76 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import List, Optional, Tuple
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from app.core.cache import token_cache
+from app.core.hashing import PasswordHasher
+from app.core.jwt_backends import TokenError, get_jwt_backend
 from app.core.types import TokenType
 from app.schemas import TokenData
 from app.core.settings import settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def build_crypt_context(
+    schemes: Optional[List[str]] = None,
+    bcrypt_rounds: Optional[int] = None,
+) -> CryptContext:
+    schemes = list(schemes or settings.PASSWORD_SCHEMES)
+    bcrypt_rounds = bcrypt_rounds or settings.BCRYPT_ROUNDS
+    # min/max совпадают с целевым значением, чтобы needs_update срабатывал
+    # при любом изменении стоимости, а не только при её повышении.
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__time_cost=settings.ARGON2_TIME_COST,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
+
+
+pwd_context = build_crypt_context()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+jwt_backend = get_jwt_backend(settings.JWT_BACKEND)
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.run(
+        "verify", pwd_context.verify, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return await password_hasher.run(
+        "verify",
+        pwd_context.verify_and_update,
+        plain_password,
+        hashed_password,
+    )
 
 
 async def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return await password_hasher.run("hash", pwd_context.hash, password)
 
 
 async def create_jwt(
-    token_type, subject: str, expires_delta: Optional[timedelta] = None
+    token_type,
+    subject: str,
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[dict] = None,
 ) -> str:
     if not expires_delta:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -33,12 +79,26 @@ async def create_jwt(
 
     expire = datetime.utcnow() + expires_delta
     to_encode = {"token_type": token_type, "sub": subject, "exp": expire}
-    return jwt.encode(to_encode, settings.SECRET_KEY)
+    if claims:
+        to_encode.update(claims)
+    return jwt_backend.encode(
+        to_encode, settings.SECRET_KEY, settings.JWT_ALGORITHM
+    )
+
+
+def _decode_payload(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt_backend.decode(
+            token, settings.SECRET_KEY, [settings.JWT_ALGORITHM]
+        )
+        token_cache.put(token, payload)
+    return payload
 
 
 async def _decode_token_base(token: str, expected_type: TokenType) -> TokenData:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY)
+        payload = _decode_payload(token)
         token_type = payload.get("token_type")
 
         if token_type != expected_type:
@@ -47,7 +107,7 @@ async def _decode_token_base(token: str, expected_type: TokenType) -> TokenData:
                 detail=f"Неправильный тип токена {token_type}. Ожидался {expected_type}",
             )
         return TokenData(**payload)
-    except JWTError as e:
+    except TokenError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Ошибка валидации токена: {str(e)}",
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,9 +12,97 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     TEST_DB_URL: str = "sqlite+aiosqlite:///./test.db"
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    WEB_CONCURRENCY: int = 1
+
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: Optional[float] = None
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 43_200
+    REFRESH_TOKEN_STORE: str = "database"
+    REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS: float = 3600.0
+    REFRESH_TOKEN_CLEANUP_BATCH_SIZE: int = 1000
+    JWT_BACKEND: str = "jose"
+    JWT_ALGORITHM: str = "HS256"
+    JWT_CACHE_SIZE: int = 10_000
+
+    # Первая схема используется для новых хешей, остальные считаются
+    # устаревшими и обновляются при входе. Для argon2 нужен argon2-cffi.
+    PASSWORD_SCHEMES: List[str] = ["bcrypt"]
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65_536
+    ARGON2_PARALLELISM: int = 4
+
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Лимиты задаются числом запросов за RATE_LIMIT_PERIOD_SECONDS,
+    # 0 отключает соответствующий лимит.
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_PERIOD_SECONDS: float = 60.0
+    RATE_LIMIT_LOGIN_PER_IP: int = 30
+    RATE_LIMIT_LOGIN_PER_EMAIL: int = 10
+    RATE_LIMIT_REGISTER_PER_IP: int = 10
+    RATE_LIMIT_PROMO_PER_USER: int = 20
+
+    SMTP_HOST: str = "mail_dev"
+    SMTP_PORT: int = 1025
+    SMTP_START_TLS: bool = False
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_POOL_SIZE: int = 4
+    EMAIL_FROM: str = "xuy@mail.ru"
+    EMAIL_BATCH_SIZE: int = 100
+    EMAIL_POLL_INTERVAL_SECONDS: float = 1.0
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 5.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_LEASE_SECONDS: float = 300.0
+    # Отдельный процесс: python -m app.workers.email. Внутри веб-процесса
+    # воркер удобен для локальной разработки.
+    EMAIL_WORKER_IN_PROCESS: bool = False
+
+    # Без outbox подписчики вызываются в фоне после коммита и события
+    # теряются при рестарте; с outbox доставка не менее одного раза.
+    EVENT_OUTBOX_ENABLED: bool = False
+    EVENT_OUTBOX_BATCH_SIZE: int = 100
+    EVENT_OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    EVENT_OUTBOX_RETRY_BASE_SECONDS: float = 1.0
+    EVENT_OUTBOX_RETRY_MAX_SECONDS: float = 600.0
+    EVENT_OUTBOX_RETENTION_HOURS: float = 24.0
+
+    USE_ORJSON: bool = True
+
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_COUNT_WARN_THRESHOLD: int = 30
+    SLOW_QUERY_WARN_MS: float = 200.0
+
+    METRICS_ENABLED: bool = True
+
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.1
+    PROFILER_SLOW_MS: float = 500.0
+    PROFILER_MAX_PROFILES: int = 20
+
+    PRODUCT_CACHE_SIZE: int = 10_000
+    PRODUCT_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 30.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,108 @@
+import html
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Dict, Iterable, List, Mapping
+
+EMAIL_TEMPLATE_DIR = (
+    Path(__file__).resolve().parent.parent / "templates" / "email"
+)
+
+EMAIL_SUBJECTS = {
+    "registration": "Вы успешно зарегистрировались",
+    "order_confirmed": "Подтверждение заказа №$order_id",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Fragment:
+    # Уже отрендеренный фрагмент: в HTML подставляется без экранирования.
+    text: str
+    html: str
+
+    @classmethod
+    def join(cls, fragments: Iterable["Fragment"]) -> "Fragment":
+        fragments = list(fragments)
+        return cls(
+            text="\n".join(f.text for f in fragments),
+            html="\n".join(f.html for f in fragments),
+        )
+
+
+EMPTY = Fragment(text="", html="")
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedEmail:
+    subject: str
+    text: str
+    html: str
+
+
+class EmailTemplate:
+    __slots__ = ("name", "_subject", "_text", "_html")
+
+    def __init__(self, name: str, subject: str, text: str, html_body: str):
+        self.name = name
+        self._subject = Template(subject)
+        self._text = Template(text)
+        self._html = Template(html_body)
+
+    def render(self, context: Mapping[str, object]) -> RenderedEmail:
+        text_context, html_context = self._split(context)
+        return RenderedEmail(
+            subject=self._subject.substitute(text_context),
+            text=self._text.substitute(text_context),
+            html=self._html.substitute(html_context),
+        )
+
+    def render_fragment(self, context: Mapping[str, object]) -> Fragment:
+        text_context, html_context = self._split(context)
+        return Fragment(
+            text=self._text.substitute(text_context),
+            html=self._html.substitute(html_context),
+        )
+
+    @staticmethod
+    def _split(context: Mapping[str, object]):
+        text_context: Dict[str, str] = {}
+        html_context: Dict[str, str] = {}
+        for key, value in context.items():
+            if isinstance(value, Fragment):
+                text_context[key] = value.text
+                html_context[key] = value.html
+            else:
+                text_context[key] = str(value)
+                html_context[key] = html.escape(str(value))
+        return text_context, html_context
+
+
+class EmailTemplates:
+    # Шаблоны читаются и разбираются один раз при импорте, рендеринг —
+    # только подстановка значений.
+    def __init__(self, directory: Path, subjects: Mapping[str, str]):
+        self._templates: Dict[str, EmailTemplate] = {}
+        for text_path in sorted(directory.glob("*.txt")):
+            name = text_path.stem
+            html_path = text_path.with_suffix(".html")
+            self._templates[name] = EmailTemplate(
+                name,
+                subjects.get(name, ""),
+                text_path.read_text(encoding="utf-8").rstrip("\n"),
+                html_path.read_text(encoding="utf-8").rstrip("\n"),
+            )
+
+    def __getitem__(self, name: str) -> EmailTemplate:
+        return self._templates[name]
+
+    def render(self, name: str, context: Mapping[str, object]) -> RenderedEmail:
+        return self._templates[name].render(context)
+
+    def render_batch(
+        self, name: str, contexts: Iterable[Mapping[str, object]]
+    ) -> List[RenderedEmail]:
+        template = self._templates[name]
+        return [template.render(context) for context in contexts]
+
+
+email_templates = EmailTemplates(EMAIL_TEMPLATE_DIR, EMAIL_SUBJECTS)
@@ -21,6 +21,19 @@ class OrderStatus(str, Enum):
     COMPLETED = "COMPLETED"
 
 
+@unique
+class EmailStatus(str, Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+@unique
+class CatalogFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 @unique
 class Gender(str, Enum):
     ANY = "ANY"
@@ -1,26 +1,43 @@
 from typing import AsyncGenerator, Any
 
-from sqlalchemy.ext.asyncio import (
-    create_async_engine,
-    AsyncSession,
-    async_sessionmaker,
-)
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.settings import settings
+from app.database.pool import build_engine
+from app.database.routing import Replica, ReplicaRouter
+from app.database.session import make_session_factory
+from app.database.unit_of_work import UnitOfWork
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-)
+engine = build_engine(settings.DATABASE_URL)
+
+AsyncSessionLocal = make_session_factory(engine)
+
+replica_engines = [build_engine(url) for url in settings.DATABASE_REPLICA_URLS]
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+replica_router = ReplicaRouter(
+    primary=Replica(engine=engine),
+    replicas=[
+        Replica(engine=replica_engine) for replica_engine in replica_engines
+    ],
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
 )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+        yield session
+
+
+async def get_uow(
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[UnitOfWork, Any]:
+    async with UnitOfWork(db) as uow:
+        yield uow
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession | Any, Any]:
+    session_factory = await replica_router.session_factory(read_only=True)
+    async with session_factory() as session:
+        yield session
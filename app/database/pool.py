@@ -0,0 +1,149 @@
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.core.metrics import registry
+from app.core.settings import settings
+
+
+@dataclass(slots=True)
+class CheckoutStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def observe(self, elapsed: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += elapsed
+        if elapsed > self.wait_seconds_max:
+            self.wait_seconds_max = elapsed
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_stats.timeouts += 1
+            raise
+        finally:
+            self.checkout_stats.observe(time.perf_counter() - started)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+
+def pool_limits() -> Tuple[int, int]:
+    if settings.DB_MAX_CONNECTIONS is None:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    per_worker = max(1, settings.DB_MAX_CONNECTIONS // settings.WEB_CONCURRENCY)
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    return pool_size, per_worker - pool_size
+
+
+def engine_options(database_url: str) -> Tuple[Any, Dict[str, Any]]:
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return url, {}
+
+    pool_size, max_overflow = pool_limits()
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if url.get_driver_name() == "asyncpg":
+        connect_args: Dict[str, Any] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+        if settings.DB_PGBOUNCER:
+            # PgBouncer в режиме transaction не сохраняет prepared statements
+            # между транзакциями, поэтому кэши asyncpg и SQLAlchemy отключены.
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = (
+                lambda: f"__asyncpg_{uuid.uuid4()}__"
+            )
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        options["connect_args"] = connect_args
+
+    return url, options
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    url, options = engine_options(database_url)
+    return create_async_engine(url, **options)
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+
+    stats = pool.checkout_stats
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_seconds_total": round(stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(stats.wait_seconds_max, 6),
+    }
+
+
+POOL_GAUGES = {
+    key: registry.gauge(f"db_pool_{key}", help, ("engine",))
+    for key, help in (
+        ("size", "Размер пула соединений"),
+        ("max_overflow", "Допустимое превышение размера пула"),
+        ("checked_in", "Свободные соединения в пуле"),
+        ("checked_out", "Выданные соединения пула"),
+        ("overflow", "Соединения сверх размера пула"),
+        ("wait_seconds_max", "Максимальное ожидание соединения"),
+    )
+}
+POOL_COUNTERS = {
+    key: registry.counter(f"db_pool_{key}_total", help, ("engine",))
+    for key, help in (
+        ("checkouts", "Выдачи соединений из пула"),
+        ("timeouts", "Таймауты ожидания соединения"),
+        ("wait_seconds", "Суммарное ожидание соединения"),
+    )
+}
+
+
+def register_pool_metrics(engines: Dict[str, AsyncEngine]) -> None:
+    def collect() -> None:
+        for name, engine in engines.items():
+            stats = pool_stats(engine)
+            if "checkouts" not in stats:
+                continue
+            stats["wait_seconds"] = stats.pop("wait_seconds_total")
+            for key, gauge in POOL_GAUGES.items():
+                gauge.labels(name).set(stats[key])
+            for key, counter in POOL_COUNTERS.items():
+                counter.labels(name).set(stats[key])
+
+    registry.add_collector(collect)
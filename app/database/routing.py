@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database.session import make_session_factory
+
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+@dataclass(slots=True)
+class Replica:
+    engine: AsyncEngine
+    healthy: bool = True
+    lag_seconds: Optional[float] = None
+    checked_at: float = float("-inf")
+    session_factory: async_sessionmaker[AsyncSession] = field(init=False)
+    read_only_session_factory: async_sessionmaker[AsyncSession] = field(
+        init=False
+    )
+
+    def __post_init__(self) -> None:
+        self.session_factory = make_session_factory(self.engine)
+        self.read_only_session_factory = make_session_factory(
+            self.engine, read_only=True
+        )
+
+    def factory(self, read_only: bool) -> async_sessionmaker[AsyncSession]:
+        if read_only:
+            return self.read_only_session_factory
+        return self.session_factory
+
+
+@dataclass(slots=True)
+class ReplicaRouter:
+    primary: Replica
+    replicas: List[Replica] = field(default_factory=list)
+    max_lag_seconds: Optional[float] = None
+    check_interval: float = 5.0
+    _cycle: itertools.cycle = field(init=False, repr=False)
+    _lock: asyncio.Lock = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._cycle = itertools.cycle(self.replicas)
+        self._lock = asyncio.Lock()
+
+    async def session_factory(
+        self, read_only: bool = False
+    ) -> async_sessionmaker[AsyncSession]:
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if await self._is_usable(replica):
+                return replica.factory(read_only)
+        return self.primary.factory(read_only)
+
+    async def _is_usable(self, replica: Replica) -> bool:
+        if self.max_lag_seconds is None:
+            return True
+        if time.monotonic() - replica.checked_at >= self.check_interval:
+            async with self._lock:
+                if time.monotonic() - replica.checked_at >= self.check_interval:
+                    await self._check_lag(replica)
+        return replica.healthy
+
+    async def _check_lag(self, replica: Replica) -> None:
+        replica.checked_at = time.monotonic()
+        if replica.engine.dialect.name != "postgresql":
+            replica.healthy = True
+            return
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await conn.scalar(REPLICA_LAG_QUERY)
+        except Exception:
+            logger.warning("Реплика %s недоступна", replica.engine.url)
+            replica.healthy = False
+            replica.lag_seconds = None
+            return
+
+        replica.lag_seconds = float(lag)
+        replica.healthy = replica.lag_seconds <= self.max_lag_seconds
+        if not replica.healthy:
+            logger.warning(
+                "Отставание реплики %s: %.1f с",
+                replica.engine.url,
+                replica.lag_seconds,
+            )
@@ -0,0 +1,53 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+HAS_WRITES = "has_writes"
+
+
+class TrackedSession(Session):
+    pass
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_flush(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_execute(state: ORMExecuteState) -> None:
+    if not state.is_select:
+        state.session.info[HAS_WRITES] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+@event.listens_for(TrackedSession, "after_soft_rollback")
+def _reset_writes(session: Session, *args) -> None:
+    session.info.pop(HAS_WRITES, None)
+
+
+# UnitOfWork не отправляет COMMIT для сессий без записей. Запрос при
+# этом не экономится: при возврате в пул соединение всё равно получает
+# ROLLBACK (reset on return). Без BEGIN/COMMIT обходятся только сессии
+# чтения с AUTOCOMMIT (make_session_factory(read_only=True)).
+def has_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get(HAS_WRITES)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+def make_session_factory(
+    engine: AsyncEngine, read_only: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    if read_only:
+        engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=TrackedSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
@@ -11,6 +11,7 @@ from app.exceptions.service_errors import (
     InvalidCredentialsError,
     UserNotFoundError,
     EntityAlreadyExistsError,
+    TooManyRequestsError,
 )
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,17 @@ def register_errors_handler(app: FastAPI) -> None:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    @app.exception_handler(TooManyRequestsError)
+    async def too_many_requests_handler(
+        request: Request, exc: TooManyRequestsError
+    ):
+        logger.warning(f"TooManyRequestsError: {exc}")
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
         logger.info(
@@ -1,3 +1,6 @@
+from typing import Iterable
+
+
 class ServiceError(Exception):
     pass
 
@@ -14,6 +17,19 @@ class OrderAtWorkError(ServiceError):
         super().__init__(message)
 
 
+class OutOfStockError(ServiceError):
+
+    def __init__(
+        self,
+        product_ids: Iterable[int] = (),
+        message: str = "Недостаточно товара на складе",
+    ):
+        self.product_ids = sorted(product_ids)
+        if self.product_ids:
+            message = f"{message}: {', '.join(map(str, self.product_ids))}"
+        super().__init__(message)
+
+
 class UserNotFoundError(ServiceError):
 
     def __init__(self, message: str = "Пользователь не найден"):
@@ -30,3 +46,32 @@ class InvalidCredentialsError(ServiceError):
 
     def __init__(self, message: str = "Неверные учетные данные"):
         super().__init__(message)
+
+
+class InvalidRefreshTokenError(ServiceError):
+
+    def __init__(
+        self, message: str = "Refresh-токен недействителен или отозван"
+    ):
+        super().__init__(message)
+
+
+class RefreshTokenReuseError(InvalidRefreshTokenError):
+
+    def __init__(
+        self,
+        message: str = "Повторное использование refresh-токена, "
+        "все сессии этого входа отозваны",
+    ):
+        super().__init__(message)
+
+
+class TooManyRequestsError(ServiceError):
+
+    def __init__(
+        self,
+        message: str = "Слишком много запросов, повторите попытку позже",
+        retry_after: int = 1,
+    ):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -1,14 +1,36 @@
+import asyncio
 from contextlib import asynccontextmanager
 import logging
 import uvicorn
 import traceback_with_variables
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.create_admin import create_admin_user
+from app.api.dependencies import (
+    password_rehash_service,
+    refresh_token_store,
+)
+from app.core.instrumentation import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    instrument_engine,
+)
+from app.core.metrics import CONTENT_TYPE, registry, render_text
+from app.core.profiling import SlowRequestProfilerMiddleware, profile_store
+from app.core.responses import FastJSONResponse
+from app.core.settings import settings
+from app.core.events import event_bus
+from app.services import EventOutboxDispatcher, build_email_worker
 from app.models.base import Base
-from app.database.connection import engine, AsyncSessionLocal
+from app.database.pool import register_pool_metrics
+from app.database.unit_of_work import UnitOfWork
+from app.database.connection import (
+    engine,
+    replica_engines,
+    AsyncSessionLocal,
+)
 
 from app.api.v1 import (
     auth_router,
@@ -18,6 +40,7 @@ from app.api.v1 import (
     admin_user_router,
     admin_product_router,
     admin_promo_router,
+    admin_system_router,
 )
 from app.exceptions.handler_errors import register_errors_handler
 
@@ -27,18 +50,89 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     async with AsyncSessionLocal() as session:
-        try:
+        async with UnitOfWork(session):
             await create_admin_user(session)
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+
+    cleanup_task = asyncio.create_task(
+        refresh_token_store.run_cleanup(
+            settings.REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS,
+            settings.REFRESH_TOKEN_CLEANUP_BATCH_SIZE,
+        )
+    )
+    email_worker_stop = asyncio.Event()
+    email_worker_task = None
+    if settings.EMAIL_WORKER_IN_PROCESS:
+        email_worker_task = asyncio.create_task(
+            build_email_worker(AsyncSessionLocal).run(email_worker_stop)
+        )
+
+    event_dispatcher_stop = asyncio.Event()
+    event_dispatcher_task = None
+    if settings.EVENT_OUTBOX_ENABLED:
+        event_dispatcher_task = asyncio.create_task(
+            EventOutboxDispatcher(
+                event_bus,
+                AsyncSessionLocal,
+                batch_size=settings.EVENT_OUTBOX_BATCH_SIZE,
+                poll_interval=settings.EVENT_OUTBOX_POLL_INTERVAL_SECONDS,
+                retry_base=settings.EVENT_OUTBOX_RETRY_BASE_SECONDS,
+                retry_max=settings.EVENT_OUTBOX_RETRY_MAX_SECONDS,
+                retention=settings.EVENT_OUTBOX_RETENTION_HOURS * 3600,
+            ).run(event_dispatcher_stop)
+        )
 
     yield
+    cleanup_task.cancel()
+    if email_worker_task is not None:
+        email_worker_stop.set()
+        await email_worker_task
+    if event_dispatcher_task is not None:
+        event_dispatcher_stop.set()
+        event_bus.wake()
+        await event_dispatcher_task
+    await event_bus.drain()
+    await password_rehash_service.drain()
     await engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+
+
+app = FastAPI(
+    title="VitaminBox",
+    lifespan=lifespan,
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+)
+
+if settings.QUERY_STATS_ENABLED:
+    for db_engine in (engine, *replica_engines):
+        instrument_engine(db_engine)
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.METRICS_ENABLED:
+    register_pool_metrics(
+        {
+            "primary": engine,
+            **{
+                f"replica{i}": replica_engine
+                for i, replica_engine in enumerate(replica_engines)
+            },
+        }
+    )
+    app.add_middleware(MetricsMiddleware)
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(content=render_text(registry), media_type=CONTENT_TYPE)
 
-app = FastAPI(title="VitaminBox", lifespan=lifespan, version="1.0.0")
+
+if settings.PROFILER_ENABLED:
+    app.add_middleware(
+        SlowRequestProfilerMiddleware,
+        store=profile_store,
+        sample_rate=settings.PROFILER_SAMPLE_RATE,
+        threshold_ms=settings.PROFILER_SLOW_MS,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -73,6 +167,11 @@ app.include_router(
     prefix=f"{API_V1_ADMIN}/promo",
     tags=["Админка: Промокод"],
 )
+app.include_router(
+    admin_system_router,
+    prefix=f"{API_V1_ADMIN}/system",
+    tags=["Админка: Система"],
+)
 
 register_errors_handler(app)
 
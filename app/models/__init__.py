@@ -4,6 +4,10 @@ from .user_form import UserForm, user_goals, user_allergies
 from .goal_allergy import Goal, Allergy
 from .order import Order, OrderItem, Promo
 from .intake import VitaminIntake
+from .refresh_token import RefreshToken
+from .email_outbox import EmailOutbox
+from .event_outbox import EventOutbox
+from .inventory import ProductStockShard
 
 __all__ = [
     "User",
@@ -16,6 +20,10 @@ __all__ = [
     "OrderItem",
     "Order",
     "Promo",
+    "RefreshToken",
+    "EmailOutbox",
+    "EventOutbox",
+    "ProductStockShard",
     "user_goals",
     "user_allergies",
     "Tag",
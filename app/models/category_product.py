@@ -81,12 +81,18 @@ class Product(Base):
     is_active: Mapped[bool] = mapped_column(
         Boolean, default=True, nullable=False
     )
+    # NULL — остаток не отслеживается. При stock_shards > 0 остаток
+    # хранится в product_stock_shards, а stock не используется.
+    stock: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    stock_shards: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     category: Mapped[Category] = relationship(
-        back_populates="products", lazy="selectin"
+        back_populates="products", lazy="raise"
     )
     tags: Mapped[List[Tag]] = relationship(
-        secondary=product_tags, back_populates="products", lazy="selectin"
+        secondary=product_tags, back_populates="products", lazy="raise"
     )
     order_items: Mapped[List["OrderItem"]] = relationship(
         back_populates="product", cascade="all, delete-orphan"
@@ -48,9 +48,9 @@ class Order(Base):
 
     user: Mapped["User"] = relationship(back_populates="orders")
     items: Mapped[List["OrderItem"]] = relationship(
-        back_populates="order", cascade="all, delete-orphan", lazy="selectin"
+        back_populates="order", cascade="all, delete-orphan", lazy="raise"
     )
-    promo: Mapped[Optional["Promo"]] = relationship(lazy="selectin")
+    promo: Mapped[Optional["Promo"]] = relationship(lazy="raise")
 
 
 class OrderItem(Base):
@@ -69,5 +69,5 @@ class OrderItem(Base):
 
     order: Mapped[Order] = relationship(back_populates="items")
     product: Mapped["Product"] = relationship(
-        back_populates="order_items", lazy="selectin"
+        back_populates="order_items", lazy="raise"
     )
@@ -15,7 +15,6 @@ from app.core.types import Gender
 
 from app.models.base import Base
 
-
 user_goals = Table(
     "user_goals",
     Base.metadata,
@@ -63,8 +62,8 @@ class UserForm(Base):
     user: Mapped["User"] = relationship(back_populates="user_form")
 
     goals: Mapped[List["Goal"]] = relationship(
-        secondary=user_goals, back_populates="users", lazy="selectin"
+        secondary=user_goals, back_populates="users", lazy="raise"
     )
     allergies: Mapped[List["Allergy"]] = relationship(
-        secondary=user_allergies, back_populates="users", lazy="selectin"
+        secondary=user_allergies, back_populates="users", lazy="raise"
     )
@@ -8,6 +8,10 @@ from .tag import TagRepository
 from .order import OrderRepository
 from .order_item import OrderItemRepository
 from .promo import PromoRepository
+from .refresh_token import RefreshTokenRepository
+from .email_outbox import EmailOutboxRepository
+from .event_outbox import EventOutboxRepository
+from .inventory import InventoryRepository
 
 __all__ = [
     "UserRepository",
@@ -20,4 +24,8 @@ __all__ = [
     "OrderRepository",
     "OrderItemRepository",
     "PromoRepository",
+    "RefreshTokenRepository",
+    "EmailOutboxRepository",
+    "EventOutboxRepository",
+    "InventoryRepository",
 ]
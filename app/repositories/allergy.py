@@ -1,9 +1,9 @@
-from typing import List
+from typing import List, Set
 
 from sqlalchemy import insert, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Allergy, UserForm
+from app.models import Allergy, user_allergies
 from app.repositories.base import BaseRepository
 
 
@@ -11,42 +11,37 @@ class AllergyRepository(BaseRepository[Allergy]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, Allergy)
 
+    async def get_form_allergy_ids(self, user_id: int) -> Set[int]:
+        result = await self.db.execute(
+            select(user_allergies.c.allergy_id).where(
+                user_allergies.c.user_id == user_id
+            )
+        )
+        return set(result.scalars().all())
+
     async def update_form_allergies(
         self, user_id: int, allergy_ids: List[int]
     ) -> None:
-        user_form_allergies = UserForm.__table__.c.allergies.association_table
+        await self.db.execute(
+            delete(user_allergies).where(user_allergies.c.user_id == user_id)
+        )
+
+        if allergy_ids:
+            if not all(isinstance(aid, int) for aid in allergy_ids):
+                raise ValueError("Все allergy_ids должны быть целыми числами")
+
+            existing_allergies = await self.get_by_ids(allergy_ids)
+            if len(existing_allergies) != len(allergy_ids):
+                raise ValueError("Некоторые аллергии не существуют")
 
-        try:
             await self.db.execute(
-                delete(user_form_allergies).where(
-                    user_form_allergies.c.user_id == user_id
-                )
+                insert(user_allergies),
+                [
+                    {"user_id": user_id, "allergy_id": aid}
+                    for aid in allergy_ids
+                ],
             )
 
-            if allergy_ids:
-                if not all(isinstance(aid, int) for aid in allergy_ids):
-                    raise ValueError(
-                        "Все allergy_ids должны быть целыми числами"
-                    )
-
-                existing_allergies = await self.get_by_ids(allergy_ids)
-                if len(existing_allergies) != len(allergy_ids):
-                    raise ValueError("Некоторые аллергии не существуют")
-
-                await self.db.execute(
-                    insert(user_form_allergies),
-                    [
-                        {"user_id": user_id, "allergy_id": aid}
-                        for aid in allergy_ids
-                    ],
-                )
-
-            await self.db.commit()
-
-        except Exception as e:
-            await self.db.rollback()
-            raise e
-
     async def get_by_ids(self, ids: List[int]) -> List[Allergy]:
         if not ids:
             return []
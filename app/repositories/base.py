@@ -1,11 +1,14 @@
-from typing import Type, TypeVar, Generic, List, Optional
+from typing import Type, TypeVar, Generic, List, Optional, Iterable, Dict
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete, true, false
+from sqlalchemy import delete, true, false, inspect
+from sqlalchemy.orm import MANYTOONE
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.exceptions.service_errors import ServiceError
+from app.repositories.loading import LoadingProfile
 
 T = TypeVar("T")
 
@@ -15,8 +18,16 @@ class BaseRepository(Generic[T]):
         self.db = db
         self.model = model
 
-    async def get_by_id(self, id: int) -> Optional[T]:
-        return await self.db.get(self.model, id)
+    async def get_by_id(
+        self, id: int, options: LoadingProfile = ()
+    ) -> Optional[T]:
+        if not options:
+            return await self.db.get(self.model, id)
+
+        result = await self.db.execute(
+            select(self.model).where(self.model.id == id).options(*options)
+        )
+        return result.unique().scalar_one_or_none()
 
     async def get_by_name(self, name: str) -> Optional[T]:
         result = await self.db.execute(
@@ -24,6 +35,18 @@ class BaseRepository(Generic[T]):
         )
         return result.scalars().first()
 
+    async def get_ids_by_names(self, names: Iterable[str]) -> Dict[str, int]:
+        names = set(names)
+        if not names:
+            return {}
+
+        result = await self.db.execute(
+            select(self.model.name, self.model.id).where(
+                self.model.name.in_(names)
+            )
+        )
+        return dict(result.all())
+
     async def get_all(
         self, skip: int = 0, limit: int = 100, **filters
     ) -> List[T]:
@@ -41,16 +64,13 @@ class BaseRepository(Generic[T]):
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
         try:
-            await self.db.commit()
-            await self.db.refresh(db_obj)
+            await self.db.flush()
+            await self._populate_relationships(db_obj)
             return db_obj
         except TypeError as e:
             raise ServiceError(f"Некорректные поля: {str(e)}")
         except IntegrityError as e:
             raise ServiceError(f"Ошибка целостности: {str(e)}")
-        except:
-            await self.db.rollback()
-            raise
 
     async def update(self, db_obj: T, obj_data: dict) -> T:
         if not db_obj:
@@ -59,8 +79,8 @@ class BaseRepository(Generic[T]):
             if not hasattr(db_obj, field):
                 raise ValueError(f"Поле {field} не существует")
             setattr(db_obj, field, value)
-        await self.db.commit()
-        await self.db.refresh(db_obj)
+        await self.db.flush()
+        await self._populate_relationships(db_obj, changed=obj_data.keys())
         return db_obj
 
     async def delete(self, id_el: int) -> None:
@@ -69,7 +89,38 @@ class BaseRepository(Generic[T]):
         )
         if res.rowcount == 0:
             raise ValueError(f"ID={id_el} не найден")
-        await self.db.commit()
+
+    async def _populate_relationships(
+        self, db_obj: T, changed: Iterable[str] | None = None
+    ) -> None:
+        state = inspect(db_obj)
+        mapper = state.mapper
+        for rel in mapper.relationships:
+            if rel.direction is MANYTOONE:
+                fk_keys = [
+                    mapper.get_property_by_column(column).key
+                    for column in rel.local_columns
+                ]
+                if changed is None:
+                    stale = rel.key in state.unloaded
+                else:
+                    stale = rel.key not in changed and any(
+                        key in changed for key in fk_keys
+                    )
+                if not stale or rel.lazy != "raise":
+                    continue
+
+                ids = [getattr(db_obj, key) for key in fk_keys]
+                related = None
+                if None not in ids:
+                    related = await self.db.get(
+                        rel.mapper.class_, ids[0] if len(ids) == 1 else ids
+                    )
+                set_committed_value(db_obj, rel.key, related)
+            elif changed is None and rel.key in state.unloaded:
+                set_committed_value(
+                    db_obj, rel.key, [] if rel.uselist else None
+                )
 
     async def _get_related_objects(
         self, model: Type[T], ids: List[int]
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.templates import RenderedEmail
+from app.core.types import EmailStatus
+from app.models import EmailOutbox
+from app.repositories.base import BaseRepository
+
+
+class EmailOutboxRepository(BaseRepository[EmailOutbox]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, EmailOutbox)
+
+    async def add(
+        self,
+        recipient: str,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+    ) -> None:
+        self.db.add(
+            EmailOutbox(
+                recipient=recipient,
+                subject=subject,
+                body=body,
+                html_body=html_body,
+            )
+        )
+        await self.db.flush()
+
+    async def add_many(
+        self, messages: Sequence[Tuple[str, RenderedEmail]]
+    ) -> None:
+        if not messages:
+            return
+        self.db.add_all(
+            EmailOutbox(
+                recipient=recipient,
+                subject=email.subject,
+                body=email.text,
+                html_body=email.html,
+            )
+            for recipient, email in messages
+        )
+        await self.db.flush()
+
+    async def claim_batch(
+        self, now: datetime, limit: int, lease: timedelta
+    ) -> List[EmailOutbox]:
+        # SKIP LOCKED позволяет нескольким воркерам разбирать очередь без
+        # блокировок друг друга, а аренда через next_attempt_at защищает
+        # от повторной выборки, пока письма отправляются вне транзакции.
+        result = await self.db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == EmailStatus.PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        messages = list(result.scalars())
+        if messages:
+            await self.db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_([m.id for m in messages]))
+                .values(next_attempt_at=now + lease)
+            )
+        return messages
+
+    async def mark_sent(self, ids: Iterable[int], now: datetime) -> None:
+        ids = list(ids)
+        if not ids:
+            return
+        await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids))
+            .values(
+                status=EmailStatus.SENT,
+                sent_at=now,
+                attempts=EmailOutbox.attempts + 1,
+                last_error=None,
+            )
+        )
+
+    async def mark_failed(
+        self,
+        message_id: int,
+        error: str,
+        next_attempt_at: Optional[datetime],
+    ) -> None:
+        # Без next_attempt_at письмо больше не отправляется.
+        values = {
+            "attempts": EmailOutbox.attempts + 1,
+            "last_error": error[:1000],
+        }
+        if next_attempt_at is None:
+            values["status"] = EmailStatus.FAILED
+        else:
+            values["next_attempt_at"] = next_attempt_at
+        await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message_id)
+            .values(**values)
+        )
+
+    async def pending_count(self) -> int:
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(EmailOutbox)
+            .where(EmailOutbox.status == EmailStatus.PENDING)
+        )
+        return result.scalar_one()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import EventOutbox
+from app.repositories.base import BaseRepository
+
+
+class EventOutboxRepository(BaseRepository[EventOutbox]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, EventOutbox)
+
+    async def add(self, name: str, payload: dict) -> None:
+        self.db.add(EventOutbox(name=name, payload=payload))
+        await self.db.flush()
+
+    async def claim_batch(
+        self, now: datetime, limit: int, lease: timedelta
+    ) -> List[EventOutbox]:
+        # Та же схема, что и у очереди писем: SKIP LOCKED и аренда.
+        result = await self.db.execute(
+            select(EventOutbox)
+            .where(
+                EventOutbox.processed_at.is_(None),
+                EventOutbox.next_attempt_at <= now,
+            )
+            .order_by(EventOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        events = list(result.scalars())
+        if events:
+            await self.db.execute(
+                update(EventOutbox)
+                .where(EventOutbox.id.in_([e.id for e in events]))
+                .values(next_attempt_at=now + lease)
+            )
+        return events
+
+    async def mark_processed(self, ids: Iterable[int], now: datetime) -> None:
+        ids = list(ids)
+        if not ids:
+            return
+        await self.db.execute(
+            update(EventOutbox)
+            .where(EventOutbox.id.in_(ids))
+            .values(
+                processed_at=now,
+                attempts=EventOutbox.attempts + 1,
+                last_error=None,
+            )
+        )
+
+    async def mark_failed(
+        self, event_id: int, error: str, next_attempt_at: datetime
+    ) -> None:
+        await self.db.execute(
+            update(EventOutbox)
+            .where(EventOutbox.id == event_id)
+            .values(
+                attempts=EventOutbox.attempts + 1,
+                last_error=error[:1000],
+                next_attempt_at=next_attempt_at,
+            )
+        )
+
+    async def delete_processed(self, before: datetime, batch_size: int) -> int:
+        processed = (
+            select(EventOutbox.id)
+            .where(EventOutbox.processed_at < before)
+            .limit(batch_size)
+        )
+        result = await self.db.execute(
+            delete(EventOutbox).where(EventOutbox.id.in_(processed))
+        )
+        return result.rowcount
@@ -1,8 +1,8 @@
-from sqlalchemy import delete, insert
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Set
 
-from app.models import Goal, UserForm
+from app.models import Goal, user_goals
 from app.repositories.base import BaseRepository
 
 
@@ -10,31 +10,24 @@ class GoalRepository(BaseRepository[Goal]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, Goal)
 
+    async def get_form_goal_ids(self, user_id: int) -> Set[int]:
+        result = await self.db.execute(
+            select(user_goals.c.goal_id).where(user_goals.c.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
     async def update_form_goals(
         self, user_id: int, goal_ids: List[int]
     ) -> None:
+        await self.db.execute(
+            delete(user_goals).where(user_goals.c.user_id == user_id)
+        )
 
-        user_form_goals = UserForm.__table__.c.goals.association_table
-
-        try:
+        if goal_ids:
+            if not all(isinstance(gid, int) for gid in goal_ids):
+                raise ValueError("Все goal_ids должны быть целыми числами")
 
             await self.db.execute(
-                delete(user_form_goals).where(
-                    user_form_goals.c.user_id == user_id
-                )
+                insert(user_goals),
+                [{"user_id": user_id, "goal_id": gid} for gid in goal_ids],
             )
-
-            if goal_ids:
-                if not all(isinstance(gid, int) for gid in goal_ids):
-                    raise ValueError("Все goal_ids должны быть целыми числами")
-
-                await self.db.execute(
-                    insert(user_form_goals),
-                    [{"user_id": user_id, "goal_id": gid} for gid in goal_ids],
-                )
-
-            await self.db.commit()
-
-        except Exception as e:
-            await self.db.rollback()
-            raise e
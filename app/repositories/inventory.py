@@ -0,0 +1,137 @@
+import random
+from typing import Dict, Optional, Set
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.models import Product, ProductStockShard
+from app.repositories.base import BaseRepository
+
+
+class InventoryRepository(BaseRepository[ProductStockShard]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, ProductStockShard)
+
+    async def reserve(self, quantities: Dict[int, int]) -> Set[int]:
+        # Все строки заказа списываются одним UPDATE. Товар попадает в
+        # RETURNING, только если остатка хватает или он не отслеживается;
+        # шардированные товары списываются отдельно (reserve_sharded).
+        if not quantities:
+            return set()
+        quantity = case(quantities, value=Product.id)
+        result = await self.db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(quantities),
+                Product.stock_shards == 0,
+                or_(Product.stock.is_(None), Product.stock >= quantity),
+            )
+            .values(stock=Product.stock - quantity)
+            .returning(Product.id, Product.stock)
+            .execution_options(synchronize_session=False)
+        )
+        reserved = set()
+        for product_id, stock in result.all():
+            reserved.add(product_id)
+            # Загруженные в сессию товары получают новый остаток, иначе
+            # ответ подтверждения показал бы остаток до списания.
+            product = self.db.identity_map.get(
+                identity_key(Product, product_id)
+            )
+            if product is not None:
+                set_committed_value(product, "stock", stock)
+        return reserved
+
+    async def reserve_sharded(
+        self, product_id: int, quantity: int, shards: int
+    ) -> bool:
+        # Параллельные покупатели начинают со случайного шарда и почти
+        # не ждут блокировок друг друга.
+        start = random.randrange(shards)
+        for offset in range(shards):
+            result = await self.db.execute(
+                update(ProductStockShard)
+                .where(
+                    ProductStockShard.product_id == product_id,
+                    ProductStockShard.shard == (start + offset) % shards,
+                    ProductStockShard.stock >= quantity,
+                )
+                .values(stock=ProductStockShard.stock - quantity)
+                .returning(ProductStockShard.shard)
+            )
+            if result.scalar_one_or_none() is not None:
+                return True
+        return await self._reserve_across_shards(product_id, quantity)
+
+    async def _reserve_across_shards(
+        self, product_id: int, quantity: int
+    ) -> bool:
+        # Ни в одном шарде нет нужного количества целиком: остаток
+        # собирается из нескольких шардов под блокировкой всех строк.
+        result = await self.db.execute(
+            select(ProductStockShard.shard, ProductStockShard.stock)
+            .where(ProductStockShard.product_id == product_id)
+            .order_by(ProductStockShard.shard)
+            .with_for_update()
+        )
+        shards = result.all()
+        if sum(stock for _, stock in shards) < quantity:
+            return False
+
+        remaining = quantity
+        for shard, stock in shards:
+            take = min(stock, remaining)
+            if not take:
+                continue
+            await self.db.execute(
+                update(ProductStockShard)
+                .where(
+                    and_(
+                        ProductStockShard.product_id == product_id,
+                        ProductStockShard.shard == shard,
+                    )
+                )
+                .values(stock=ProductStockShard.stock - take)
+            )
+            remaining -= take
+            if not remaining:
+                break
+        return True
+
+    async def get_sharded_stock(self, product_id: int) -> int:
+        result = await self.db.execute(
+            select(func.coalesce(func.sum(ProductStockShard.stock), 0)).where(
+                ProductStockShard.product_id == product_id
+            )
+        )
+        return result.scalar_one()
+
+    async def set_stock(
+        self, product: Product, stock: Optional[int], shards: int = 1
+    ) -> None:
+        await self.db.execute(
+            delete(ProductStockShard).where(
+                ProductStockShard.product_id == product.id
+            )
+        )
+        if stock is None or shards <= 1:
+            product.stock = stock
+            product.stock_shards = 0
+        else:
+            base, extra = divmod(stock, shards)
+            await self.db.execute(
+                insert(ProductStockShard),
+                [
+                    {
+                        "product_id": product.id,
+                        "shard": shard,
+                        "stock": base + (shard < extra),
+                    }
+                    for shard in range(shards)
+                ],
+            )
+            product.stock = None
+            product.stock_shards = shards
+        await self.db.flush()
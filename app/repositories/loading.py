@@ -0,0 +1,25 @@
+from typing import Tuple
+
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.models import Order, OrderItem, Product, UserForm
+
+LoadingProfile = Tuple[LoaderOption, ...]
+
+PRODUCT_CARD: LoadingProfile = (
+    joinedload(Product.category),
+    selectinload(Product.tags),
+)
+
+ORDER_CART: LoadingProfile = (
+    joinedload(Order.promo),
+    selectinload(Order.items)
+    .joinedload(OrderItem.product)
+    .options(*PRODUCT_CARD),
+)
+
+USER_FORM_FULL: LoadingProfile = (
+    selectinload(UserForm.goals),
+    selectinload(UserForm.allergies),
+)
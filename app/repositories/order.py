@@ -1,13 +1,13 @@
 from typing import Optional, List
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.types import OrderStatus
-from app.exceptions.service_errors import EntityNotFound
 from app.models import Order, OrderItem
 from app.repositories.base import BaseRepository
+from app.repositories.loading import ORDER_CART
 
 
 class OrderRepository(BaseRepository[Order]):
@@ -20,9 +20,9 @@ class OrderRepository(BaseRepository[Order]):
             .where(
                 Order.user_id == user_id, Order.status == OrderStatus.PENDING
             )
-            .options(selectinload(Order.items))
+            .options(*ORDER_CART)
         )
-        return result.scalars().first()
+        return result.unique().scalars().first()
 
     async def get_confirmed_orders(self, user_id: int) -> List[Order]:
         result = await self.db.execute(
@@ -30,29 +30,50 @@ class OrderRepository(BaseRepository[Order]):
             .where(
                 Order.user_id == user_id, Order.status != OrderStatus.PENDING
             )
-            .options(selectinload(Order.items))
+            .options(*ORDER_CART)
             .order_by(Order.id.desc())
         )
-        return list(result.scalars().all())
+        return list(result.unique().scalars().all())
 
     async def update_cart(
-        self, order_id: int, items: list[dict], total_amount: float
+        self, order: Order, items: list[dict], total_amount: float
     ) -> Order:
-        order = await self.get_by_id(order_id)
-        if not order:
-            raise EntityNotFound("Заказ не найден")
-
         order.total_amount = total_amount
 
         await self.db.execute(
-            delete(OrderItem).where(OrderItem.order_id == order_id)
+            delete(OrderItem).where(OrderItem.order_id == order.id)
         )
-        await self.db.flush()
 
-        for item_data in items:
-            item = OrderItem(order_id=order_id, **item_data)
-            self.db.add(item)
+        new_items = [
+            OrderItem(order_id=order.id, **item_data) for item_data in items
+        ]
+        self.db.add_all(new_items)
+        await self.db.flush()
 
-        await self.db.commit()
-        await self.db.refresh(order)
+        for item in new_items:
+            await self._populate_relationships(item)
+        set_committed_value(order, "items", new_items)
         return order
+
+    async def claim_status(
+        self, order: Order, expected: OrderStatus, status: OrderStatus
+    ) -> bool:
+        # Условный UPDATE: из параллельных запросов статус сменит только
+        # один, остальные получат False.
+        result = await self.db.execute(
+            update(Order)
+            .where(Order.id == order.id, Order.status == expected)
+            .values(status=status)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            return False
+        set_committed_value(order, "status", status)
+        return True
+
+    async def clear_items(self, order: Order) -> None:
+        await self.db.execute(
+            delete(OrderItem).where(OrderItem.order_id == order.id)
+        )
+        set_committed_value(order, "items", [])
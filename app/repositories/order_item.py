@@ -12,11 +12,10 @@ class OrderItemRepository(BaseRepository[OrderItem]):
     async def add_order_item(self, order_id: int, item_data: dict) -> OrderItem:
         item = OrderItem(order_id=order_id, **item_data)
         self.db.add(item)
-        await self.db.commit()
+        await self.db.flush()
         return item
 
     async def delete_by_order_id(self, order_id: int):
         await self.db.execute(
             delete(OrderItem).where(OrderItem.order_id == order_id)
         )
-        await self.db.commit()
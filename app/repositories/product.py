@@ -1,11 +1,13 @@
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Dict
 
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.types import Gender
-from app.models import Product, Tag
+from app.models import Product, Tag, Category, product_tags
 from app.repositories.base import BaseRepository
+from app.repositories.loading import LoadingProfile, PRODUCT_CARD
 
 
 class ProductRepository(BaseRepository[Product]):
@@ -15,44 +17,59 @@ class ProductRepository(BaseRepository[Product]):
     async def create_product(
         self,
         prod_data: dict,
-        tag_ids: List[int] | None = None,
+        tags: List[Tag] | None = None,
     ) -> Product:
 
-        product = Product(**prod_data)
+        product = Product(**prod_data, tags=tags or [])
         self.db.add(product)
 
-        if tag_ids:
-            tags = await self._get_related_objects(Tag, tag_ids)
-            product.tags.extend(tags)
-
-        try:
-            await self.db.commit()
-            await self.db.refresh(product, ["tags"])
-            return product
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+        await self.db.flush()
+        await self._populate_relationships(product)
+        return product
+
+    async def upsert_products(self, rows: List[dict]) -> Dict[str, int]:
+        # ON CONFLICT обновляет только переданные колонки, поэтому строки
+        # с разным набором полей уходят отдельными запросами.
+        groups: Dict[tuple, List[dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row), []).append(row)
+
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        table = Product.__table__
+        product_ids: Dict[str, int] = {}
+        for columns, group in groups.items():
+            query = insert(table).values(group)
+            query = query.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={
+                    column: query.excluded[column]
+                    for column in columns
+                    if column != "name"
+                },
+            ).returning(table.c.name, table.c.id)
+
+            result = await self.db.execute(query)
+            product_ids.update(result.all())
+        return product_ids
 
     async def deactivate_product(self, product: Product) -> None:
-        try:
-            product.is_active = False
-            await self.db.commit()
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+        product.is_active = False
+        await self.db.flush()
 
     async def activate_product(self, product: Product) -> None:
-        try:
-            product.is_active = True
-            await self.db.commit()
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+        product.is_active = True
+        await self.db.flush()
 
     async def get_all_products(
-        self, skip: int = 0, limit: int = 100, **filters
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        options: LoadingProfile = PRODUCT_CARD,
+        **filters,
     ) -> List[Product]:
-        query = select(self.model).offset(skip).limit(limit)
+        query = select(self.model).options(*options).offset(skip).limit(limit)
 
         if "name" in filters and filters["name"]:
             query = query.where(self.model.name.ilike(f"%{filters['name']}%"))
@@ -74,4 +91,51 @@ class ProductRepository(BaseRepository[Product]):
             query = query.where(self.model.is_active == filters["is_active"])
 
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return list(result.unique().scalars().all())
+
+    async def stream_catalog(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        query = (
+            select(
+                Product.id,
+                Product.name,
+                Product.price,
+                Product.description,
+                Product.image_url,
+                Product.min_age,
+                Product.gender,
+                Product.is_active,
+                Category.name.label("category"),
+                Tag.name.label("tag"),
+            )
+            .join(Category, Category.id == Product.category_id)
+            .outerjoin(product_tags, product_tags.c.product_id == Product.id)
+            .outerjoin(Tag, Tag.id == product_tags.c.tag_id)
+            .order_by(Product.id, Tag.name)
+            .execution_options(yield_per=batch_size)
+        )
+
+        current = None
+        result = await self.db.stream(query)
+        async for row in result:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    yield current
+                current = {
+                    "id": row.id,
+                    "name": row.name,
+                    "price": float(row.price),
+                    "description": row.description,
+                    "image_url": row.image_url,
+                    "min_age": row.min_age,
+                    "gender": row.gender.value,
+                    "is_active": row.is_active,
+                    "category": row.category,
+                    "tags": [],
+                }
+            if row.tag is not None:
+                current["tags"].append(row.tag)
+
+        if current is not None:
+            yield current
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, false, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RefreshToken
+from app.repositories.base import BaseRepository
+
+
+class RefreshTokenRepository(BaseRepository[RefreshToken]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, RefreshToken)
+
+    async def add(
+        self, jti: str, family: str, user_id: int, expires_at: datetime
+    ) -> None:
+        self.db.add(
+            RefreshToken(
+                jti=jti, family=family, user_id=user_id, expires_at=expires_at
+            )
+        )
+        await self.db.flush()
+
+    async def mark_used(
+        self, jti: str, family: str, now: datetime
+    ) -> Optional[int]:
+        # Один UPDATE по первичному ключу: токен либо атомарно
+        # помечается использованным, либо не подходит.
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.family == family,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked == false(),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+            .returning(RefreshToken.user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_jti(self, jti: str) -> Optional[RefreshToken]:
+        return await self.db.get(RefreshToken, jti)
+
+    async def revoke_family(self, family: str) -> None:
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family == family)
+            .values(revoked=True)
+        )
+
+    async def delete_expired(self, now: datetime, batch_size: int) -> int:
+        expired = (
+            select(RefreshToken.jti)
+            .where(RefreshToken.expires_at <= now)
+            .limit(batch_size)
+        )
+        result = await self.db.execute(
+            delete(RefreshToken).where(RefreshToken.jti.in_(expired))
+        )
+        return result.rowcount
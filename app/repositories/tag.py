@@ -1,9 +1,9 @@
-from typing import List
+from typing import List, Dict
 
 from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Tag, Product
+from app.models import Tag, Product, product_tags
 from app.repositories.base import BaseRepository
 
 
@@ -17,35 +17,42 @@ class TagRepository(BaseRepository[Tag]):
 
         product_tags = Product.__table__.c.tags.association_table
 
-        try:
+        await self.db.execute(
+            delete(product_tags).where(product_tags.c.product_id == product_id)
+        )
 
-            await self.db.execute(
-                delete(product_tags).where(
-                    product_tags.c.product_id == product_id
-                )
-            )
+        if tag_ids:
+            if not all(isinstance(tid, int) for tid in tag_ids):
+                raise ValueError("Все tag_ids должны быть целыми числами")
 
-            if tag_ids:
-                if not all(isinstance(tid, int) for tid in tag_ids):
-                    raise ValueError("Все tag_ids должны быть целыми числами")
+            existing_tags = await self.get_by_ids(tag_ids)
+            if len(existing_tags) != len(tag_ids):
+                raise ValueError("Некоторые теги не существуют")
 
-                existing_tags = await self.get_by_ids(tag_ids)
-                if len(existing_tags) != len(tag_ids):
-                    raise ValueError("Некоторые теги не существуют")
-
-                await self.db.execute(
-                    insert(product_tags),
-                    [
-                        {"product_id": product_id, "tag_id": tid}
-                        for tid in tag_ids
-                    ],
-                )
+            await self.db.execute(
+                insert(product_tags),
+                [{"product_id": product_id, "tag_id": tid} for tid in tag_ids],
+            )
 
-            await self.db.commit()
+    async def replace_tags_for_products(
+        self, product_tag_ids: Dict[int, List[int]]
+    ) -> None:
+        if not product_tag_ids:
+            return
 
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+        await self.db.execute(
+            delete(product_tags).where(
+                product_tags.c.product_id.in_(product_tag_ids)
+            )
+        )
+
+        rows = [
+            {"product_id": product_id, "tag_id": tag_id}
+            for product_id, tag_ids in product_tag_ids.items()
+            for tag_id in set(tag_ids)
+        ]
+        if rows:
+            await self.db.execute(insert(product_tags).values(rows))
 
     async def get_by_ids(self, tag_ids: List[int]) -> List[Tag]:
 
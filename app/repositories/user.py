@@ -1,4 +1,4 @@
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -16,3 +16,15 @@ class UserRepository(BaseRepository[User]):
             return res.scalar_one_or_none()
         except SQLAlchemyError as e:
             raise RuntimeError(f"Ошибка при получении пользователя: {e}")
+
+    async def update_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        # Условие на старый хеш не даёт затереть пароль, сменённый
+        # между входом и фоновым обновлением.
+        res = await self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        return res.rowcount == 1
@@ -6,16 +6,21 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.models import UserForm, Goal, Allergy
 from app.repositories.base import BaseRepository, T
+from app.repositories.loading import LoadingProfile
 
 
 class UserFormRepository(BaseRepository[UserForm]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, UserForm)
 
-    async def get_user_form(self, user_id: int) -> UserForm:
+    async def get_user_form(
+        self, user_id: int, options: LoadingProfile = ()
+    ) -> UserForm:
         try:
             res = await self.db.execute(
-                select(UserForm).where(UserForm.user_id == user_id)
+                select(UserForm)
+                .where(UserForm.user_id == user_id)
+                .options(*options)
             )
             return res.scalar_one_or_none()
         except SQLAlchemyError as e:
@@ -39,20 +44,11 @@ class UserFormRepository(BaseRepository[UserForm]):
             allergies = await self._get_related_objects(Allergy, allergy_ids)
             user_form.allergies.extend(allergies)
 
-        try:
-            await self.db.commit()
-            await self.db.refresh(user_form, ["goals", "allergies"])
-            return user_form
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+        await self.db.flush()
+        await self._populate_relationships(user_form)
+        return user_form
 
     async def delete_user_form(self, user_id: int) -> None:
-        query = await self.db.execute(
+        await self.db.execute(
             delete(UserForm).where(UserForm.user_id == user_id)
         )
-        try:
-            await self.db.commit()
-        except Exception as e:
-            await self.db.rollback()
-            raise e
@@ -16,6 +16,11 @@ from .product_category import (
     CategoryCreate,
     TagOut,
     TagCreate,
+    ProductImportRow,
+    ProductImportError,
+    ProductImportReport,
+    StockUpdate,
+    StockOut,
 )
 from .order import (
     OrderCreate,
@@ -28,7 +33,7 @@ from .order import (
     PromoBase,
     PromoUpdate,
 )
-
+from .system import PoolStatsOut, RequestProfileOut
 
 __all__ = [
     "Token",
@@ -51,6 +56,11 @@ __all__ = [
     "CategoryCreate",
     "TagOut",
     "TagCreate",
+    "ProductImportRow",
+    "ProductImportError",
+    "ProductImportReport",
+    "StockUpdate",
+    "StockOut",
     "OrderCreate",
     "OrderOut",
     "OrderStatus",
@@ -60,4 +70,6 @@ __all__ = [
     "PromoOut",
     "PromoBase",
     "PromoUpdate",
+    "PoolStatsOut",
+    "RequestProfileOut",
 ]
@@ -64,3 +64,31 @@ class ProductUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=1000)
     category_id: Optional[int] = None
     tag_ids: Optional[List[int]] = None
+
+
+class StockUpdate(BaseModel):
+    # stock=None отключает учёт остатка.
+    stock: Optional[int] = Field(None, ge=0)
+    shards: int = Field(default=1, ge=1, le=64)
+
+
+class StockOut(BaseModel):
+    product_id: int
+    stock: Optional[int]
+    shards: int
+
+
+class ProductImportRow(ProductBase):
+    category: str = Field(max_length=255)
+    tags: List[str] = []
+
+
+class ProductImportError(BaseModel):
+    row: int
+    error: str
+
+
+class ProductImportReport(BaseModel):
+    total: int = 0
+    imported: int = 0
+    errors: List[ProductImportError] = []
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PoolStatsOut(BaseModel):
+    pool: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    wait_seconds_total: Optional[float] = None
+    wait_seconds_max: Optional[float] = None
+
+
+class RequestProfileOut(BaseModel):
+    id: int
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
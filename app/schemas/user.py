@@ -14,6 +14,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     sub: Optional[str]
+    jti: Optional[str] = None
+    fam: Optional[str] = None
 
 
 class UserBase(BaseModel):
@@ -1,9 +1,21 @@
+from .tag_resolver import TagResolver
 from .user import UserService
 from .user_form import UserFormService
 from .product import ProductService
 from .order import OrderService
 from .recommendation import RecommendationService
 from .notification import NotificationService
+from .email_outbox import EmailOutboxWorker, build_email_worker
+from .event_outbox import EventPublisher, EventOutboxDispatcher
+from .inventory import InventoryService
+from .catalog_export import CatalogExportService
+from .product_import import ProductImportService
+from .password_rehash import PasswordRehashService
+from .refresh_token import (
+    RefreshTokenStore,
+    InMemoryRefreshTokenStore,
+    DatabaseRefreshTokenStore,
+)
 
 __all__ = [
     "UserService",
@@ -12,4 +24,16 @@ __all__ = [
     "OrderService",
     "RecommendationService",
     "NotificationService",
+    "EmailOutboxWorker",
+    "build_email_worker",
+    "EventPublisher",
+    "EventOutboxDispatcher",
+    "InventoryService",
+    "CatalogExportService",
+    "ProductImportService",
+    "TagResolver",
+    "PasswordRehashService",
+    "RefreshTokenStore",
+    "InMemoryRefreshTokenStore",
+    "DatabaseRefreshTokenStore",
 ]
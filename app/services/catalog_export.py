@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.types import CatalogFormat
+from app.repositories import ProductRepository
+
+CSV_COLUMNS = (
+    "id",
+    "name",
+    "price",
+    "description",
+    "image_url",
+    "min_age",
+    "gender",
+    "is_active",
+    "category",
+    "tags",
+)
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CatalogExportService:
+    session_factory: async_sessionmaker[AsyncSession]
+    batch_size: int = 1000
+    chunk_size: int = 64 * 1024
+
+    async def export(
+        self, export_format: CatalogFormat
+    ) -> AsyncIterator[bytes]:
+        if export_format == CatalogFormat.CSV:
+            header, encode = self._csv_encoder()
+        else:
+            header, encode = b"", self._ndjson_line
+
+        buffer = bytearray(header)
+        async for row in self._rows():
+            buffer += encode(row)
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+
+    async def _rows(self) -> AsyncIterator[dict]:
+        async with self.session_factory() as session:
+            repository = ProductRepository(session)
+            async for row in repository.stream_catalog(self.batch_size):
+                yield row
+
+    @staticmethod
+    def _ndjson_line(row: dict) -> bytes:
+        return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _csv_encoder():
+        stream = io.StringIO()
+        writer = csv.writer(stream)
+
+        def encode(row: dict) -> bytes:
+            writer.writerow(
+                [
+                    "|".join(row[column]) if column == "tags" else row[column]
+                    for column in CSV_COLUMNS
+                ]
+            )
+            data = stream.getvalue().encode("utf-8")
+            stream.seek(0)
+            stream.truncate()
+            return data
+
+        writer.writerow(CSV_COLUMNS)
+        header = stream.getvalue().encode("utf-8")
+        stream.seek(0)
+        stream.truncate()
+        return header, encode
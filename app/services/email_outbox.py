@@ -0,0 +1,238 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+from aiosmtplib import SMTP, SMTPResponseException, SMTPServerDisconnected
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.metrics import registry
+from app.core.settings import settings
+from app.database.unit_of_work import UnitOfWork
+from app.models import EmailOutbox
+from app.repositories import EmailOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE_DEPTH = registry.gauge(
+    "email_queue_depth", "Письма, ожидающие отправки"
+).labels()
+EMAILS_SENT = registry.counter(
+    "emails_sent_total", "Результаты отправки писем", ("result",)
+)
+SMTP_CONNECTIONS = registry.counter(
+    "smtp_connections_total", "Открытые SMTP-соединения"
+).labels()
+
+
+class SMTPConnectionPool:
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        size: int = 4,
+        start_tls: bool = False,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 30.0,
+        factory: Callable[..., SMTP] = SMTP,
+    ):
+        self.size = size
+        self._connect_kwargs = dict(
+            hostname=hostname,
+            port=port,
+            start_tls=start_tls,
+            username=username,
+            password=password,
+            timeout=timeout,
+        )
+        self._factory = factory
+        self._idle: asyncio.LifoQueue[SMTP] = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SMTP]:
+        async with self._slots:
+            smtp = self._idle.get_nowait() if not self._idle.empty() else None
+            if smtp is None or not smtp.is_connected:
+                smtp = self._factory(**self._connect_kwargs)
+                await smtp.connect()
+                SMTP_CONNECTIONS.inc()
+            try:
+                yield smtp
+            except SMTPResponseException:
+                # Сервер отклонил письмо, но соединение осталось рабочим.
+                self._idle.put_nowait(smtp)
+                raise
+            except BaseException:
+                await self._discard(smtp)
+                raise
+            else:
+                self._idle.put_nowait(smtp)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            smtp = self._idle.get_nowait()
+            try:
+                await smtp.quit()
+            except Exception:
+                await self._discard(smtp)
+
+    @staticmethod
+    async def _discard(smtp: SMTP) -> None:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+
+class EmailOutboxWorker:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        pool: SMTPConnectionPool,
+        sender: str,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_attempts: int = 8,
+        retry_base: float = 5.0,
+        retry_max: float = 3600.0,
+        lease: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool
+        self.sender = sender
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = timedelta(seconds=lease)
+
+    def retry_delay(self, attempts: int) -> Optional[timedelta]:
+        # attempts — число неудачных попыток с учётом текущей.
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return timedelta(seconds=delay)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    sent = await self.run_once()
+                except Exception:
+                    logger.exception("Ошибка при разборе очереди писем")
+                    sent = 0
+                # Полный пакет означает, что в очереди, скорее всего,
+                # остались письма, поэтому пауза пропускается.
+                if sent < self.batch_size:
+                    try:
+                        await asyncio.wait_for(stop.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.pool.close()
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                batch = await EmailOutboxRepository(session).claim_batch(
+                    datetime.utcnow(), self.batch_size, self.lease
+                )
+
+        results = await asyncio.gather(
+            *(self._deliver(message) for message in batch)
+        )
+
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                repository = EmailOutboxRepository(session)
+                now = datetime.utcnow()
+                await repository.mark_sent(
+                    (m.id for m, error in zip(batch, results) if error is None),
+                    now,
+                )
+                for message, error in zip(batch, results):
+                    if error is None:
+                        continue
+                    permanent, reason = error
+                    await repository.mark_failed(
+                        message.id,
+                        reason,
+                        None if permanent else self._next_attempt(message, now),
+                    )
+                EMAIL_QUEUE_DEPTH.set(await repository.pending_count())
+
+        return len(batch)
+
+    def _next_attempt(
+        self, message: EmailOutbox, now: datetime
+    ) -> Optional[datetime]:
+        delay = self.retry_delay(message.attempts + 1)
+        return now + delay if delay is not None else None
+
+    async def _deliver(
+        self, message: EmailOutbox
+    ) -> Optional[Tuple[bool, str]]:
+        try:
+            await self._send(self._build(message))
+        except Exception as e:
+            # Ответы 5xx постоянные: повтор не поможет.
+            permanent = isinstance(e, SMTPResponseException) and e.code >= 500
+            EMAILS_SENT.labels("error").inc()
+            logger.warning(
+                "Не удалось отправить письмо %s на %s: %s",
+                message.id,
+                message.recipient,
+                e,
+            )
+            return permanent, str(e) or type(e).__name__
+        EMAILS_SENT.labels("ok").inc()
+        return None
+
+    async def _send(self, email: EmailMessage) -> None:
+        try:
+            async with self.pool.connection() as smtp:
+                await smtp.send_message(email)
+        except SMTPServerDisconnected:
+            # Сервер мог закрыть простаивавшее соединение: одна повторная
+            # попытка на новом.
+            async with self.pool.connection() as smtp:
+                await smtp.send_message(email)
+
+    def _build(self, message: EmailOutbox) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = message.recipient
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+        if message.html_body:
+            email.add_alternative(message.html_body, subtype="html")
+        return email
+
+
+def build_email_worker(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> EmailOutboxWorker:
+    return EmailOutboxWorker(
+        session_factory=session_factory,
+        pool=SMTPConnectionPool(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            size=settings.SMTP_POOL_SIZE,
+            start_tls=settings.SMTP_START_TLS,
+            username=settings.SMTP_USERNAME,
+            password=settings.SMTP_PASSWORD,
+        ),
+        sender=settings.EMAIL_FROM,
+        batch_size=settings.EMAIL_BATCH_SIZE,
+        poll_interval=settings.EMAIL_POLL_INTERVAL_SECONDS,
+        max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+        retry_base=settings.EMAIL_RETRY_BASE_SECONDS,
+        retry_max=settings.EMAIL_RETRY_MAX_SECONDS,
+        lease=settings.EMAIL_LEASE_SECONDS,
+    )
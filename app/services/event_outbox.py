@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.events import EVENTS_PUBLISHED, Event, EventBus
+from app.database.unit_of_work import UnitOfWork
+from app.models import EventOutbox
+from app.repositories import EventOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class EventPublisher:
+    # Публикует события только после коммита транзакции запроса.
+    # С durable=True событие пишется в event_outbox в той же транзакции
+    # и доставляется диспетчером не менее одного раза.
+    def __init__(self, bus: EventBus, uow: UnitOfWork, durable: bool = False):
+        self.bus = bus
+        self.uow = uow
+        self.durable = durable
+
+    async def publish(self, event: Event) -> None:
+        if self.durable:
+            await EventOutboxRepository(self.uow.session).add(
+                event.name, event.to_payload()
+            )
+            EVENTS_PUBLISHED.labels(event.name).inc()
+            self.uow.after_commit(self.bus.wake)
+        else:
+            self.uow.after_commit(lambda: self.bus.publish(event))
+
+
+class EventOutboxDispatcher:
+    def __init__(
+        self,
+        bus: EventBus,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        retry_base: float = 1.0,
+        retry_max: float = 600.0,
+        lease: float = 300.0,
+        retention: float = 86_400.0,
+    ):
+        self.bus = bus
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = timedelta(seconds=lease)
+        self.retention = timedelta(seconds=retention)
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return timedelta(seconds=delay)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                processed = await self.run_once()
+                if not processed:
+                    await self.cleanup()
+            except Exception:
+                logger.exception("Ошибка при разборе outbox событий")
+                processed = 0
+            if processed < self.batch_size:
+                await self.bus.wait_for_wakeup(self.poll_interval)
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                batch = await EventOutboxRepository(session).claim_batch(
+                    datetime.utcnow(), self.batch_size, self.lease
+                )
+
+        # События одного пакета доставляются по порядку, а результаты
+        # записываются одной транзакцией, как в EmailOutboxWorker.
+        errors = [await self._dispatch(record) for record in batch]
+
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                repository = EventOutboxRepository(session)
+                now = datetime.utcnow()
+                await repository.mark_processed(
+                    (r.id for r, error in zip(batch, errors) if error is None),
+                    now,
+                )
+                for record, error in zip(batch, errors):
+                    if error is not None:
+                        await repository.mark_failed(
+                            record.id,
+                            error,
+                            now + self.retry_delay(record.attempts + 1),
+                        )
+
+        return len(batch)
+
+    async def _dispatch(self, record: EventOutbox) -> Optional[str]:
+        try:
+            event = Event.types[record.name].from_payload(dict(record.payload))
+            await self.bus.dispatch(event)
+        except Exception as e:
+            return str(e) or type(e).__name__
+        return None
+
+    async def cleanup(self) -> int:
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                return await EventOutboxRepository(session).delete_processed(
+                    datetime.utcnow() - self.retention, self.batch_size
+                )
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+from app.exceptions.service_errors import EntityNotFound, OutOfStockError
+from app.models import OrderItem
+from app.repositories import InventoryRepository, ProductRepository
+from app.schemas import StockOut, StockUpdate
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class InventoryService:
+    inventory_repository: InventoryRepository
+    product_repository: ProductRepository
+
+    async def reserve(self, items: Iterable[OrderItem]) -> None:
+        # Списание идёт в транзакции подтверждения заказа: при нехватке
+        # хотя бы одного товара откатывается всё.
+        quantities: Dict[int, int] = {}
+        sharded: Dict[int, int] = {}
+        shards: Dict[int, int] = {}
+        for item in items:
+            target = quantities
+            if item.product.stock_shards:
+                shards[item.product_id] = item.product.stock_shards
+                target = sharded
+            target[item.product_id] = (
+                target.get(item.product_id, 0) + item.quantity
+            )
+
+        reserved = await self.inventory_repository.reserve(quantities)
+        missing = set(quantities) - reserved
+        for product_id, quantity in sharded.items():
+            if not await self.inventory_repository.reserve_sharded(
+                product_id, quantity, shards[product_id]
+            ):
+                missing.add(product_id)
+
+        if missing:
+            raise OutOfStockError(missing)
+
+    async def get_stock(self, product_id: int) -> StockOut:
+        product = await self.product_repository.get_by_id(product_id)
+        if not product:
+            raise EntityNotFound(f"Продукта с ID={product_id} не существует")
+
+        if product.stock_shards:
+            stock = await self.inventory_repository.get_sharded_stock(
+                product_id
+            )
+            return StockOut(
+                product_id=product_id,
+                stock=stock,
+                shards=product.stock_shards,
+            )
+        return StockOut(
+            product_id=product_id,
+            stock=product.stock,
+            shards=1 if product.stock is not None else 0,
+        )
+
+    async def set_stock(self, product_id: int, data: StockUpdate) -> StockOut:
+        product = await self.product_repository.get_by_id(product_id)
+        if not product:
+            raise EntityNotFound(f"Продукта с ID={product_id} не существует")
+
+        await self.inventory_repository.set_stock(
+            product, data.stock, data.shards
+        )
+        return await self.get_stock(product_id)
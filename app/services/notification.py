@@ -1,35 +1,63 @@
 from dataclasses import dataclass
-from email.message import EmailMessage
-
-from aiosmtplib import send
+from typing import Dict, Iterable, Tuple
 
+from app.core.templates import EMPTY, EmailTemplates, Fragment
+from app.repositories import EmailOutboxRepository
 from app.schemas import OrderOut, UserOut
 
 
+# Письма записываются в outbox в той же транзакции, что и бизнес-операция,
+# и отправляются отдельным воркером (app/services/email_outbox.py).
 @dataclass(kw_only=True, frozen=True, slots=True)
 class NotificationService:
+    outbox_repository: EmailOutboxRepository
+    templates: EmailTemplates
 
     async def send_reg_email(self, user_email: str, user: UserOut):
-        subject = "Вы успешно зарегистрировались"
-        body = f"Спасибо за регистрацию - {user.name}!"
-        await self._send_email(recipient=user_email, subject=subject, body=body)
+        email = self.templates.render("registration", {"name": user.name})
+        await self.outbox_repository.add_many([(user_email, email)])
 
     async def send_order_email(self, user_email: str, order: OrderOut):
-        subject = "Подтверждение заказа"
-        body = f"Спасибо за ваш заказ №{order.id}!\n\nДетали заказа: {order}"
-        await self._send_email(recipient=user_email, subject=subject, body=body)
-
-    @staticmethod
-    async def _send_email(recipient: str, subject: str, body: str):
-        admin_email = "xuy@mail.ru"
-
-        message = EmailMessage()
-        message["From"] = admin_email
-        message["To"] = recipient
-        message["Subject"] = subject
-        message.set_content(body)
-
-        try:
-            await send(message, hostname="mail_dev", port=1025, start_tls=False)
-        except Exception as e:
-            print(f"Ошибка при отправке письма: {e}")
+        await self.send_order_emails([(user_email, order)])
+
+    async def send_order_emails(self, orders: Iterable[Tuple[str, OrderOut]]):
+        orders = list(orders)
+        emails = self.templates.render_batch(
+            "order_confirmed", (self.order_context(o) for _, o in orders)
+        )
+        await self.outbox_repository.add_many(
+            list(zip((recipient for recipient, _ in orders), emails))
+        )
+
+    def order_context(self, order: OrderOut) -> Dict[str, object]:
+        # В письмо попадает короткая сводка, а не весь граф заказа.
+        item_template = self.templates["order_item"]
+        items = Fragment.join(
+            item_template.render_fragment(
+                {
+                    "name": item.product.name,
+                    "quantity": item.quantity,
+                    "price": _money(item.product.price),
+                    "amount": _money(item.product.price * item.quantity),
+                }
+            )
+            for item in order.items
+        )
+        promo = EMPTY
+        if order.promo:
+            promo = self.templates["order_promo"].render_fragment(
+                {
+                    "code": order.promo.code,
+                    "discount": order.promo.discount_percent,
+                }
+            )
+        return {
+            "order_id": order.id,
+            "items": items,
+            "promo": promo,
+            "total": _money(order.total_amount),
+        }
+
+
+def _money(value: float) -> str:
+    return f"{value:.2f}"
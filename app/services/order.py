@@ -2,7 +2,9 @@ from dataclasses import dataclass
 from decimal import Decimal
 from typing import Optional, List
 
+from app.core.events import CartUpdated, OrderConfirmed
 from app.exceptions.service_errors import (
+    OutOfStockError,
     EntityNotFound,
     ServiceError,
     OrderAtWorkError,
@@ -15,6 +17,10 @@ from app.repositories import (
     OrderItemRepository,
     PromoRepository,
 )
+from app.models import Order
+from app.services.event_outbox import EventPublisher
+from app.services.inventory import InventoryService
+from app.repositories.loading import PRODUCT_CARD
 from app.schemas import (
     OrderOut,
     OrderStatus,
@@ -30,8 +36,20 @@ class OrderService:
     order_item_repository: OrderItemRepository
     promo_repository: PromoRepository
     product_repository: ProductRepository
+    events: Optional[EventPublisher] = None
+    inventory: Optional[InventoryService] = None
+
+    async def _publish_cart_updated(self, order: Order) -> None:
+        if self.events:
+            await self.events.publish(
+                CartUpdated(order_id=order.id, user_id=order.user_id)
+            )
 
     async def get_active_cart(self, user_id: int) -> OrderOut:
+        order = await self._get_or_create_cart(user_id)
+        return OrderOut.model_validate(order)
+
+    async def _get_or_create_cart(self, user_id: int) -> Order:
         order = await self.order_repository.get_pending_order(user_id)
         if not order:
             order_data = {
@@ -40,7 +58,7 @@ class OrderService:
                 "total_amount": 0,
             }
             order = await self.order_repository.create(order_data)
-        return OrderOut.model_validate(order)
+        return order
 
     async def get_confirmed_cart(self, user_id: int) -> List[OrderOut]:
         list_orders = await self.order_repository.get_confirmed_orders(user_id)
@@ -51,14 +69,16 @@ class OrderService:
     async def add_item_to_cart(
         self, user_id: int, item_data: OrderItemCreate
     ) -> OrderOut:
-        order = await self.get_active_cart(user_id)
+        order = await self._get_or_create_cart(user_id)
 
         if order.status != OrderStatus.PENDING:
             raise OrderAtWorkError(
                 f"Заказ {order.id} имеет статус {order.status}"
             )
 
-        product = await self.product_repository.get_by_id(item_data.product_id)
+        product = await self.product_repository.get_by_id(
+            item_data.product_id, options=PRODUCT_CARD
+        )
         if not product:
             raise EntityNotFound("Продукт не найден")
 
@@ -92,6 +112,16 @@ class OrderService:
                 }
             )
 
+        # Предварительная проверка без блокировок; окончательно остаток
+        # списывается при подтверждении заказа.
+        in_cart = next(
+            item["quantity"]
+            for item in updated_items
+            if item["product_id"] == item_data.product_id
+        )
+        if product.stock is not None and in_cart > product.stock:
+            raise OutOfStockError([product.id])
+
         total_amount = 0
         for item in updated_items:
             prod = await self.product_repository.get_by_id(item["product_id"])
@@ -102,15 +132,16 @@ class OrderService:
             total_amount += item["quantity"] * prod.price
 
         updated_order = await self.order_repository.update_cart(
-            order_id=order.id, items=updated_items, total_amount=total_amount
+            order=order, items=updated_items, total_amount=total_amount
         )
+        await self._publish_cart_updated(updated_order)
 
         return OrderOut.model_validate(updated_order)
 
     async def remove_item_from_cart(
         self, user_id: int, product_id: int
     ) -> OrderOut:
-        order = await self.get_active_cart(user_id)
+        order = await self._get_or_create_cart(user_id)
 
         if order.status != OrderStatus.PENDING:
             raise OrderAtWorkError(
@@ -148,8 +179,9 @@ class OrderService:
             total_amount += item["quantity"] * prod.price
 
         updated_order = await self.order_repository.update_cart(
-            order_id=order.id, items=updated_items, total_amount=total_amount
+            order=order, items=updated_items, total_amount=total_amount
         )
+        await self._publish_cart_updated(updated_order)
 
         return OrderOut.model_validate(updated_order)
 
@@ -183,6 +215,7 @@ class OrderService:
 
         updated_order = await self.order_repository.update(order, update_data)
         await self.promo_repository.update(promo, {"is_available": False})
+        await self._publish_cart_updated(updated_order)
 
         return OrderOut.model_validate(updated_order)
 
@@ -197,10 +230,30 @@ class OrderService:
                 f"Вы не можете подтвердить заказ. Заказ {order.id} имеет статус {order.status}"
             )
 
-        updated_order = await self.order_repository.update(
-            order, {"status": OrderStatus.CONFIRMED}
-        )
-        return OrderOut.model_validate(updated_order)
+        # Заказ захватывается до списания остатков, чтобы повторное
+        # подтверждение той же корзины не списало товар дважды.
+        if not await self.order_repository.claim_status(
+            order, OrderStatus.PENDING, OrderStatus.CONFIRMED
+        ):
+            raise OrderAtWorkError(
+                f"Вы не можете подтвердить заказ. Заказ {order.id} уже подтверждён"
+            )
+
+        if self.inventory:
+            await self.inventory.reserve(order.items)
+
+        if self.events:
+            await self.events.publish(
+                OrderConfirmed(
+                    order_id=order.id,
+                    user_id=order.user_id,
+                    total_amount=float(order.total_amount),
+                    items=tuple(
+                        (item.product_id, item.quantity) for item in order.items
+                    ),
+                )
+            )
+        return OrderOut.model_validate(order)
 
     async def clear_cart(self, user_id: int) -> OrderOut:
 
@@ -214,12 +267,12 @@ class OrderService:
                     f"Заказ {order.id} имеет статус {order.status}"
                 )
 
-            await self.order_item_repository.delete_by_order_id(order.id)
+            await self.order_repository.clear_items(order)
 
             updated_order = await self.order_repository.update(
                 order, {"total_amount": 0, "promo_id": None}
             )
-            await self.order_repository.db.refresh(updated_order)
+            await self._publish_cart_updated(updated_order)
 
             return OrderOut.model_validate(updated_order)
 
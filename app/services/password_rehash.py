@@ -0,0 +1,41 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Set
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.unit_of_work import UnitOfWork
+from app.repositories import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class PasswordRehashService:
+    session_factory: async_sessionmaker[AsyncSession]
+    _tasks: Set[asyncio.Task] = field(default_factory=set, repr=False)
+
+    def schedule(self, user_id: int, old_hash: str, new_hash: str) -> None:
+        task = asyncio.create_task(self._persist(user_id, old_hash, new_hash))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _persist(self, user_id: int, old_hash: str, new_hash: str):
+        try:
+            async with self.session_factory() as session:
+                async with UnitOfWork(session):
+                    updated = await UserRepository(
+                        session
+                    ).update_password_hash(user_id, old_hash, new_hash)
+        except Exception:
+            logger.exception(
+                "Не удалось обновить хеш пароля пользователя %s", user_id
+            )
+            return
+        if updated:
+            logger.info("Хеш пароля пользователя %s обновлён", user_id)
@@ -1,8 +1,10 @@
-import asyncio
 from dataclasses import dataclass
 from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 
+from app.core.cache import ProductCache
+from app.core.events import ProductChanged
+from app.database.unit_of_work import UnitOfWork
 from app.exceptions.service_errors import (
     UserNotFoundError,
     EntityAlreadyExistsError,
@@ -16,6 +18,9 @@ from app.repositories import (
     CategoryRepository,
     TagRepository,
 )
+from app.repositories.loading import PRODUCT_CARD
+from app.services.event_outbox import EventPublisher
+from app.services.tag_resolver import TagResolver
 
 from app.schemas import (
     ProductOut,
@@ -33,6 +38,10 @@ class ProductService:
     product_repository: ProductRepository
     category_repository: CategoryRepository
     tag_repository: TagRepository
+    tag_resolver: TagResolver
+    cache: ProductCache
+    uow: UnitOfWork
+    events: Optional[EventPublisher] = None
 
     async def create_category(
         self, category_data: CategoryCreate
@@ -65,17 +74,36 @@ class ProductService:
         return [TagOut.model_validate(tag) for tag in list_tags]
 
     async def get_product_by_id(self, product_id: int) -> ProductOut:
-        product = await self.product_repository.get_by_id(product_id)
+        product = await self.product_repository.get_by_id(
+            product_id, options=PRODUCT_CARD
+        )
 
         if not product:
             raise EntityNotFound(f"Продукта с ID={product_id} не существует")
 
         return ProductOut.model_validate(product)
 
+    async def get_product_json(self, product_id: int) -> bytes:
+        version = self.cache.version
+        payload = self.cache.get(product_id)
+        if payload is not None:
+            return payload
+
+        product = await self.product_repository.get_by_id(
+            product_id, options=PRODUCT_CARD
+        )
+
+        if not product:
+            raise EntityNotFound(f"Продукта с ID={product_id} не существует")
+
+        return self.cache.store(product, version)
+
     async def update_product_by_id(
         self, product_id: int, product_data: ProductUpdate
     ) -> ProductOut:
-        product = await self.product_repository.get_by_id(product_id)
+        product = await self.product_repository.get_by_id(
+            product_id, options=PRODUCT_CARD
+        )
 
         if not product:
             raise EntityNotFound(f"Продукта с ID={product_id} не существует")
@@ -83,21 +111,20 @@ class ProductService:
         updated_data = product_data.model_dump(
             exclude_unset=True, exclude={"tag_ids"}
         )
+        if product_data.tag_ids is not None:
+            updated_data["tags"] = await self.tag_resolver.resolve(
+                product_data.tag_ids
+            )
 
         updated_product = await self.product_repository.update(
             product, updated_data
         )
-        print(updated_product)
-
-        if product_data.tag_ids is not None:
-            tags = await self.tag_repository.get_by_ids(product_data.tag_ids)
-            product.tags = tags
-            await self.tag_repository.db.commit()
-
-        await self.product_repository.db.refresh(product)
         if not updated_product:
             raise EntityNotFound("Не удалось обновить продукт")
 
+        self.uow.after_commit(self.cache.invalidate)
+        await self._publish_changed(product_id)
+
         return ProductOut.model_validate(updated_product)
 
     async def get_all_product(
@@ -111,6 +138,18 @@ class ProductService:
             raise EntityNotFound(f"Список продуктов пуст")
         return [ProductOut.model_validate(prod) for prod in list_products]
 
+    async def get_all_product_json(
+        self, skip: int, limit: int, filters: Optional[dict] = None
+    ) -> bytes:
+        version = self.cache.version
+        list_products = await self.product_repository.get_all_products(
+            skip=skip, limit=limit, **filters
+        )
+
+        if not list_products:
+            raise EntityNotFound("Список продуктов пуст")
+        return self.cache.encode_products(list_products, version)
+
     async def create_product(self, product_data: ProductCreate) -> ProductOut:
         existing = await self.product_repository.get_by_name(product_data.name)
         if existing:
@@ -125,28 +164,16 @@ class ProductService:
             raise EntityNotFound(
                 f"Категории с ID={product_data.category_id} не существует"
             )
-        if product_data.tag_ids:
-            existed_tags = await asyncio.gather(
-                *[
-                    self.tag_repository.get_by_id(tag_id)
-                    for tag_id in product_data.tag_ids
-                ]
-            )
-            if None in existed_tags:
-                invalid_tags = [
-                    tag_id
-                    for tag_id, tag in zip(product_data.tag_ids, existed_tags)
-                    if tag is None
-                ]
-                raise EntityNotFound(f"Теги с ID={invalid_tags} не существуют")
+        tags = await self.tag_resolver.resolve(product_data.tag_ids)
 
         base_data = product_data.model_dump(exclude={"tag_ids"})
 
         try:
             product_orm = await self.product_repository.create_product(
                 prod_data=base_data,
-                tag_ids=product_data.tag_ids,
+                tags=tags,
             )
+            await self._publish_changed(product_orm.id)
 
             return ProductOut.model_validate(product_orm)
 
@@ -162,6 +189,8 @@ class ProductService:
             raise EntityNotFound(f"Продукт с id {product_id} не найден")
 
         await self.product_repository.delete(product_id)
+        self.uow.after_commit(self.cache.invalidate)
+        await self._publish_changed(product_id)
 
     async def deactivate_product(self, product_id: int) -> None:
         product = await self.product_repository.get_by_id(product_id)
@@ -169,6 +198,8 @@ class ProductService:
             raise EntityNotFound("Товар не найден")
 
         await self.product_repository.deactivate_product(product)
+        self.uow.after_commit(self.cache.invalidate)
+        await self._publish_changed(product_id)
 
     async def activate_product(self, product_id: int) -> None:
         product = await self.product_repository.get_by_id(product_id)
@@ -176,6 +207,8 @@ class ProductService:
             raise EntityNotFound("Товар не найден")
 
         await self.product_repository.activate_product(product)
+        self.uow.after_commit(self.cache.invalidate)
+        await self._publish_changed(product_id)
 
     async def delete_category(self, category_id: int) -> None:
         category = await self.category_repository.get_by_id(category_id)
@@ -184,6 +217,7 @@ class ProductService:
             raise EntityNotFound(f"Категория с id {category_id} не найден")
 
         await self.category_repository.delete(category_id)
+        self.uow.after_commit(self.cache.invalidate)
 
     async def delete_tag(self, tag_id: int) -> None:
         tag = await self.tag_repository.get_by_id(tag_id)
@@ -192,3 +226,8 @@ class ProductService:
             raise EntityNotFound(f"Тэг с id {tag_id} не найден")
 
         await self.tag_repository.delete(tag_id)
+        self.uow.after_commit(self.cache.invalidate)
+
+    async def _publish_changed(self, product_id: int) -> None:
+        if self.events:
+            await self.events.publish(ProductChanged(product_id=product_id))
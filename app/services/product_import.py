@@ -0,0 +1,178 @@
+import csv
+import io
+import itertools
+import json
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import ProductCache
+from app.core.types import CatalogFormat
+from app.database.unit_of_work import UnitOfWork
+from app.repositories import (
+    ProductRepository,
+    CategoryRepository,
+    TagRepository,
+)
+from app.services.tag_resolver import TagResolver
+from app.schemas import (
+    ProductImportRow,
+    ProductImportError,
+    ProductImportReport,
+)
+
+RawRow = Tuple[int, dict | str]
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class ProductImportService:
+    product_repository: ProductRepository
+    category_repository: CategoryRepository
+    tag_repository: TagRepository
+    tag_resolver: TagResolver
+    cache: ProductCache
+    uow: UnitOfWork
+    batch_size: int = 1000
+
+    async def import_products(
+        self, file: BinaryIO, import_format: CatalogFormat
+    ) -> ProductImportReport:
+        report = ProductImportReport()
+        rows = self._read_rows(file, import_format)
+
+        while batch := await run_in_threadpool(
+            list, itertools.islice(rows, self.batch_size)
+        ):
+            report.total += len(batch)
+            await self._import_batch(batch, report)
+
+        if report.imported:
+            self.cache.invalidate()
+        return report
+
+    async def _import_batch(
+        self, batch: List[RawRow], report: ProductImportReport
+    ) -> None:
+        valid: Dict[str, Tuple[int, ProductImportRow]] = {}
+        for number, data in batch:
+            if isinstance(data, str):
+                self._add_error(report, number, data)
+                continue
+            try:
+                row = ProductImportRow.model_validate(data)
+            except ValidationError as e:
+                self._add_error(report, number, self._format_error(e))
+                continue
+            if row.name in valid:
+                self._add_error(
+                    report,
+                    valid[row.name][0],
+                    f"Товар {row.name} повторяется в строке {number}",
+                )
+            valid[row.name] = (number, row)
+
+        category_ids = await self.category_repository.get_ids_by_names(
+            row.category for _, row in valid.values()
+        )
+        tag_ids = await self.tag_resolver.resolve_names(
+            tag for _, row in valid.values() for tag in row.tags
+        )
+
+        products = []
+        product_tags: Dict[str, List[int]] = {}
+        numbers = []
+        for number, row in valid.values():
+            if row.category not in category_ids:
+                self._add_error(
+                    report, number, f"Категория {row.category} не найдена"
+                )
+                continue
+            missing_tags = [tag for tag in row.tags if tag not in tag_ids]
+            if missing_tags:
+                self._add_error(
+                    report, number, f"Теги {missing_tags} не найдены"
+                )
+                continue
+
+            # Не указанные в файле поля не затирают значения у
+            # существующего товара.
+            data = row.model_dump(
+                exclude_unset=True, exclude={"category", "tags"}
+            )
+            data["category_id"] = category_ids[row.category]
+            products.append(data)
+            # Без колонки tags теги товара не трогаются.
+            if "tags" in row.model_fields_set:
+                product_tags[row.name] = [tag_ids[tag] for tag in row.tags]
+            numbers.append(number)
+
+        if not products:
+            return
+
+        try:
+            product_ids = await self.product_repository.upsert_products(
+                products
+            )
+            await self.tag_repository.replace_tags_for_products(
+                {
+                    product_ids[name]: tag_list
+                    for name, tag_list in product_tags.items()
+                }
+            )
+            await self.uow.commit()
+        except SQLAlchemyError as e:
+            await self.uow.rollback()
+            for number in numbers:
+                self._add_error(
+                    report, number, f"Ошибка сохранения товара: {str(e)}"
+                )
+            return
+
+        report.imported += len(product_ids)
+
+    def _read_rows(
+        self, file: BinaryIO, import_format: CatalogFormat
+    ) -> Iterator[RawRow]:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+        if import_format == CatalogFormat.CSV:
+            reader = csv.DictReader(text)
+            for number, row in enumerate(reader, start=1):
+                yield number, self._from_csv(row)
+            return
+
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, f"Некорректный JSON: {e.msg}"
+
+    @staticmethod
+    def _from_csv(row: dict) -> dict:
+        data = {
+            field: value
+            for field, value in row.items()
+            if field is not None and value not in (None, "")
+        }
+        if "tags" in row:
+            tags = (tag.strip() for tag in (row["tags"] or "").split("|"))
+            data["tags"] = [tag for tag in tags if tag]
+        return data
+
+    @staticmethod
+    def _format_error(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+            for err in error.errors()
+        )
+
+    @staticmethod
+    def _add_error(
+        report: ProductImportReport, number: int, message: str
+    ) -> None:
+        report.errors.append(ProductImportError(row=number, error=message))
@@ -3,6 +3,7 @@ from typing import List
 
 from app.core.types import Gender
 from app.repositories import ProductRepository, UserFormRepository
+from app.repositories.loading import USER_FORM_FULL
 from app.exceptions.service_errors import EntityNotFound
 from app.schemas import ProductOut
 
@@ -13,7 +14,9 @@ class RecommendationService:
     user_form_repository: UserFormRepository
 
     async def get_recommendations(self, user_id: int) -> List[ProductOut]:
-        user_form = await self.user_form_repository.get_user_form(user_id)
+        user_form = await self.user_form_repository.get_user_form(
+            user_id, options=USER_FORM_FULL
+        )
 
         if not user_form:
             raise EntityNotFound(
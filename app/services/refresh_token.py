@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.unit_of_work import UnitOfWork
+from app.exceptions.service_errors import (
+    InvalidRefreshTokenError,
+    RefreshTokenReuseError,
+)
+from app.repositories import RefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RefreshTokenRecord:
+    jti: str
+    family: str
+    user_id: int
+    expires_at: datetime
+    used_at: Optional[datetime] = None
+    revoked: bool = False
+
+
+class RefreshTokenStore(ABC):
+    def __init__(self, ttl: timedelta):
+        self.ttl = ttl
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    @abstractmethod
+    async def issue(
+        self, user_id: int, family: Optional[str] = None
+    ) -> Tuple[str, str]: ...
+
+    @abstractmethod
+    async def rotate(self, jti: str, family: str) -> int: ...
+
+    @abstractmethod
+    async def revoke_family(self, family: str) -> None: ...
+
+    @abstractmethod
+    async def cleanup(self, batch_size: int = 1000) -> int: ...
+
+    async def run_cleanup(self, interval: float, batch_size: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self.cleanup(batch_size)
+            except Exception:
+                logger.exception("Ошибка при очистке refresh-токенов")
+                continue
+            if removed:
+                logger.info("Удалено просроченных refresh-токенов: %d", removed)
+
+
+class InMemoryRefreshTokenStore(RefreshTokenStore):
+    def __init__(self, ttl: timedelta):
+        super().__init__(ttl)
+        self._tokens: Dict[str, RefreshTokenRecord] = {}
+        self._families: Dict[str, Set[str]] = defaultdict(set)
+
+    async def issue(
+        self, user_id: int, family: Optional[str] = None
+    ) -> Tuple[str, str]:
+        jti, family = self.new_id(), family or self.new_id()
+        self._tokens[jti] = RefreshTokenRecord(
+            jti=jti,
+            family=family,
+            user_id=user_id,
+            expires_at=datetime.utcnow() + self.ttl,
+        )
+        self._families[family].add(jti)
+        return jti, family
+
+    async def rotate(self, jti: str, family: str) -> int:
+        now = datetime.utcnow()
+        record = self._tokens.get(jti)
+        if record is None or record.family != family:
+            raise InvalidRefreshTokenError()
+        if record.used_at is not None and not record.revoked:
+            await self.revoke_family(record.family)
+            raise RefreshTokenReuseError()
+        if record.revoked or record.expires_at <= now:
+            raise InvalidRefreshTokenError()
+
+        record.used_at = now
+        return record.user_id
+
+    async def revoke_family(self, family: str) -> None:
+        for jti in self._families.get(family, ()):
+            self._tokens[jti].revoked = True
+
+    async def cleanup(self, batch_size: int = 1000) -> int:
+        now = datetime.utcnow()
+        expired = [
+            record
+            for record in self._tokens.values()
+            if record.expires_at <= now
+        ]
+        for record in expired:
+            del self._tokens[record.jti]
+            family = self._families[record.family]
+            family.discard(record.jti)
+            if not family:
+                del self._families[record.family]
+        return len(expired)
+
+
+class DatabaseRefreshTokenStore(RefreshTokenStore):
+    def __init__(
+        self,
+        ttl: timedelta,
+        session_factory: async_sessionmaker[AsyncSession],
+        revoked_cache_size: int = 10_000,
+    ):
+        super().__init__(ttl)
+        self.session_factory = session_factory
+        self._revoked_cache_size = revoked_cache_size
+        self._revoked: OrderedDict[str, None] = OrderedDict()
+
+    def _remember_revoked(self, family: str) -> None:
+        self._revoked[family] = None
+        self._revoked.move_to_end(family)
+        if len(self._revoked) > self._revoked_cache_size:
+            self._revoked.popitem(last=False)
+
+    async def issue(
+        self, user_id: int, family: Optional[str] = None
+    ) -> Tuple[str, str]:
+        jti, family = self.new_id(), family or self.new_id()
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                await RefreshTokenRepository(session).add(
+                    jti, family, user_id, datetime.utcnow() + self.ttl
+                )
+        return jti, family
+
+    async def rotate(self, jti: str, family: str) -> int:
+        # Отозванные семейства отсекаются без обращения к БД.
+        if family in self._revoked:
+            raise InvalidRefreshTokenError()
+
+        reused = False
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                repository = RefreshTokenRepository(session)
+                user_id = await repository.mark_used(
+                    jti, family, datetime.utcnow()
+                )
+                if user_id is not None:
+                    return user_id
+
+                record = await repository.get_by_jti(jti)
+                if record is None or record.family != family:
+                    raise InvalidRefreshTokenError()
+                if record.used_at is not None and not record.revoked:
+                    await repository.revoke_family(family)
+                    reused = True
+
+        self._remember_revoked(family)
+        if reused:
+            raise RefreshTokenReuseError()
+        raise InvalidRefreshTokenError()
+
+    async def revoke_family(self, family: str) -> None:
+        async with self.session_factory() as session:
+            async with UnitOfWork(session):
+                await RefreshTokenRepository(session).revoke_family(family)
+        self._remember_revoked(family)
+
+    async def cleanup(self, batch_size: int = 1000) -> int:
+        removed = 0
+        while True:
+            async with self.session_factory() as session:
+                async with UnitOfWork(session):
+                    deleted = await RefreshTokenRepository(
+                        session
+                    ).delete_expired(datetime.utcnow(), batch_size)
+            removed += deleted
+            if deleted < batch_size:
+                return removed
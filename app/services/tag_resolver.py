@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from app.exceptions.service_errors import EntityNotFound
+from app.models import Tag
+from app.repositories import TagRepository
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class TagResolver:
+    tag_repository: TagRepository
+
+    async def resolve(self, tag_ids: Iterable[int]) -> List[Tag]:
+        tag_ids = list(dict.fromkeys(tag_ids))
+        if not tag_ids:
+            return []
+
+        tags = await self.tag_repository.get_by_ids(tag_ids)
+        self._raise_missing(tag_ids, {tag.id for tag in tags})
+        return tags
+
+    async def resolve_names(self, names: Iterable[str]) -> Dict[str, int]:
+        # Имена не кэшируются между запросами: тег мог быть удалён в
+        # другом воркере, и устаревший id уронил бы весь пакет импорта.
+        return await self.tag_repository.get_ids_by_names(names)
+
+    @staticmethod
+    def _raise_missing(tag_ids: Iterable[int], found: set) -> None:
+        missing = [tag_id for tag_id in tag_ids if tag_id not in found]
+        if missing:
+            raise EntityNotFound(f"Теги с ID={missing} не существуют")
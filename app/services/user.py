@@ -1,19 +1,24 @@
 from dataclasses import dataclass
+from typing import Optional
 
+from app.core.cache import UserCache
 from app.core.types import UserType
 from app.exceptions.service_errors import (
     UserNotFoundError,
     InvalidCredentialsError,
     EntityAlreadyExistsError,
 )
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_and_update_password
 from app.repositories import UserRepository
+from app.services.password_rehash import PasswordRehashService
 from app.schemas import UserAuth, UserCreate, UserOut, AdminCreate
 
 
 @dataclass(kw_only=True, frozen=True, slots=True)
 class UserService:
     repository: UserRepository
+    rehash_service: Optional[PasswordRehashService] = None
+    cache: Optional[UserCache] = None
 
     async def register(self, user_data: UserCreate) -> UserOut:
         if await self.repository.get_user_by_email(user_data.email):
@@ -29,15 +34,28 @@ class UserService:
         u = await self.repository.get_user_by_email(auth.email)
         if not u:
             raise UserNotFoundError()
-        if not await verify_password(auth.password, u.hashed_password):
+        verified, new_hash = await verify_and_update_password(
+            auth.password, u.hashed_password
+        )
+        if not verified:
             raise InvalidCredentialsError()
+        if new_hash and self.rehash_service:
+            self.rehash_service.schedule(u.id, u.hashed_password, new_hash)
         return UserOut.model_validate(u)
 
     async def get_user(self, user_id: int) -> UserOut:
+        if self.cache:
+            cached = self.cache.get(user_id)
+            if cached:
+                return cached
+
         u = await self.repository.get_by_id(user_id)
         if not u:
             raise UserNotFoundError(f"ID={user_id} не найден")
-        return UserOut.model_validate(u)
+        user = UserOut.model_validate(u)
+        if self.cache:
+            self.cache.put(user)
+        return user
 
     async def register_admin(self, user_data: AdminCreate) -> UserOut:
         if await self.repository.get_user_by_email(user_data.email):
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy.exc import IntegrityError
 
+from app.core.events import UserFormChanged
 from app.exceptions.service_errors import (
     UserNotFoundError,
     EntityAlreadyExistsError,
@@ -15,6 +16,8 @@ from app.repositories import (
     AllergyRepository,
     GoalRepository,
 )
+from app.repositories.loading import USER_FORM_FULL
+from app.services.event_outbox import EventPublisher
 from app.schemas import (
     UserFormOut,
     UserFormCreate,
@@ -31,9 +34,12 @@ class UserFormService:
     form_repository: UserFormRepository
     goal_repository: GoalRepository
     allergy_repository: AllergyRepository
+    events: Optional[EventPublisher] = None
 
     async def get_user_form(self, user_id: int) -> UserFormOut:
-        user_form = await self.form_repository.get_user_form(user_id)
+        user_form = await self.form_repository.get_user_form(
+            user_id, options=USER_FORM_FULL
+        )
         if not user_form:
             raise UserNotFoundError(
                 f"Анкета пользователя с ID={user_id} не найдена"
@@ -98,6 +104,7 @@ class UserFormService:
                 )
             raise ServiceError(f"Ошибка при создании анкеты: {e}")
 
+        await self._publish_changed(user_id)
         return UserFormOut.model_validate(user_form_orm)
 
     async def delete_user_form(self, user_id: int) -> None:
@@ -109,6 +116,7 @@ class UserFormService:
             )
 
         await self.form_repository.delete_user_form(user_form.user_id)
+        await self._publish_changed(user_id)
 
     async def update_user_form(
         self, user_id: int, form_data: UserFormUpdate
@@ -131,20 +139,27 @@ class UserFormService:
                 )
 
             if form_data.goal_ids is not None:
-                current_goals = [g.id for g in existing_form.goals]
-                if set(current_goals) != set(form_data.goal_ids):
+                current_goals = await self.goal_repository.get_form_goal_ids(
+                    user_id
+                )
+                if current_goals != set(form_data.goal_ids):
                     await self.goal_repository.update_form_goals(
                         user_id=user_id, goal_ids=form_data.goal_ids
                     )
 
             if form_data.allergy_ids is not None:
-                current_allergies = [a.id for a in existing_form.allergies]
-                if set(current_allergies) != set(form_data.allergy_ids):
+                current_allergies = (
+                    await self.allergy_repository.get_form_allergy_ids(user_id)
+                )
+                if current_allergies != set(form_data.allergy_ids):
                     await self.allergy_repository.update_form_allergies(
                         user_id=user_id, allergy_ids=form_data.allergy_ids
                     )
 
-            updated_form = await self.form_repository.get_user_form(user_id)
+            updated_form = await self.form_repository.get_user_form(
+                user_id, options=USER_FORM_FULL
+            )
+            await self._publish_changed(user_id)
             return UserFormOut.model_validate(updated_form)
 
         except ValueError as e:
@@ -167,3 +182,7 @@ class UserFormService:
             raise EntityNotFound(f"Тэг с id {goal_id} не найден")
 
         await self.goal_repository.delete(goal_id)
+
+    async def _publish_changed(self, user_id: int) -> None:
+        if self.events:
+            await self.events.publish(UserFormChanged(user_id=user_id))
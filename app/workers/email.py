@@ -0,0 +1,30 @@
+import asyncio
+import logging
+import signal
+
+from app.database.connection import AsyncSessionLocal, engine
+from app.services import build_email_worker
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info("Воркер отправки писем запущен")
+    try:
+        await build_email_worker(AsyncSessionLocal).run(stop)
+    finally:
+        await engine.dispose()
+    logger.info("Воркер отправки писем остановлен")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+import argparse
+import json
+import statistics
+import time
+
+from passlib.exc import MissingBackendError
+
+from app.core.security import build_crypt_context
+
+PASSWORD = "benchpassword"
+
+
+def measure(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "max_ms": round(max(timings) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, nargs="+", default=[10, 11, 12, 13]
+    )
+    parser.add_argument("--argon2", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    contexts = [
+        (f"bcrypt:{rounds}", build_crypt_context(["bcrypt"], rounds))
+        for rounds in args.bcrypt_rounds
+    ]
+    if args.argon2:
+        contexts.append(("argon2", build_crypt_context(["argon2"])))
+
+    for name, context in contexts:
+        try:
+            hashed = context.hash(PASSWORD)
+        except MissingBackendError as e:
+            print(json.dumps({"scheme": name, "error": str(e)}))
+            continue
+
+        result = {"scheme": name}
+        for operation, fn in (
+            ("hash", lambda: context.hash(PASSWORD)),
+            ("verify", lambda: context.verify(PASSWORD, hashed)),
+        ):
+            result[operation] = measure(fn, args.repeat)
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from types import SimpleNamespace
+from typing import List
+
+from benchmarks.load import percentile
+
+
+def line(product_id: int, shards: int):
+    return SimpleNamespace(
+        product_id=product_id,
+        quantity=1,
+        product=SimpleNamespace(stock_shards=shards if shards > 1 else 0),
+    )
+
+
+async def run(args, shards: int) -> dict:
+    from sqlalchemy import insert
+
+    from app.database.pool import build_engine
+    from app.database.session import make_session_factory
+    from app.database.unit_of_work import UnitOfWork
+    from app.exceptions.service_errors import OutOfStockError
+    from app.models import Category, Product
+    from app.models.base import Base
+    from app.repositories import InventoryRepository, ProductRepository
+    from app.schemas import StockUpdate
+    from app.services import InventoryService
+
+    engine = build_engine(args.database_url)
+    session_factory = make_session_factory(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    # Товар 1 — «горячий», он есть в каждом заказе; остальные строки
+    # заказа приходятся на случайные «холодные» товары.
+    async with session_factory() as session:
+        await session.execute(insert(Category), [{"id": 1, "name": "Бенч"}])
+        await session.execute(
+            insert(Product),
+            [
+                {
+                    "id": i,
+                    "name": f"Товар {i}",
+                    "category_id": 1,
+                    "price": 100,
+                    "stock": args.orders,
+                }
+                for i in range(1, args.products + 1)
+            ],
+        )
+        async with UnitOfWork(session):
+            await InventoryService(
+                inventory_repository=InventoryRepository(session),
+                product_repository=ProductRepository(session),
+            ).set_stock(1, StockUpdate(stock=args.orders, shards=shards))
+
+    latencies: List[float] = []
+    outcomes = {"confirmed": 0, "out_of_stock": 0, "errors": 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def confirm(order: int) -> None:
+        items = [line(1, shards)] + [
+            line(2 + (order * 7 + i) % (args.products - 1), 0)
+            for i in range(args.lines - 1)
+        ]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    async with UnitOfWork(session):
+                        await InventoryService(
+                            inventory_repository=InventoryRepository(session),
+                            product_repository=ProductRepository(session),
+                        ).reserve(items)
+                        # Остальная работа транзакции подтверждения,
+                        # пока строки остатков заблокированы.
+                        await asyncio.sleep(args.hold_ms / 1000)
+                outcomes["confirmed"] += 1
+            except OutOfStockError:
+                outcomes["out_of_stock"] += 1
+            except Exception:
+                outcomes["errors"] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(confirm(order) for order in range(args.orders)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    return {
+        "database": engine.dialect.name,
+        "shards": shards,
+        "orders": args.orders,
+        "concurrency": args.concurrency,
+        "lines": args.lines,
+        **outcomes,
+        "duration_s": round(elapsed, 3),
+        "confirmations_per_sec": round(outcomes["confirmed"] / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Подтверждение заказов с популярным товаром при "
+        "конкурентном доступе. Таблицы указанной базы пересоздаются."
+    )
+    parser.add_argument(
+        "--database-url", default="sqlite+aiosqlite:///./bench.db"
+    )
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--hold-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--shards",
+        default="1,8",
+        help="Варианты числа шардов горячего товара через запятую",
+    )
+    args = parser.parse_args()
+    args.products = max(args.products, 2)
+
+    for shards in map(int, args.shards.split(",")):
+        result = asyncio.run(run(args, shards))
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+PASSWORD = "benchpassword"
+GOAL_TAGS = 10
+NAMES = ("Иван", "Мария", "Анна-Мария", "Пётр", "Ольга")
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, List[int]] = defaultdict(list)
+        self.errors: Dict[str, Dict[int, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+
+    async def call(self, step: str, request, expected: int):
+        started = time.perf_counter()
+        response = await request
+        self.latencies[step].append(time.perf_counter() - started)
+        if response.status_code != expected:
+            self.errors[step][response.status_code] += 1
+        match = SERVER_TIMING_QUERIES.search(
+            response.headers.get("server-timing", "")
+        )
+        if match:
+            self.queries[step].append(int(match.group(1)))
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        steps = {}
+        for step, values in self.latencies.items():
+            queries = self.queries.get(step)
+            steps[step] = {
+                "requests": len(values),
+                "errors": dict(self.errors.get(step, {})),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(values) * 1000, 2),
+                "queries_per_request": (
+                    round(statistics.fmean(queries), 2) if queries else None
+                ),
+            }
+
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "requests": total,
+            "errors": sum(
+                sum(codes.values()) for codes in self.errors.values()
+            ),
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 1),
+            "steps": steps,
+        }
+
+
+async def seed(session_factory, args) -> None:
+    from sqlalchemy import insert, text
+
+    from app.core.security import pwd_context
+    from app.core.types import Gender, OrderStatus
+    from app.models.category_product import (
+        Category,
+        Product,
+        Tag,
+        product_tags,
+    )
+    from app.models.goal_allergy import Allergy, Goal
+    from app.models.order import Order, OrderItem, Promo
+    from app.models.user import User
+    from app.models.user_form import UserForm, user_allergies, user_goals
+
+    rng = random.Random(args.seed)
+    genders = list(Gender)
+    hashed_password = pwd_context.hash(PASSWORD)
+
+    categories = [
+        {"id": i, "name": f"Категория {i}"}
+        for i in range(1, args.categories + 1)
+    ]
+    tags = [{"id": i, "name": f"тег {i}"} for i in range(1, args.tags + 1)]
+    products = [
+        {
+            "id": i,
+            "name": f"Товар {i}",
+            "category_id": rng.randint(1, args.categories),
+            "price": round(rng.uniform(100, 3000), 2),
+            "description": "Описание товара " * 5,
+            "image_url": f"https://cdn.example.com/{i}.png",
+            "min_age": rng.choice((None, 12, 18)),
+            "gender": rng.choice(genders),
+            "is_active": rng.random() > 0.05,
+        }
+        for i in range(1, args.products + 1)
+    ]
+    # Первые GOAL_TAGS тегов совпадают с целями из анкет, чтобы
+    # рекомендации не были пустыми.
+    goals = [
+        {"id": i, "name": tags[i - 1]["name"]} for i in range(1, GOAL_TAGS + 1)
+    ]
+    allergies = [{"id": i, "name": tags[-i]["name"]} for i in range(1, 6)]
+    links = [
+        {"product_id": product["id"], "tag_id": tag_id}
+        for product in products
+        for tag_id in (
+            rng.randint(1, GOAL_TAGS),
+            *rng.sample(range(GOAL_TAGS + 1, args.tags + 1), 2),
+        )
+    ]
+
+    # Пользователь 1 — администратор, созданный при старте приложения.
+    users, forms, form_goals, form_allergies = [], [], [], []
+    orders, items = [], []
+    order_id = item_id = 0
+    for user_id in range(2, args.users + 2):
+        users.append(
+            {
+                "id": user_id,
+                "email": f"user{user_id}@bench.example.com",
+                "name": rng.choice(NAMES),
+                "hashed_password": hashed_password,
+            }
+        )
+        forms.append(
+            {
+                "user_id": user_id,
+                "age": rng.randint(16, 70),
+                "gender": rng.choice(genders),
+                **{
+                    field: rng.random() > 0.5
+                    for field in (
+                        "physical_activity",
+                        "water_activity",
+                        "smoking_activity",
+                        "alcohol_activity",
+                        "computer_activity",
+                        "sport_activity",
+                        "sleep_activity",
+                    )
+                },
+            }
+        )
+        form_goals += [
+            {"user_id": user_id, "goal_id": goal_id}
+            for goal_id in rng.sample(range(1, len(goals) + 1), 2)
+        ]
+        form_allergies.append(
+            {"user_id": user_id, "allergy_id": rng.randint(1, len(allergies))}
+        )
+        if rng.random() < args.cart_ratio:
+            order_id += 1
+            cart = rng.sample(products, 3)
+            orders.append(
+                {
+                    "id": order_id,
+                    "user_id": user_id,
+                    "status": OrderStatus.PENDING,
+                    "total_amount": sum(p["price"] for p in cart),
+                }
+            )
+            for product in cart:
+                item_id += 1
+                items.append(
+                    {
+                        "id": item_id,
+                        "order_id": order_id,
+                        "product_id": product["id"],
+                        "quantity": 1,
+                    }
+                )
+
+    promos = [
+        {"code": f"B{user_id}I{i}", "discount_percent": 10}
+        for user_id in range(2, args.users + 2)
+        for i in range(args.iterations)
+    ]
+
+    async with session_factory() as session:
+        tables = (
+            (Category, categories),
+            (Tag, tags),
+            (Product, products),
+            (product_tags, links),
+            (Goal, goals),
+            (Allergy, allergies),
+            (User, users),
+            (UserForm, forms),
+            (user_goals, form_goals),
+            (user_allergies, form_allergies),
+            (Order, orders),
+            (OrderItem, items),
+            (Promo, promos),
+        )
+        for table, rows in tables:
+            for start in range(0, len(rows), 1000):
+                await session.execute(insert(table), rows[start : start + 1000])
+
+        if session.get_bind().dialect.name == "postgresql":
+            # Идентификаторы заданы явно, поэтому последовательности
+            # нужно сдвинуть вручную.
+            for table, _ in tables:
+                table = getattr(table, "__table__", table)
+                if "id" in table.c:
+                    await session.execute(
+                        text(
+                            f"SELECT setval(pg_get_serial_sequence("
+                            f"'{table.name}', 'id'), "
+                            f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+                        )
+                    )
+        await session.commit()
+
+
+async def user_flow(client, recorder: Recorder, user_id: int, args) -> None:
+    rng = random.Random(args.seed + user_id)
+    response = await recorder.call(
+        "login",
+        client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": f"user{user_id}@bench.example.com",
+                "password": PASSWORD,
+            },
+        ),
+        200,
+    )
+    # Неудачный вход уже учтён как ошибка шага login: сценарий этого
+    # пользователя прерывается, остальные продолжают работу.
+    if response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for iteration in range(args.iterations):
+        await recorder.call(
+            "catalog",
+            client.get(
+                "/api/v1/product/",
+                params={
+                    "skip": rng.randint(0, args.products // 2),
+                    "limit": 20,
+                },
+            ),
+            200,
+        )
+        await recorder.call(
+            "search",
+            client.get(
+                "/api/v1/product/",
+                params={"name": f"Товар {rng.randint(1, 99)}", "limit": 20},
+            ),
+            200,
+        )
+        product_ids = rng.sample(range(1, args.products + 1), 3)
+        await recorder.call(
+            "product",
+            client.get(f"/api/v1/product/{product_ids[0]}"),
+            200,
+        )
+        await recorder.call(
+            "recommendations",
+            client.get("/api/v1/user_form/recommendations", headers=headers),
+            200,
+        )
+        for product_id in product_ids:
+            await recorder.call(
+                "cart_add",
+                client.post(
+                    "/api/v1/order/cart/items",
+                    json={"product_id": product_id, "quantity": 1},
+                    headers=headers,
+                ),
+                201,
+            )
+        await recorder.call(
+            "cart_remove",
+            client.delete(
+                f"/api/v1/order/cart/items/{product_ids[0]}", headers=headers
+            ),
+            200,
+        )
+        await recorder.call(
+            "promo",
+            client.post(
+                "/api/v1/order/cart/apply-promo",
+                params={"promo": f"B{user_id}I{iteration}"},
+                headers=headers,
+            ),
+            200,
+        )
+        await recorder.call(
+            "confirm",
+            client.post("/api/v1/order/cart/confirm", headers=headers),
+            200,
+        )
+
+
+async def run(args) -> dict:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.database.connection import AsyncSessionLocal, engine
+    from app.main import app
+    from app.models.base import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        await seed(AsyncSessionLocal, args)
+        seed_seconds = time.perf_counter() - started
+
+        recorder = Recorder()
+        semaphore = asyncio.Semaphore(args.concurrency)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def run_user(user_id: int) -> None:
+                async with semaphore:
+                    await user_flow(client, recorder, user_id, args)
+
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    run_user(user_id)
+                    for user_id in range(2, args.active_users + 2)
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+    result = {
+        "database": engine.dialect.name,
+        "products": args.products,
+        "tags": args.tags,
+        "users": args.users,
+        "active_users": args.active_users,
+        "concurrency": args.concurrency,
+        "iterations": args.iterations,
+        "seed_seconds": round(seed_seconds, 3),
+    }
+    result.update(recorder.report(elapsed))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Нагрузочный прогон основных сценариев. "
+        "Таблицы указанной базы пересоздаются."
+    )
+    parser.add_argument(
+        "--database-url", default="sqlite+aiosqlite:///./bench.db"
+    )
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--cart-ratio", type=float, default=0.3)
+    parser.add_argument("--active-users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Файл для JSON-результата")
+    args = parser.parse_args()
+    args.active_users = min(args.active_users, args.users)
+    args.tags = max(args.tags, GOAL_TAGS + 2)
+
+    # Настройки читаются при импорте приложения, поэтому URL задаётся до него.
+    os.environ["DATABASE_URL"] = args.database_url
+    # Все виртуальные пользователи приходят с одного адреса ASGI-клиента,
+    # поэтому лимиты по IP отключаются (если не заданы явно).
+    os.environ.setdefault("RATE_LIMIT_LOGIN_PER_IP", "0")
+    os.environ.setdefault("RATE_LIMIT_REGISTER_PER_IP", "0")
+    # Сообщения приложения уходят в stderr, stdout остаётся чистым JSON.
+    with contextlib.redirect_stdout(sys.stderr):
+        result = asyncio.run(run(args))
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
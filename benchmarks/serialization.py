@@ -0,0 +1,129 @@
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+
+from app.core.cache import ProductCache
+from app.core.responses import FastJSONResponse, get_adapter
+from app.core.types import Gender, OrderStatus
+from app.schemas import OrderOut, ProductOut
+
+
+def make_products(count: int) -> list:
+    category = SimpleNamespace(id=1, name="Витамины", description="Описание")
+    tags = [SimpleNamespace(id=i, name=f"тег {i}") for i in range(1, 6)]
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f"Товар {i}",
+            price=100.0 + i,
+            description="Описание товара " * 5,
+            image_url=f"https://cdn.example.com/{i}.png",
+            min_age=18,
+            gender=Gender.ANY,
+            is_active=True,
+            category=category,
+            tags=tags,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_order(products: list) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1,
+        user_id=1,
+        status=OrderStatus.PENDING,
+        total_amount=1000.0,
+        promo=None,
+        items=[
+            SimpleNamespace(id=p.id, product_id=p.id, quantity=2, product=p)
+            for p in products
+        ],
+    )
+
+
+def measure(fn, duration: float) -> dict:
+    fn()
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    elapsed = time.perf_counter() - started
+    return {"ops_per_sec": round(calls / elapsed, 1), "size": len(fn())}
+
+
+def stdlib_path(tp, value):
+    adapter = get_adapter(tp)
+
+    def run():
+        content = adapter.dump_python(
+            adapter.validate_python(value), mode="json"
+        )
+        return JSONResponse(content).body
+
+    return run
+
+
+def fast_path(tp, value):
+    adapter = get_adapter(tp)
+
+    def run():
+        content = adapter.dump_python(
+            adapter.validate_python(value), mode="json"
+        )
+        return FastJSONResponse(content).body
+
+    return run
+
+
+def dump_json_path(tp, value):
+    adapter = get_adapter(tp)
+
+    def run():
+        return adapter.dump_json(adapter.validate_python(value))
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--cart-items", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=1.0)
+    args = parser.parse_args()
+
+    products = make_products(args.products)
+    order = make_order(products[: args.cart_items])
+    cache = ProductCache()
+    order_out = OrderOut.model_validate(order)
+
+    cases = {
+        "product_list": {
+            "stdlib": stdlib_path(List[ProductOut], products),
+            "fast_response": fast_path(List[ProductOut], products),
+            "dump_json": dump_json_path(List[ProductOut], products),
+            "product_cache": lambda: cache.encode_products(products),
+        },
+        "cart": {
+            "stdlib": stdlib_path(OrderOut, order),
+            "fast_response": fast_path(OrderOut, order),
+            "dump_json": dump_json_path(OrderOut, order),
+            "product_cache": lambda: cache.encode_order(order_out),
+        },
+    }
+
+    for endpoint, paths in cases.items():
+        for path, fn in paths.items():
+            result = {"endpoint": endpoint, "path": path}
+            result.update(measure(fn, args.duration))
+            print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.core.cache import TokenCache
+from app.core.jwt_backends import BACKENDS
+
+SECRET = "benchmark-secret"
+ALGORITHM = "HS256"
+
+
+def measure(fn, duration: float) -> float:
+    fn()
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return round(calls / (time.perf_counter() - started), 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=1.0)
+    args = parser.parse_args()
+
+    claims = {
+        "token_type": "access",
+        "sub": "42",
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
+
+    for name, backend_cls in BACKENDS.items():
+        try:
+            backend = backend_cls()
+        except RuntimeError as e:
+            print(
+                json.dumps(
+                    {"backend": name, "error": str(e)}, ensure_ascii=False
+                )
+            )
+            continue
+
+        token = backend.encode(claims, SECRET, ALGORITHM)
+        cache = TokenCache()
+
+        def cached_decode():
+            payload = cache.get(token)
+            if payload is None:
+                payload = backend.decode(token, SECRET, [ALGORITHM])
+                cache.put(token, payload)
+            return payload
+
+        result = {
+            "backend": name,
+            "encode_ops_per_sec": measure(
+                lambda: backend.encode(claims, SECRET, ALGORITHM),
+                args.duration,
+            ),
+            "decode_ops_per_sec": measure(
+                lambda: backend.decode(token, SECRET, [ALGORITHM]),
+                args.duration,
+            ),
+            "cached_decode_ops_per_sec": measure(cached_decode, args.duration),
+        }
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
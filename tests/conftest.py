@@ -9,7 +9,7 @@ from httpx import AsyncClient
 from app.core.settings import Settings
 from app.main import app
 from app.models.base import Base
-from app.database.connection import get_db  #
+from app.database.connection import get_db, get_read_db  #
 
 settings = Settings()
 
@@ -44,6 +44,7 @@ async def db_session():
 @pytest.fixture()
 async def client():
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()  #
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.types import CatalogFormat, Gender
+from app.database.session import make_session_factory
+from app.models import Category, Product, Tag
+from app.models.base import Base
+from app.services.catalog_export import CSV_COLUMNS, CatalogExportService
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = make_session_factory(engine)
+
+    async with session_factory() as session:
+        tags = [Tag(id=1, name="энергия"), Tag(id=2, name="иммунитет")]
+        session.add(Category(id=1, name="Витамины"))
+        session.add(
+            Product(
+                id=1,
+                name="Витамин C",
+                category_id=1,
+                price=100.5,
+                gender=Gender.FEMALE,
+                tags=tags,
+            )
+        )
+        session.add(
+            Product(id=2, name="Магний", category_id=1, price=200, min_age=18)
+        )
+        await session.commit()
+    yield session_factory
+    await engine.dispose()
+
+
+async def export(session_factory, export_format: CatalogFormat) -> str:
+    # Маленькие чанки и пакеты, чтобы строки одного товара приходили
+    # из разных пакетов выборки.
+    service = CatalogExportService(
+        session_factory=session_factory, batch_size=1, chunk_size=16
+    )
+    chunks = [chunk async for chunk in service.export(export_format)]
+    assert len(chunks) > 1
+    return b"".join(chunks).decode("utf-8")
+
+
+class TestCatalogExport:
+
+    async def test_ndjson(self, session_factory):
+        data = await export(session_factory, CatalogFormat.NDJSON)
+
+        rows = [json.loads(line) for line in data.splitlines()]
+        assert rows == [
+            {
+                "id": 1,
+                "name": "Витамин C",
+                "price": 100.5,
+                "description": None,
+                "image_url": None,
+                "min_age": None,
+                "gender": "FEMALE",
+                "is_active": True,
+                "category": "Витамины",
+                "tags": ["иммунитет", "энергия"],
+            },
+            {
+                "id": 2,
+                "name": "Магний",
+                "price": 200.0,
+                "description": None,
+                "image_url": None,
+                "min_age": 18,
+                "gender": "ANY",
+                "is_active": True,
+                "category": "Витамины",
+                "tags": [],
+            },
+        ]
+
+    async def test_csv(self, session_factory):
+        data = await export(session_factory, CatalogFormat.CSV)
+
+        rows = list(csv.reader(io.StringIO(data)))
+        assert rows[0] == list(CSV_COLUMNS)
+        assert len(rows) == 3
+        vitamin = dict(zip(CSV_COLUMNS, rows[1]))
+        assert (vitamin["name"], vitamin["price"]) == ("Витамин C", "100.5")
+        assert vitamin["tags"] == "иммунитет|энергия"
+        magnesium = dict(zip(CSV_COLUMNS, rows[2]))
+        assert (magnesium["min_age"], magnesium["tags"]) == ("18", "")
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+from aiosmtplib import SMTPResponseException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.types import EmailStatus
+from app.database.session import make_session_factory
+from app.models import EmailOutbox
+from app.models.base import Base
+from app.repositories import EmailOutboxRepository
+from app.services.email_outbox import EmailOutboxWorker, SMTPConnectionPool
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, fail_for=(), **kwargs):
+        self.fail_for = fail_for
+        self.is_connected = False
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def send_message(self, message):
+        if message["To"] in self.fail_for:
+            code = 550 if message["To"].startswith("bad") else 451
+            raise SMTPResponseException(code, "rejected")
+        self.sent.append(message["To"])
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+async def make_worker(fail_for=()):
+    FakeSMTP.instances = []
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = make_session_factory(engine)
+    pool = SMTPConnectionPool(
+        hostname="localhost",
+        port=1025,
+        size=2,
+        factory=lambda **kwargs: FakeSMTP(fail_for=fail_for, **kwargs),
+    )
+    worker = EmailOutboxWorker(
+        session_factory=session_factory,
+        pool=pool,
+        sender="shop@example.com",
+        batch_size=10,
+        max_attempts=3,
+        retry_base=5,
+    )
+    return engine, session_factory, worker
+
+
+async def enqueue(session_factory, *recipients):
+    async with session_factory() as session:
+        repository = EmailOutboxRepository(session)
+        for recipient in recipients:
+            await repository.add(recipient, "Тема", "Текст")
+        await session.commit()
+
+
+async def load(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(EmailOutbox).order_by(EmailOutbox.id)
+        )
+        return list(result.scalars())
+
+
+class TestEmailOutboxWorker:
+
+    async def test_batch_reuses_pooled_connections(self):
+        engine, session_factory, worker = await make_worker()
+        await enqueue(session_factory, *(f"u{i}@example.com" for i in range(6)))
+
+        assert await worker.run_once() == 6
+        assert await worker.run_once() == 0
+
+        assert len(FakeSMTP.instances) <= 2
+        assert sum(len(smtp.sent) for smtp in FakeSMTP.instances) == 6
+        assert {m.status for m in await load(session_factory)} == {
+            EmailStatus.SENT
+        }
+        await engine.dispose()
+
+    async def test_transient_failure_is_retried_with_backoff(self):
+        engine, session_factory, worker = await make_worker(
+            fail_for=("slow@example.com",)
+        )
+        await enqueue(session_factory, "slow@example.com")
+
+        before = datetime.utcnow()
+        await worker.run_once()
+        (message,) = await load(session_factory)
+
+        assert message.status == EmailStatus.PENDING
+        assert message.attempts == 1
+        assert message.next_attempt_at >= before + timedelta(seconds=5)
+        assert message.last_error
+        assert await worker.run_once() == 0
+        await engine.dispose()
+
+    async def test_permanent_failure_and_attempt_limit(self):
+        engine, session_factory, worker = await make_worker(
+            fail_for=("bad@example.com", "slow@example.com")
+        )
+        await enqueue(session_factory, "bad@example.com", "slow@example.com")
+
+        await worker.run_once()
+        bad, slow = await load(session_factory)
+        assert bad.status == EmailStatus.FAILED
+        assert slow.status == EmailStatus.PENDING
+
+        assert worker.retry_delay(1) == timedelta(seconds=5)
+        assert worker.retry_delay(2) == timedelta(seconds=10)
+        assert worker.retry_delay(3) is None
+        await engine.dispose()
@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock
+
+from app.core.templates import email_templates
+from app.core.types import Gender, OrderStatus
+from app.schemas import OrderOut, ProductOut
+from app.services.notification import NotificationService
+
+
+def make_order(order_id: int = 7) -> OrderOut:
+    product = ProductOut(
+        id=1,
+        name="Витамин <C>",
+        category={"id": 1, "name": "Витамины"},
+        price=250.0,
+        description="Очень длинное описание " * 40,
+        image_url="https://cdn.example.com/1.png",
+        min_age=None,
+        gender=Gender.ANY,
+        is_active=True,
+        tags=[],
+    )
+    return OrderOut.model_validate(
+        {
+            "id": order_id,
+            "user_id": 1,
+            "status": OrderStatus.CONFIRMED,
+            "total_amount": 450.0,
+            "items": [
+                {"id": 1, "product_id": 1, "quantity": 2, "product": product}
+            ],
+            "promo": {"id": 1, "code": "SALE10", "discount_percent": 10},
+        }
+    )
+
+
+class TestEmailTemplates:
+
+    def test_order_email_is_compact_summary(self):
+        service = NotificationService(
+            outbox_repository=AsyncMock(), templates=email_templates
+        )
+        email = email_templates.render(
+            "order_confirmed", service.order_context(make_order())
+        )
+
+        assert email.subject == "Подтверждение заказа №7"
+        assert "Витамин <C> × 2 = 500.00 ₽" in email.text
+        assert "SALE10" in email.text and "Итого: 450.00 ₽" in email.text
+        assert "Очень длинное описание" not in email.text
+        assert "Витамин &lt;C&gt;" in email.html
+        assert "<tr><td>" in email.html
+
+    async def test_batch_is_queued_in_one_call(self):
+        outbox = AsyncMock()
+        service = NotificationService(
+            outbox_repository=outbox, templates=email_templates
+        )
+
+        await service.send_order_emails(
+            [("a@b.com", make_order(1)), ("c@d.com", make_order(2))]
+        )
+
+        (messages,) = outbox.add_many.await_args.args
+        assert [recipient for recipient, _ in messages] == [
+            "a@b.com",
+            "c@d.com",
+        ]
+        assert messages[1][1].subject == "Подтверждение заказа №2"
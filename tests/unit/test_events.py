@@ -0,0 +1,112 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.events import (
+    CartUpdated,
+    EventBus,
+    OrderConfirmed,
+    ProductChanged,
+)
+from app.database.session import make_session_factory
+from app.database.unit_of_work import UnitOfWork
+from app.models import EventOutbox
+from app.models.base import Base
+from app.services.event_outbox import EventOutboxDispatcher, EventPublisher
+
+EVENT = OrderConfirmed(
+    order_id=1, user_id=2, total_amount=100.0, items=((5, 2), (6, 1))
+)
+
+
+class TestEventBus:
+
+    async def test_published_only_after_commit(self):
+        bus = EventBus()
+        handler = AsyncMock()
+        bus.subscribe(OrderConfirmed, handler)
+        session = AsyncMock(info={}, new=[], dirty=[], deleted=[])
+
+        uow = UnitOfWork(session)
+        await EventPublisher(bus, uow).publish(EVENT)
+        await uow.rollback()
+        await uow.commit()
+        await bus.drain()
+        handler.assert_not_awaited()
+
+        await EventPublisher(bus, uow).publish(EVENT)
+        await uow.commit()
+        await bus.drain()
+        handler.assert_awaited_once_with(EVENT)
+
+    async def test_failing_subscriber_does_not_affect_others(self):
+        bus = EventBus()
+        received = []
+
+        @bus.subscribe(CartUpdated)
+        async def broken(event):
+            raise RuntimeError("boom")
+
+        @bus.subscribe(CartUpdated)
+        async def ok(event):
+            received.append(event)
+
+        with pytest.raises(RuntimeError):
+            await bus.dispatch(CartUpdated(order_id=1, user_id=1))
+        bus.publish(CartUpdated(order_id=2, user_id=1))
+        await bus.drain()
+
+        assert [e.order_id for e in received] == [1, 2]
+
+
+class TestEventOutbox:
+
+    async def test_durable_delivery_is_retried(self):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = make_session_factory(engine)
+
+        bus = EventBus()
+        attempts = []
+
+        @bus.subscribe(OrderConfirmed)
+        async def flaky(event):
+            attempts.append(event)
+            if len(attempts) == 1:
+                raise RuntimeError("temporary")
+
+        async with session_factory() as session:
+            async with UnitOfWork(session) as uow:
+                publisher = EventPublisher(bus, uow, durable=True)
+                await publisher.publish(EVENT)
+                await publisher.publish(ProductChanged(product_id=5))
+
+        sessions = []
+
+        def counting_factory():
+            sessions.append(1)
+            return session_factory()
+
+        dispatcher = EventOutboxDispatcher(bus, counting_factory, retry_base=0)
+        assert await dispatcher.run_once() == 2
+        # Захват пакета и запись результатов — по одной транзакции.
+        assert len(sessions) == 2
+        assert await dispatcher.run_once() == 1
+
+        assert attempts == [EVENT, EVENT]
+        async with session_factory() as session:
+            records = (
+                (await session.execute(select(EventOutbox))).scalars().all()
+            )
+        assert all(r.processed_at is not None for r in records)
+        assert records[0].attempts == 2
+
+        dispatcher.retention = timedelta(0)
+        await asyncio.sleep(0.01)
+        assert await dispatcher.cleanup() == 2
+        await engine.dispose()
@@ -0,0 +1,33 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing import PasswordHasher
+from app.exceptions.service_errors import TooManyRequestsError
+
+
+class TestPasswordHasher:
+
+    async def test_runs_outside_event_loop_thread(self):
+        hasher = PasswordHasher(max_workers=1)
+
+        name = await hasher.run("hash", lambda: threading.current_thread().name)
+
+        assert name.startswith("password-hasher")
+        assert hasher.pending == 0
+
+    async def test_rejects_when_saturated(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=1, retry_after=3)
+        release = threading.Event()
+
+        busy = asyncio.create_task(hasher.run("hash", release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(TooManyRequestsError) as exc_info:
+            await hasher.run("hash", lambda: None)
+        assert exc_info.value.retry_after == 3
+
+        release.set()
+        assert await busy is True
+        assert hasher.pending == 0
@@ -0,0 +1,54 @@
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.instrumentation import (
+    QueryStatsMiddleware,
+    current_query_stats,
+    instrument_engine,
+)
+from app.core.metrics import registry
+
+
+def make_app():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        async with engine.connect() as conn:
+            for _ in range(3):
+                await conn.execute(text("SELECT 1"))
+        stats = current_query_stats()
+        return {"queries": stats.count}
+
+    return app
+
+
+class TestQueryStats:
+
+    async def test_queries_are_attributed_to_request(self):
+        transport = ASGITransport(app=make_app())
+        async with AsyncClient(transport=transport, base_url="http://t") as c:
+            response = await c.get("/items/1")
+
+        assert response.json() == {"queries": 3}
+        assert 'desc="3 queries"' in response.headers["server-timing"]
+
+        histogram = registry.get("http_request_db_queries")
+        counts, total = histogram.snapshot()[("GET", "/items/{item_id}")]
+        assert sum(counts) >= 1
+        assert total >= 3
+
+    async def test_no_stats_outside_request(self):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        instrument_engine(engine)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        assert current_query_stats() is None
@@ -0,0 +1,148 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.types import OrderStatus
+from app.database.session import make_session_factory
+from app.exceptions.service_errors import OrderAtWorkError, OutOfStockError
+from app.models import Category, Order, OrderItem, Product
+from app.models.base import Base
+from app.repositories import (
+    InventoryRepository,
+    OrderItemRepository,
+    OrderRepository,
+    ProductRepository,
+    PromoRepository,
+)
+from app.schemas import StockUpdate
+from app.services.inventory import InventoryService
+from app.services.order import OrderService
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with make_session_factory(engine)() as session:
+        session.add(Category(id=1, name="Витамины"))
+        for product_id, stock in ((1, 5), (2, 1), (3, None), (4, None)):
+            session.add(
+                Product(
+                    id=product_id,
+                    name=f"Товар {product_id}",
+                    category_id=1,
+                    price=100,
+                    stock=stock,
+                )
+            )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def make_service(session) -> InventoryService:
+    return InventoryService(
+        inventory_repository=InventoryRepository(session),
+        product_repository=ProductRepository(session),
+    )
+
+
+def make_order_service(session) -> OrderService:
+    return OrderService(
+        order_repository=OrderRepository(session),
+        order_item_repository=OrderItemRepository(session),
+        promo_repository=PromoRepository(session),
+        product_repository=ProductRepository(session),
+        inventory=make_service(session),
+    )
+
+
+def line(product_id: int, quantity: int, shards: int = 0):
+    return SimpleNamespace(
+        product_id=product_id,
+        quantity=quantity,
+        product=SimpleNamespace(stock_shards=shards),
+    )
+
+
+class TestInventory:
+
+    async def test_batch_reserve_in_one_statement(self, session):
+        repository = InventoryRepository(session)
+
+        reserved = await repository.reserve({1: 3, 2: 2, 3: 10})
+
+        assert reserved == {1, 3}
+        assert (await session.get(Product, 1)).stock == 2
+
+    async def test_reserve_updates_loaded_products(self, session):
+        product = await session.get(Product, 1)
+
+        await InventoryRepository(session).reserve({1: 2})
+
+        assert product.stock == 3
+
+    async def test_reserve_raises_for_missing_stock(self, session):
+        service = make_service(session)
+
+        with pytest.raises(OutOfStockError) as exc:
+            await service.reserve([line(1, 2), line(2, 1), line(2, 1)])
+
+        assert exc.value.product_ids == [2]
+
+    async def test_sharded_stock(self, session):
+        service = make_service(session)
+        stock = await service.set_stock(4, StockUpdate(stock=10, shards=4))
+        assert (stock.stock, stock.shards) == (10, 4)
+
+        # В каждом шарде по 2–3 единицы: 7 собирается из нескольких.
+        await service.reserve([line(4, 7, shards=4)])
+        await service.reserve([line(4, 2, shards=4)])
+        assert (await service.get_stock(4)).stock == 1
+
+        with pytest.raises(OutOfStockError):
+            await service.reserve([line(4, 2, shards=4)])
+
+    async def test_confirm_same_cart_twice(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = make_session_factory(engine)
+        async with session_factory() as session:
+            session.add(Category(id=1, name="Витамины"))
+            session.add(
+                Product(id=1, name="Товар", category_id=1, price=100, stock=5)
+            )
+            session.add(
+                Order(
+                    id=1,
+                    user_id=1,
+                    status=OrderStatus.PENDING,
+                    total_amount=200,
+                    items=[OrderItem(product_id=1, quantity=2)],
+                )
+            )
+            await session.commit()
+
+        async with session_factory() as first, session_factory() as second:
+            # Второй запрос успел прочитать корзину в статусе PENDING.
+            late = make_order_service(second)
+            stale = await late.order_repository.get_pending_order(1)
+            late.order_repository.get_pending_order = AsyncMock(
+                return_value=stale
+            )
+
+            await make_order_service(first).confirm_order(1)
+            await first.commit()
+
+            with pytest.raises(OrderAtWorkError):
+                await late.confirm_order(1)
+            await second.rollback()
+
+        async with session_factory() as session:
+            assert (await session.get(Product, 1)).stock == 3
+        await engine.dispose()
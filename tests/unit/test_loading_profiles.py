@@ -0,0 +1,127 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.types import Gender, OrderStatus
+from app.database.session import make_session_factory
+from app.models import (
+    Allergy,
+    Category,
+    Goal,
+    Order,
+    OrderItem,
+    Product,
+    Promo,
+    Tag,
+    User,
+    UserForm,
+)
+from app.models.base import Base
+from app.repositories import (
+    OrderRepository,
+    ProductRepository,
+    UserFormRepository,
+)
+from app.repositories.loading import USER_FORM_FULL
+from app.schemas import OrderOut, ProductOut, UserFormOut
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with make_session_factory(engine)() as session:
+        tags = [Tag(id=1, name="иммунитет"), Tag(id=2, name="энергия")]
+        session.add(Category(id=1, name="Витамины"))
+        session.add(
+            Product(id=1, name="Витамин C", category_id=1, price=100, tags=tags)
+        )
+        session.add(Promo(id=1, code="SALE", discount_percent=10))
+        session.add(
+            User(id=1, email="a@b.com", name="Иван", hashed_password="x")
+        )
+        session.add(
+            Order(
+                id=1,
+                user_id=1,
+                promo_id=1,
+                status=OrderStatus.PENDING,
+                total_amount=180,
+                items=[OrderItem(product_id=1, quantity=2)],
+            )
+        )
+        session.add(
+            UserForm(
+                user_id=1,
+                age=30,
+                gender=Gender.MALE,
+                physical_activity=True,
+                water_activity=False,
+                smoking_activity=False,
+                alcohol_activity=False,
+                computer_activity=True,
+                sport_activity=False,
+                sleep_activity=True,
+                goals=[Goal(id=1, name="Сон")],
+                allergies=[Allergy(id=1, name="Лактоза")],
+            )
+        )
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with make_session_factory(engine)() as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine):
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+class TestLoadingProfiles:
+
+    async def test_product_card(self, session, statements):
+        [product] = await ProductRepository(session).get_all_products()
+        out = ProductOut.model_validate(product)
+
+        assert out.category.name == "Витамины"
+        assert sorted(tag.name for tag in out.tags) == ["иммунитет", "энергия"]
+        assert len(statements) == 2
+
+    async def test_order_cart(self, session, statements):
+        order = await OrderRepository(session).get_pending_order(1)
+        out = OrderOut.model_validate(order)
+
+        assert out.promo.code == "SALE"
+        assert out.items[0].product.category.name == "Витамины"
+        assert len(out.items[0].product.tags) == 2
+        assert len(statements) == 3
+
+    async def test_user_form_full(self, session, statements):
+        form = await UserFormRepository(session).get_user_form(
+            1, options=USER_FORM_FULL
+        )
+        out = UserFormOut.model_validate(form)
+
+        assert [goal.name for goal in out.goals] == ["Сон"]
+        assert [allergy.name for allergy in out.allergies] == ["Лактоза"]
+        assert len(statements) == 3
+
+    async def test_relationships_without_profile_raise(self, session):
+        form = await UserFormRepository(session).get_user_form(1)
+
+        with pytest.raises(InvalidRequestError):
+            form.goals
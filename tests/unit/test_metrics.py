@@ -0,0 +1,52 @@
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.instrumentation import MetricsMiddleware
+from app.core.metrics import MetricsRegistry, registry, render_text
+
+
+class TestMetrics:
+
+    def test_histogram_exposition_is_cumulative(self):
+        metrics = MetricsRegistry()
+        histogram = metrics.histogram(
+            "latency_seconds", "Задержка", ("route",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 5.0):
+            histogram.labels("/a").observe(value)
+
+        text = render_text(metrics)
+
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1.0' in text
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2.0' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3.0' in text
+        assert 'latency_seconds_count{route="/a"} 3.0' in text
+
+    def test_labels_are_cached(self):
+        metrics = MetricsRegistry()
+        counter = metrics.counter("hits_total", "Попадания", ("cache",))
+
+        counter.labels("product").inc()
+        counter.inc(cache="product")
+
+        assert counter.labels("product") is counter.labels("product")
+        assert counter.samples() == [("hits_total", ("product",), 2.0)]
+
+    async def test_middleware_observes_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/orders/{order_id}")
+        async def read_order(order_id: int):
+            return {"id": order_id}
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://t") as c:
+            await c.get("/orders/1")
+            await c.get("/orders/2")
+
+        histogram = registry.get("http_request_duration_seconds")
+        counts, _ = histogram.snapshot()[("GET", "/orders/{order_id}", "200")]
+        assert sum(counts) == 2
+        assert registry.get("http_requests_in_flight").samples()[0][2] == 0
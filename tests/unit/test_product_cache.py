@@ -0,0 +1,111 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import ProductCache
+from app.core.types import Gender, OrderStatus
+from app.schemas import OrderOut
+
+
+def make_fake_product(id: int, name: str, price: float = 100.0):
+    return SimpleNamespace(
+        id=id,
+        name=name,
+        price=price,
+        description=None,
+        image_url=None,
+        min_age=None,
+        gender=Gender.ANY,
+        is_active=True,
+        category=SimpleNamespace(id=1, name="Витамины", description=None),
+        tags=[SimpleNamespace(id=1, name="иммунитет")],
+    )
+
+
+class TestProductCache:
+
+    def test_encode_product_is_cached(self):
+        cache = ProductCache()
+        product = make_fake_product(1, "Витамин C")
+
+        first = cache.encode_product(product)
+        product.name = "Изменено"
+        second = cache.encode_product(product)
+
+        assert first == second
+        assert json.loads(first)["name"] == "Витамин C"
+        assert cache.hits == 1
+
+    def test_invalidate_drops_entries(self):
+        cache = ProductCache()
+        product = make_fake_product(1, "Витамин C")
+        cache.encode_product(product)
+
+        cache.invalidate()
+        product.name = "Изменено"
+
+        assert json.loads(cache.encode_product(product))["name"] == "Изменено"
+
+    def test_stale_version_is_not_stored(self):
+        cache = ProductCache()
+        version = cache.version
+        cache.invalidate()
+
+        cache.store(make_fake_product(1, "Витамин C"), version)
+
+        assert cache.get(1) is None
+
+    def test_not_stored_while_replicas_settle(self):
+        cache = ProductCache(settle=60.0)
+        cache.invalidate()
+
+        cache.encode_product(make_fake_product(1, "Витамин C"))
+        assert cache.get(1) is None
+
+        cache._settle_until = 0.0
+        cache.encode_product(make_fake_product(1, "Витамин C"))
+        assert cache.get(1) is not None
+
+    def test_lru_eviction(self):
+        cache = ProductCache(max_size=2)
+        for i in range(1, 4):
+            cache.encode_product(make_fake_product(i, f"Товар {i}"))
+
+        assert cache.get(1) is None
+        assert cache.get(3) is not None
+
+    def test_encode_products(self):
+        cache = ProductCache()
+        products = [make_fake_product(i, f"Товар {i}") for i in (1, 2)]
+
+        payload = json.loads(cache.encode_products(products))
+
+        assert [p["id"] for p in payload] == [1, 2]
+        assert payload[0]["category"]["name"] == "Витамины"
+
+    @pytest.mark.parametrize("items_count", [0, 2])
+    def test_encode_order_matches_model_dump(self, items_count):
+        cache = ProductCache()
+        order = OrderOut.model_validate(
+            SimpleNamespace(
+                id=7,
+                user_id=3,
+                status=OrderStatus.PENDING,
+                total_amount=200.0,
+                promo=None,
+                items=[
+                    SimpleNamespace(
+                        id=i,
+                        product_id=i,
+                        quantity=1,
+                        product=make_fake_product(i, f"Товар {i}"),
+                    )
+                    for i in range(1, items_count + 1)
+                ],
+            )
+        )
+
+        assert json.loads(cache.encode_order(order)) == order.model_dump(
+            mode="json"
+        )
@@ -0,0 +1,185 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.cache import ProductCache
+from app.core.types import CatalogFormat, Gender
+from app.database.session import make_session_factory
+from app.database.unit_of_work import UnitOfWork
+from app.models import Category, Product, Tag, product_tags
+from app.models.base import Base
+from app.repositories import (
+    CategoryRepository,
+    ProductRepository,
+    TagRepository,
+)
+from app.services.product_import import ProductImportService
+from app.services.tag_resolver import TagResolver
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with make_session_factory(engine)() as session:
+        session.add(Category(id=1, name="Витамины"))
+        session.add(Tag(id=1, name="иммунитет"))
+        session.add(Tag(id=2, name="энергия"))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def make_service(session) -> ProductImportService:
+    tag_repository = TagRepository(session)
+    return ProductImportService(
+        product_repository=ProductRepository(session),
+        category_repository=CategoryRepository(session),
+        tag_repository=tag_repository,
+        tag_resolver=TagResolver(tag_repository=tag_repository),
+        cache=ProductCache(),
+        uow=UnitOfWork(session),
+    )
+
+
+def ndjson(*rows) -> io.BytesIO:
+    lines = (row if isinstance(row, str) else json.dumps(row) for row in rows)
+    return io.BytesIO("\n".join(lines).encode())
+
+
+async def get_product(session, name: str) -> Product:
+    session.expire_all()
+    result = await session.execute(select(Product).where(Product.name == name))
+    return result.scalar_one()
+
+
+async def get_tag_ids(session, product_id: int) -> set:
+    result = await session.execute(
+        select(product_tags.c.tag_id).where(
+            product_tags.c.product_id == product_id
+        )
+    )
+    return set(result.scalars())
+
+
+class TestProductImport:
+
+    async def test_csv(self, session):
+        file = io.BytesIO(
+            "name,price,category,tags,gender\n"
+            "Витамин C,100,Витамины,иммунитет|энергия,MALE\n"
+            "Магний,250.5,Витамины,,\n".encode()
+        )
+
+        report = await make_service(session).import_products(
+            file, CatalogFormat.CSV
+        )
+
+        assert (report.total, report.imported, report.errors) == (2, 2, [])
+        vitamin = await get_product(session, "Витамин C")
+        assert vitamin.gender == Gender.MALE
+        assert await get_tag_ids(session, vitamin.id) == {1, 2}
+        magnesium = await get_product(session, "Магний")
+        assert (float(magnesium.price), magnesium.gender) == (250.5, Gender.ANY)
+        assert await get_tag_ids(session, magnesium.id) == set()
+
+    async def test_row_errors(self, session):
+        file = ndjson(
+            {"name": "Витамин C", "price": 100, "category": "Витамины"},
+            "{не json",
+            {"name": "Цинк", "price": -1, "category": "Витамины"},
+            {"name": "Железо", "price": 10, "category": "Нет такой"},
+            {
+                "name": "Омега-3",
+                "price": 10,
+                "category": "Витамины",
+                "tags": ["нет такого"],
+            },
+            {"name": "Витамин C", "price": 120, "category": "Витамины"},
+        )
+
+        report = await make_service(session).import_products(
+            file, CatalogFormat.NDJSON
+        )
+
+        assert (report.total, report.imported) == (6, 1)
+        errors = {error.row: error.error for error in report.errors}
+        assert sorted(errors) == [1, 2, 3, 4, 5]
+        assert errors[1].startswith("Товар Витамин C повторяется в строке 6")
+        assert errors[2].startswith("Некорректный JSON")
+        assert errors[3].startswith("price")
+        assert "Нет такой" in errors[4]
+        assert "нет такого" in errors[5]
+        # Из повторяющихся строк сохраняется последняя.
+        assert float((await get_product(session, "Витамин C")).price) == 120
+
+    async def test_upsert_existing_product(self, session):
+        session.add(
+            Product(
+                id=10,
+                name="Витамин C",
+                category_id=1,
+                price=100,
+                gender=Gender.FEMALE,
+                is_active=False,
+                tags=[await session.get(Tag, 1)],
+            )
+        )
+        await session.commit()
+
+        report = await make_service(session).import_products(
+            ndjson(
+                {
+                    "name": "Витамин C",
+                    "price": 150,
+                    "category": "Витамины",
+                    "tags": ["энергия"],
+                }
+            ),
+            CatalogFormat.NDJSON,
+        )
+
+        assert (report.imported, report.errors) == (1, [])
+        product = await get_product(session, "Витамин C")
+        assert product.id == 10
+        assert float(product.price) == 150
+        # Поля, которых нет в файле, не сбрасываются к значениям по умолчанию.
+        assert (product.gender, product.is_active) == (Gender.FEMALE, False)
+        assert await get_tag_ids(session, 10) == {2}
+
+    @pytest.mark.parametrize(
+        "import_format, file",
+        [
+            (CatalogFormat.CSV, "name,price,category\nМагний,150,Витамины\n"),
+            (
+                CatalogFormat.NDJSON,
+                '{"name": "Магний", "price": 150, "category": "Витамины"}',
+            ),
+        ],
+    )
+    async def test_reimport_without_tags_keeps_tags(
+        self, session, import_format, file
+    ):
+        session.add(
+            Product(
+                id=10,
+                name="Магний",
+                category_id=1,
+                price=100,
+                tags=[await session.get(Tag, 1), await session.get(Tag, 2)],
+            )
+        )
+        await session.commit()
+
+        report = await make_service(session).import_products(
+            io.BytesIO(file.encode()), import_format
+        )
+
+        assert (report.imported, report.errors) == (1, [])
+        assert float((await get_product(session, "Магний")).price) == 150
+        assert await get_tag_ids(session, 10) == {1, 2}
@@ -0,0 +1,63 @@
+import asyncio
+import marshal
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.profiling import ProfileStore, SlowRequestProfilerMiddleware
+
+
+def slow_recommendations():
+    return sum(i * i for i in range(10_000))
+
+
+def make_app(store: ProfileStore, threshold_ms: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        SlowRequestProfilerMiddleware,
+        store=store,
+        sample_rate=1.0,
+        threshold_ms=threshold_ms,
+    )
+
+    @app.get("/recommendations/{user_id}")
+    async def recommendations(user_id: int):
+        await asyncio.sleep(0)
+        return {"total": slow_recommendations()}
+
+    return app
+
+
+async def call(app: FastAPI, times: int = 1) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://t") as c:
+        for _ in range(times):
+            await c.get("/recommendations/1")
+
+
+class TestSlowRequestProfiler:
+
+    async def test_slow_request_is_captured(self):
+        store = ProfileStore()
+
+        await call(make_app(store, threshold_ms=0))
+
+        [profile] = store.list()
+        assert profile.route == "/recommendations/{user_id}"
+        assert profile.status == 200
+        assert "slow_recommendations" in profile.render()
+        assert marshal.loads(profile.dump()) == profile.stats
+
+    async def test_fast_requests_are_dropped(self):
+        store = ProfileStore()
+
+        await call(make_app(store, threshold_ms=60_000))
+
+        assert store.list() == []
+
+    async def test_ring_buffer_keeps_latest(self):
+        store = ProfileStore(max_size=2)
+
+        await call(make_app(store, threshold_ms=0), times=3)
+
+        assert [profile.id for profile in store.list()] == [3, 2]
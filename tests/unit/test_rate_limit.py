@@ -0,0 +1,57 @@
+import pytest
+
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimiter
+from app.exceptions.service_errors import TooManyRequestsError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter:
+
+    async def test_bucket_exhausts_and_refills(self):
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(clock=clock)
+        limiter = RateLimiter("login_ip", backend, limit=3, period=60)
+
+        for _ in range(3):
+            await limiter.check("10.0.0.1")
+        with pytest.raises(TooManyRequestsError) as exc:
+            await limiter.check("10.0.0.1")
+        assert exc.value.retry_after == 20
+
+        await limiter.check("10.0.0.2")
+        clock.now = 20
+        await limiter.check("10.0.0.1")
+
+    async def test_limiters_do_not_share_buckets(self):
+        backend = InMemoryRateLimitBackend(clock=FakeClock())
+        ip = RateLimiter("login_ip", backend, limit=1, period=60)
+        email = RateLimiter("login_email", backend, limit=1, period=60)
+
+        await ip.check("a")
+        await email.check("a")
+        with pytest.raises(TooManyRequestsError):
+            await ip.check("a")
+
+    async def test_zero_limit_disables(self):
+        backend = InMemoryRateLimitBackend(clock=FakeClock())
+        limiter = RateLimiter("promo_user", backend, limit=0, period=60)
+
+        for _ in range(10):
+            await limiter.check("1")
+        assert backend.size() == 0
+
+    def test_shards_are_bounded(self):
+        backend = InMemoryRateLimitBackend(
+            shards=4, max_keys=8, clock=FakeClock()
+        )
+        for i in range(100):
+            backend.take(f"key{i}", capacity=5, refill_rate=1)
+
+        assert backend.size() <= 8
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.session import make_session_factory
+from app.exceptions.service_errors import (
+    InvalidRefreshTokenError,
+    RefreshTokenReuseError,
+)
+from app.models import User
+from app.models.base import Base
+from app.services.refresh_token import (
+    DatabaseRefreshTokenStore,
+    InMemoryRefreshTokenStore,
+)
+
+
+@pytest.fixture(params=["memory", "database"])
+async def make_store(request):
+    if request.param == "memory":
+        yield lambda ttl=timedelta(days=1): InMemoryRefreshTokenStore(ttl)
+        return
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = make_session_factory(engine)
+    async with session_factory() as session:
+        session.add(
+            User(id=1, email="a@b.com", name="Иван", hashed_password="x")
+        )
+        await session.commit()
+
+    yield lambda ttl=timedelta(days=1): DatabaseRefreshTokenStore(
+        ttl, session_factory=session_factory
+    )
+    await engine.dispose()
+
+
+class TestRefreshTokenStore:
+
+    async def test_rotate_once(self, make_store):
+        store = make_store()
+        jti, family = await store.issue(1)
+
+        assert await store.rotate(jti, family) == 1
+        new_jti, new_family = await store.issue(1, family)
+        assert new_family == family
+        assert await store.rotate(new_jti, family) == 1
+
+    async def test_reuse_revokes_family(self, make_store):
+        store = make_store()
+        jti, family = await store.issue(1)
+        await store.rotate(jti, family)
+        new_jti, _ = await store.issue(1, family)
+
+        with pytest.raises(RefreshTokenReuseError):
+            await store.rotate(jti, family)
+        with pytest.raises(InvalidRefreshTokenError):
+            await store.rotate(new_jti, family)
+
+    async def test_unknown_and_foreign_family_rejected(self, make_store):
+        store = make_store()
+        jti, _ = await store.issue(1)
+        _, other_family = await store.issue(1)
+
+        with pytest.raises(InvalidRefreshTokenError):
+            await store.rotate("missing", other_family)
+        with pytest.raises(InvalidRefreshTokenError):
+            await store.rotate(jti, other_family)
+
+    async def test_revoke_family(self, make_store):
+        store = make_store()
+        jti, family = await store.issue(1)
+        await store.revoke_family(family)
+
+        with pytest.raises(InvalidRefreshTokenError):
+            await store.rotate(jti, family)
+
+    async def test_cleanup_removes_expired(self, make_store):
+        store = make_store(ttl=timedelta(seconds=-1))
+        for _ in range(5):
+            await store.issue(1)
+
+        assert await store.cleanup(batch_size=2) == 5
+        assert await store.cleanup() == 0
@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.routing import Replica, ReplicaRouter
+
+
+def make_replica() -> Replica:
+    return Replica(engine=create_async_engine("sqlite+aiosqlite://"))
+
+
+class TestReplicaRouter:
+
+    async def test_without_replicas_uses_primary(self):
+        primary = make_replica()
+        router = ReplicaRouter(primary=primary)
+
+        assert await router.session_factory() is primary.session_factory
+        assert (
+            await router.session_factory(read_only=True)
+            is primary.read_only_session_factory
+        )
+
+    async def test_replicas_are_used_round_robin(self):
+        replicas = [make_replica(), make_replica()]
+        router = ReplicaRouter(primary=make_replica(), replicas=replicas)
+
+        chosen = [await router.session_factory() for _ in range(4)]
+
+        assert chosen == [replica.session_factory for replica in replicas * 2]
+
+    async def test_lagging_replicas_fall_back_to_primary(self, monkeypatch):
+        primary = make_replica()
+        replicas = [make_replica(), make_replica()]
+        router = ReplicaRouter(
+            primary=primary, replicas=replicas, max_lag_seconds=1.0
+        )
+
+        async def check_lag(self, replica):
+            replica.checked_at = float("inf")
+            replica.healthy = replica is replicas[1]
+
+        monkeypatch.setattr(ReplicaRouter, "_check_lag", check_lag)
+
+        assert await router.session_factory() is replicas[1].session_factory
+        replicas[1].healthy = False
+        assert await router.session_factory() is primary.session_factory
+
+    def test_read_only_sessions_autocommit(self):
+        replica = make_replica()
+
+        bind = replica.read_only_session_factory.kw["bind"]
+
+        assert bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
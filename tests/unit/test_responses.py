@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.responses import FastJSONResponse, model_response
+from app.core.settings import settings
+from app.schemas import TagOut
+
+
+def make_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/tags", response_model=List[TagOut])
+    async def tags():
+        return [TagOut(id=1, name="иммунитет")]
+
+    @app.get("/tags/raw")
+    async def raw_tags():
+        return model_response([TagOut(id=2, name="энергия")], List[TagOut])
+
+    return app
+
+
+class TestFastJSONResponse:
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_render(self, monkeypatch, use_orjson):
+        monkeypatch.setattr(settings, "USE_ORJSON", use_orjson)
+        response = FastJSONResponse({"name": "Витамин", "price": 1.5})
+
+        assert json.loads(response.body) == {"name": "Витамин", "price": 1.5}
+        assert "Витамин".encode() in response.body
+
+    def test_bytes_are_passed_through(self):
+        assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
+
+    async def test_routes(self):
+        transport = ASGITransport(app=make_app())
+        async with AsyncClient(transport=transport, base_url="http://t") as c:
+            declared = await c.get("/tags")
+            raw = await c.get("/tags/raw")
+
+        assert declared.json() == [{"id": 1, "name": "иммунитет"}]
+        assert raw.headers["content-type"] == "application/json"
+        assert raw.json() == [{"id": 2, "name": "энергия"}]
+
+    def test_model_response_uses_type_adapter(self):
+        response = model_response(
+            {"at": datetime(2024, 1, 2, 3, 4, 5)}, dict, status_code=201
+        )
+
+        assert response.status_code == 201
+        assert response.body == b'{"at":"2024-01-02T03:04:05"}'
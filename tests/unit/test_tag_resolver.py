@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.session import make_session_factory
+from app.exceptions.service_errors import EntityNotFound
+from app.models import Tag
+from app.models.base import Base
+from app.repositories import TagRepository
+from app.services.tag_resolver import TagResolver
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with make_session_factory(engine)() as session:
+        session.add_all(Tag(id=i, name=f"тег {i}") for i in range(1, 4))
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+@pytest.fixture
+async def resolver(engine):
+    async with make_session_factory(engine)() as session:
+        yield TagResolver(tag_repository=TagRepository(session))
+
+
+class TestTagResolver:
+
+    async def test_resolve_in_one_query(self, resolver, statements):
+        tags = await resolver.resolve([3, 1, 3, 1])
+
+        assert sorted(tag.id for tag in tags) == [1, 3]
+        assert len(statements) == 1
+        assert " IN " in statements[0]
+
+    async def test_resolve_reports_all_missing_ids(self, resolver, statements):
+        with pytest.raises(EntityNotFound) as exc:
+            await resolver.resolve([7, 1, 5, 7])
+
+        assert str(exc.value) == "Теги с ID=[7, 5] не существуют"
+        assert len(statements) == 1
+
+    async def test_resolve_names_reads_current_state(self, resolver):
+        assert await resolver.resolve_names(["тег 1", "нет"]) == {"тег 1": 1}
+
+        # Удалённый тег больше не находится по имени.
+        await resolver.tag_repository.delete(1)
+        assert await resolver.resolve_names(["тег 1", "тег 2"]) == {"тег 2": 2}
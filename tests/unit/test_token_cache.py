@@ -0,0 +1,36 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.cache import TokenCache
+from app.core.types import TokenType
+
+
+class TestTokenCache:
+
+    def test_expired_entries_are_dropped(self):
+        cache = TokenCache()
+        cache.put("token", {"sub": "1", "exp": time.time() - 1})
+
+        assert cache.get("token") is None
+
+    def test_tokens_without_exp_are_not_cached(self):
+        cache = TokenCache()
+        cache.put("token", {"sub": "1"})
+
+        assert cache.size() == 0
+
+    async def test_decode_uses_cache(self, monkeypatch):
+        cache = TokenCache()
+        monkeypatch.setattr(security, "token_cache", cache)
+        token = await security.create_jwt(TokenType.ACCESS, "7")
+
+        assert (await security.decode_access_token(token)).sub == "7"
+        assert (await security.decode_access_token(token)).sub == "7"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await security.decode_refresh_token(token)
+        assert exc_info.value.status_code == 401
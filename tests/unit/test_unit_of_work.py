@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.session import has_writes, make_session_factory
+from app.database.unit_of_work import UnitOfWork
+from app.models import Tag
+from app.models.base import Base
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield make_session_factory(engine)
+    await engine.dispose()
+
+
+async def count_tags(session_factory) -> int:
+    async with session_factory() as session:
+        result = await session.execute(select(Tag))
+        return len(result.scalars().all())
+
+
+class TestUnitOfWork:
+
+    async def test_commit_runs_after_commit_callbacks(self, session_factory):
+        calls = []
+        async with session_factory() as session:
+            async with UnitOfWork(session) as uow:
+                session.add(Tag(name="иммунитет"))
+                await session.flush()
+                uow.after_commit(lambda: calls.append("invalidate"))
+                assert calls == []
+
+        assert calls == ["invalidate"]
+        assert await count_tags(session_factory) == 1
+
+    async def test_error_rolls_back_and_drops_callbacks(self, session_factory):
+        calls = []
+        async with session_factory() as session:
+            with pytest.raises(RuntimeError):
+                async with UnitOfWork(session) as uow:
+                    session.add(Tag(name="иммунитет"))
+                    await session.flush()
+                    uow.after_commit(lambda: calls.append("invalidate"))
+                    raise RuntimeError
+
+        assert calls == []
+        assert await count_tags(session_factory) == 0
+
+    async def test_has_writes(self, session_factory):
+        async with session_factory() as session:
+            await session.execute(select(Tag))
+            assert not has_writes(session)
+
+            session.add(Tag(name="иммунитет"))
+            assert has_writes(session)
+            await session.flush()
+            assert has_writes(session)
+            await session.commit()
+            assert not has_writes(session)
+
+            await session.execute(update(Tag).values(name="энергия"))
+            assert has_writes(session)
+            await session.rollback()
+            assert not has_writes(session)
@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.cache import UserCache, user_cache
+from app.core.types import UserType
+from app.database.session import make_session_factory
+from app.models import User
+from app.models.base import Base
+from app.schemas import UserOut
+from app.services.user import UserService
+
+
+def make_user(user_id: int = 1) -> UserOut:
+    return UserOut(id=user_id, email="a@b.com", name="Иван", role=UserType.USER)
+
+
+class TestUserCache:
+
+    async def test_get_user_hits_cache(self):
+        fake_repo = AsyncMock()
+        fake_repo.get_by_id.return_value = make_user()
+        svc = UserService(repository=fake_repo, cache=UserCache())
+
+        first = await svc.get_user(1)
+        second = await svc.get_user(1)
+
+        assert first == second
+        fake_repo.get_by_id.assert_awaited_once_with(1)
+
+    def test_entries_expire(self):
+        cache = UserCache(ttl=-1)
+        cache.put(make_user())
+
+        assert cache.get(1) is None
+
+    @pytest.mark.parametrize("change", ["update", "delete"])
+    async def test_orm_changes_invalidate(self, change):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with make_session_factory(engine)() as session:
+            user = User(email="a@b.com", name="Иван", hashed_password="x")
+            session.add(user)
+            await session.commit()
+            user_cache.put(UserOut.model_validate(user))
+
+            if change == "update":
+                user.name = "Пётр"
+            else:
+                await session.delete(user)
+            await session.commit()
+
+        assert user_cache.get(user.id) is None
+        await engine.dispose()
+
+    async def test_invalidated_only_after_commit(self):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with make_session_factory(engine)() as session:
+            user = User(email="a@b.com", name="Иван", hashed_password="x")
+            session.add(user)
+            await session.commit()
+            cached = UserOut.model_validate(user)
+            user_id = user.id
+
+            user.name = "Пётр"
+            await session.flush()
+            # Параллельный запрос успел прочитать строку до коммита.
+            user_cache.put(cached)
+            await session.rollback()
+            assert user_cache.get(user_id) == cached
+
+            user.name = "Пётр"
+            await session.flush()
+            user_cache.put(cached)
+            await session.commit()
+            assert user_cache.get(user_id) is None
+
+        await engine.dispose()
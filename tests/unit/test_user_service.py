@@ -1,10 +1,11 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from dataclasses import make_dataclass
+from types import SimpleNamespace
 
 from app.services.user import UserService
 from app.schemas import UserCreate, UserAuth, UserOut
-from app.core.security import get_password_hash
+from app.core.security import build_crypt_context, get_password_hash
 from app.exceptions.service_errors import (
     EntityAlreadyExistsError,
     UserNotFoundError,
@@ -78,7 +79,35 @@ class TestUserServiceRegister:
 
 @pytest.mark.asyncio
 class TestUserServiceAuthenticate:
-    pass
+
+    async def test_authenticate_schedules_rehash(self):
+        old_hash = build_crypt_context(bcrypt_rounds=4).hash("passw0rd")
+        fake_repo = AsyncMock()
+        fake_repo.get_user_by_email.return_value = SimpleNamespace(
+            id=2,
+            email="x@y.com",
+            name="Иван",
+            hashed_password=old_hash,
+            role="USER",
+        )
+        rehash_service = Mock()
+
+        with patch(
+            "app.core.security.pwd_context",
+            build_crypt_context(bcrypt_rounds=5),
+        ):
+            svc = UserService(
+                repository=fake_repo, rehash_service=rehash_service
+            )
+            out = await svc.authenticate(
+                UserAuth(email="x@y.com", password="passw0rd")
+            )
+
+        assert out.id == 2
+        user_id, previous, new_hash = rehash_service.schedule.call_args.args
+        assert (user_id, previous) == (2, old_hash)
+        assert new_hash.startswith("$2b$05$")
+
     # async def test_authenticate_success(self):
     #     fake_repo = AsyncMock()
     #